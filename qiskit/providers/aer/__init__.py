@@ -18,6 +18,8 @@ if platform.system() == "Darwin":
 
 from .aerprovider import AerProvider
 from .aerjob import AerJob
+from .aersession import AerSession
+from .aerprocesspool import AerProcessPool
 from .aererror import AerError
 from .backends import *
 from . import noise
@@ -13,10 +13,13 @@ from concurrent import futures
 import logging
 import sys
 import functools
+import threading
 
 from qiskit.providers import BaseJob, JobStatus, JobError
 from qiskit.qobj import validate_qobj_against_schema
 
+from .aererror import AerError
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,6 +45,26 @@ def requires_submit(func):
 class AerJob(BaseJob):
     """AerJob class.
 
+    Jobs are executed asynchronously in a shared thread pool. The C++
+    controllers release the Python GIL while simulating, so several jobs,
+    on the same or on different Aer backends, run concurrently:
+
+        * Each job executes on its own controller instance, and backends hold
+          no per-job state, so concurrent jobs do not share simulator state.
+        * Converting the qobj and result to and from the C++ controller holds
+          the GIL; only the simulation itself runs without it.
+        * Each job uses up to ``max_parallel_threads`` OpenMP threads (by
+          default all available CPU cores). When running several jobs at
+          once set ``max_parallel_threads`` in the ``backend_options`` of each
+          job so the total does not exceed the number of cores.
+
+    The result of each experiment is available from ``experiment_results``
+    as soon as the experiment has completed, before the job has finished.
+
+    Running jobs are cancelled cooperatively by ``cancel``: the controller
+    stops between experiments, shots and instructions, and the job result
+    contains the experiments that completed before it was cancelled.
+
     Attributes:
         _executor (futures.Executor): executor to handle asynchronous jobs
     """
@@ -54,6 +77,13 @@ class AerJob(BaseJob):
         self._qobj = qobj
         self._args = args
         self._future = None
+        # Completed experiment results as (index, result dict) pairs
+        self._experiment_results = []
+        self._experiment_condition = threading.Condition()
+        # Cancellation flag shared with the controller, or None if the
+        # backend does not support cancelling running jobs
+        # pylint: disable=protected-access
+        self._cancellation = backend._new_cancellation()
 
     def submit(self):
         """Submit the job to the backend for execution.
@@ -69,7 +99,10 @@ class AerJob(BaseJob):
 
         validate_qobj_against_schema(self._qobj)
         self._future = self._executor.submit(self._fn, self._job_id, self._qobj,
-                                             *self._args)
+                                             *self._args,
+                                             experiment_callback=self._add_experiment_result,
+                                             cancellation=self._cancellation)
+        self._future.add_done_callback(self._notify_experiment_results)
 
     @requires_submit
     def result(self, timeout=None):
@@ -91,9 +124,80 @@ class AerJob(BaseJob):
         """
         return self._future.result(timeout=timeout)
 
+    @requires_submit
+    def experiment_results(self, timeout=None):
+        """Iterate over the experiment results of the job as they complete.
+
+        Experiment results are yielded as soon as each experiment has
+        completed, in the order in which they complete, while the
+        following experiments are still running.
+
+        Args:
+            timeout (float): number of seconds to wait for each result.
+
+        Yields:
+            tuple: pairs ``(index, result)`` of the index of the experiment in
+            the qobj and its ExperimentResult object.
+
+        Raises:
+            concurrent.futures.TimeoutError: if timeout occurred.
+            concurrent.futures.CancelledError: if job cancelled before completed.
+            AerError: if an experiment or the job failed.
+        """
+        pos = 0
+        while True:
+            with self._experiment_condition:
+                if not self._experiment_condition.wait_for(
+                        lambda: (pos < len(self._experiment_results) or
+                                 self._future.done()),
+                        timeout=timeout):
+                    raise futures.TimeoutError()
+                pending = self._experiment_results[pos:]
+            for index, result in pending:
+                # Skip experiments that were not run because the job was
+                # cancelled
+                if result.get('status', None) == 'CANCELLED':
+                    continue
+                if not result.get('success', False):
+                    raise AerError(result.get('status', None))
+                # pylint: disable=protected-access
+                yield index, self._backend._format_experiment_result(result)
+            pos += len(pending)
+            if not pending and self._future.done():
+                # Raise any error from the job
+                self._future.result()
+                return
+
+    def _add_experiment_result(self, index, result):
+        """Add a completed experiment result dictionary."""
+        with self._experiment_condition:
+            self._experiment_results.append((index, result))
+            self._experiment_condition.notify_all()
+
+    def _notify_experiment_results(self, _):
+        """Notify experiment_results iterators that the job has finished."""
+        with self._experiment_condition:
+            self._experiment_condition.notify_all()
+
     @requires_submit
     def cancel(self):
-        return self._future.cancel()
+        """Attempt to cancel the job.
+
+        Jobs that have not started are not executed. Running jobs are
+        cancelled by the controller between experiments, shots and
+        instructions, and return a result containing the experiments that
+        had completed.
+
+        Returns:
+            bool: True if the job was cancelled, False if it had already
+            finished or cannot be cancelled.
+        """
+        if self._future.cancel():
+            return True
+        if self._cancellation is None or self._future.done():
+            return False
+        self._cancellation.cancel()
+        return True
 
     @requires_submit
     def status(self):
@@ -111,6 +215,10 @@ class AerJob(BaseJob):
             _status = JobStatus.RUNNING
         elif self._future.cancelled():
             _status = JobStatus.CANCELLED
+        elif (self._future.done() and self._future.exception() is None and
+              self._future.result().status == 'CANCELLED'):
+            # Running jobs that were cancelled or timed out return a result
+            _status = JobStatus.CANCELLED
         elif self._future.done():
             _status = JobStatus.DONE if self._future.exception() is None else JobStatus.ERROR
         else:
@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018, IBM.
+#
+# This source code is licensed under the Apache License, Version 2.0 found in
+# the LICENSE.txt file in the root directory of this source tree.
+
+"""This module implements the process pool used to execute AerJobs."""
+
+import multiprocessing
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+from .aererror import AerError
+
+# Directory for files holding arrays shared between processes. Files in
+# /dev/shm are backed by memory and never written to disk.
+_SHARED_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+# Number of CPUs the worker process is pinned to, or 0 if it is not pinned
+_WORKER_CPUS = 0
+
+
+class AerProcessPool:
+    """AerProcessPool class.
+
+    A process pool executes AerJobs in separate worker processes instead of
+    in threads of the Python process, so that the OpenMP runtime of each
+    job has its own process:
+
+        * Each worker is pinned to its own subset of the available CPUs,
+          and by default uses one OpenMP thread for each CPU of its subset,
+          so concurrent jobs do not oversubscribe the cores.
+        * The qobj dictionary is pickled to the worker with its NumPy
+          arrays. Objects with an ``as_dict`` method (such as a NoiseModel)
+          are converted to dictionaries first.
+        * NumPy arrays in the result (such as those returned with the
+          ``return_numpy`` backend option) that are larger than
+          ``shared_array_threshold`` bytes are returned through a shared
+          memory file instead of being pickled.
+
+    Jobs are run on a process pool by passing it to ``AerBackend.run``.
+    Experiment results of a job run on a process pool are only available
+    once the whole job has completed.
+    """
+
+    def __init__(self, processes=None, cpus_per_process=None,
+                 pin_cpus=True, shared_array_threshold=2 ** 16):
+        """Create a process pool.
+
+        Args:
+            processes (int): number of worker processes. By default the
+                available CPUs divided by cpus_per_process.
+            cpus_per_process (int): number of CPUs for each worker. By
+                default the available CPUs divided by processes.
+            pin_cpus (bool): pin each worker to its subset of CPUs if this
+                is supported by the operating system.
+            shared_array_threshold (int): the size in bytes above which
+                result arrays are returned through shared memory.
+
+        Raises:
+            AerError: if the number of processes or CPUs is not positive.
+        """
+        cpus = _available_cpus()
+        if processes is None:
+            processes = max(1, len(cpus) // (cpus_per_process or 1))
+        if cpus_per_process is None:
+            cpus_per_process = max(1, len(cpus) // processes)
+        if processes < 1 or cpus_per_process < 1:
+            raise AerError("Invalid process pool size.")
+        self._processes = processes
+        self._cpus_per_process = cpus_per_process
+        self._shared_array_threshold = shared_array_threshold
+        # Worker processes are spawned rather than forked since forking a
+        # process that has already started OpenMP threads is unsafe.
+        self._context = multiprocessing.get_context('spawn')
+        cpu_sets = self._context.Queue()
+        for pos in range(processes):
+            start = (pos * cpus_per_process) % len(cpus)
+            cpu_set = [cpus[(start + k) % len(cpus)]
+                       for k in range(cpus_per_process)]
+            cpu_sets.put(cpu_set if pin_cpus else None)
+        self._pool = self._context.Pool(processes, _init_worker,
+                                        (cpu_sets, cpus_per_process))
+        self._manager = None
+        self._lock = threading.Lock()
+
+    @property
+    def processes(self):
+        """Return the number of worker processes."""
+        return self._processes
+
+    @property
+    def cpus_per_process(self):
+        """Return the number of CPUs of each worker process."""
+        return self._cpus_per_process
+
+    def execute(self, controller, qobj_dict, experiment_callback=None,
+                cancellation=None):
+        """Execute a qobj dictionary with a controller execute function in
+        a worker process, waiting for it to complete.
+
+        The arguments are the same as for a controller execute function,
+        which must be a module level function of a controller wrapper.
+        The experiment_callback is called with each experiment result once
+        the job has completed. If a cancellation is given and cancelled,
+        the job is cancelled in the worker process.
+
+        Args:
+            controller (callable): controller execute function.
+            qobj_dict (dict): qobj dictionary.
+            experiment_callback (callable): function called with each
+                experiment result.
+            cancellation (object): controller cancellation flag.
+
+        Returns:
+            dict: the result dictionary.
+        """
+        cancelled = None
+        if cancellation is not None:
+            cancelled = self._get_manager().Event()
+        worker_output = _WorkerOutput()
+        job = self._pool.apply_async(_execute_worker,
+                                     (controller, _as_dicts(qobj_dict),
+                                      type(cancellation) if cancelled else None,
+                                      cancelled, self._shared_array_threshold),
+                                     callback=worker_output.add)
+        try:
+            while not job.ready():
+                job.wait(0.05)
+                if cancelled is not None and cancellation.cancelled():
+                    cancelled.set()
+                    cancelled = None
+            output = _load_shared_arrays(job.get())
+        finally:
+            # Remove the shared memory files of arrays that were not loaded,
+            # including those of a job that completes after this returns
+            worker_output.close()
+        if experiment_callback is not None and isinstance(output, dict):
+            for index, result in enumerate(output.get('results', [])):
+                experiment_callback(index, result)
+        return output
+
+    def close(self):
+        """Stop the worker processes once their jobs have completed."""
+        self._pool.close()
+        self._pool.join()
+        if self._manager is not None:
+            self._manager.shutdown()
+
+    def _get_manager(self):
+        """Return the manager for events shared with worker processes."""
+        with self._lock:
+            if self._manager is None:
+                self._manager = self._context.Manager()
+            return self._manager
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __repr__(self):
+        return "<{}(processes={}, cpus_per_process={})>".format(
+            self.__class__.__name__, self._processes, self._cpus_per_process)
+
+
+def _available_cpus():
+    """Return the list of CPUs available to the current process."""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _init_worker(cpu_sets, num_cpus):
+    """Pin a worker process to the next CPU set of the queue."""
+    # pylint: disable=global-statement
+    global _WORKER_CPUS
+    _WORKER_CPUS = num_cpus
+    cpu_set = cpu_sets.get()
+    if cpu_set is not None and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cpu_set)
+
+
+def _execute_worker(controller, qobj_dict, cancellation_class, cancelled,
+                    shared_array_threshold):
+    """Execute a qobj dictionary in a worker process."""
+    # Use one OpenMP thread for each CPU of the worker by default
+    config = qobj_dict.setdefault('config', {})
+    if _WORKER_CPUS and not config.get('max_parallel_threads', 0):
+        config['max_parallel_threads'] = _WORKER_CPUS
+    if cancelled is None:
+        output = controller(qobj_dict)
+    else:
+        cancellation = cancellation_class()
+        done = threading.Event()
+
+        def watch():
+            while not done.is_set():
+                if cancelled.wait(0.05):
+                    cancellation.cancel()
+                    return
+
+        watcher = threading.Thread(target=watch, daemon=True)
+        watcher.start()
+        try:
+            output = controller(qobj_dict, None, cancellation)
+        finally:
+            done.set()
+            watcher.join()
+    shared = []
+    try:
+        return _share_arrays(output, shared_array_threshold, shared)
+    except BaseException:
+        for array in shared:
+            array.remove()
+        raise
+
+
+def _as_dicts(obj):
+    """Replace objects with an as_dict method in a qobj dictionary by
+    their dictionaries."""
+    if hasattr(obj, 'as_dict'):
+        return _as_dicts(obj.as_dict())
+    if isinstance(obj, dict):
+        return {key: _as_dicts(val) for key, val in obj.items()}
+    if isinstance(obj, list):
+        return [_as_dicts(val) for val in obj]
+    return obj
+
+
+class _SharedArray:
+    """Reference to an array stored in a shared memory file."""
+
+    def __init__(self, array):
+        fd, self.path = tempfile.mkstemp(prefix='aer_', dir=_SHARED_DIR)
+        with os.fdopen(fd, 'wb') as file:
+            np.ascontiguousarray(array).tofile(file)
+        self.dtype = array.dtype.str
+        self.shape = array.shape
+
+    def load(self):
+        """Return the array and remove its shared memory file."""
+        array = np.memmap(self.path, dtype=self.dtype, mode='r+',
+                          shape=self.shape)
+        if os.name == 'nt':
+            # Mapped files cannot be removed on Windows
+            array = np.array(array)
+        else:
+            # The mapping is valid after the file has been removed
+            array = array.view(np.ndarray)
+        os.remove(self.path)
+        self.path = None
+        return array
+
+    def remove(self):
+        """Remove the shared memory file if the array was not loaded."""
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+
+
+class _WorkerOutput:
+    """Output of a worker process, whose shared arrays are removed once it
+    is closed unless they have been loaded."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._outputs = []
+        self._closed = False
+
+    def add(self, output):
+        """Add the output of a worker, or remove its shared arrays if the
+        output is already closed."""
+        with self._lock:
+            if not self._closed:
+                self._outputs.append(output)
+                return
+        _remove_shared_arrays(output)
+
+    def close(self):
+        """Remove the shared arrays of the output that were not loaded."""
+        with self._lock:
+            self._closed = True
+            outputs, self._outputs = self._outputs, []
+        for output in outputs:
+            _remove_shared_arrays(output)
+
+
+def _share_arrays(obj, threshold, shared):
+    """Replace large NumPy arrays in a result with shared arrays, which are
+    appended to the list shared."""
+    if isinstance(obj, np.ndarray) and obj.nbytes > threshold:
+        shared.append(_SharedArray(obj))
+        return shared[-1]
+    if isinstance(obj, dict):
+        return {key: _share_arrays(val, threshold, shared)
+                for key, val in obj.items()}
+    if isinstance(obj, list):
+        return [_share_arrays(val, threshold, shared) for val in obj]
+    return obj
+
+
+def _load_shared_arrays(obj):
+    """Replace shared arrays in a result with NumPy arrays."""
+    if isinstance(obj, _SharedArray):
+        return obj.load()
+    if isinstance(obj, dict):
+        return {key: _load_shared_arrays(val) for key, val in obj.items()}
+    if isinstance(obj, list):
+        return [_load_shared_arrays(val) for val in obj]
+    return obj
+
+
+def _remove_shared_arrays(obj):
+    """Remove the shared memory files of the shared arrays in a result."""
+    if isinstance(obj, _SharedArray):
+        obj.remove()
+    elif isinstance(obj, dict):
+        for val in obj.values():
+            _remove_shared_arrays(val)
+    elif isinstance(obj, list):
+        for val in obj:
+            _remove_shared_arrays(val)
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018, IBM.
+#
+# This source code is licensed under the Apache License, Version 2.0 found in
+# the LICENSE.txt file in the root directory of this source tree.
+
+# pylint: disable=protected-access
+
+"""This module implements the session class used for AerBackend objects."""
+
+import time
+import uuid
+
+from .aerjob import AerJob
+
+
+class AerSession:
+    """AerSession class.
+
+    A session runs several qobjs on an AerBackend with the same backend
+    options and noise model. The noise model is loaded by the C++
+    controller once when the session is created, rather than for every
+    qobj. Session backend options take precedence over the config of
+    each qobj, as for ``AerBackend.run``.
+
+    Sessions are created with ``AerBackend.session``. Qobjs run on a
+    session are executed asynchronously as AerJobs, and several jobs may
+    run concurrently on the same session.
+    """
+
+    def __init__(self, backend, backend_options=None, noise_model=None):
+        """Create a session for a backend.
+
+        Args:
+            backend (AerBackend): the backend to run qobjs on.
+            backend_options (dict): backend options for the session.
+            noise_model (NoiseModel): noise model for the session.
+        """
+        self._backend = backend
+        self._backend_options = backend_options
+        self._noise_model = noise_model
+        config = backend._format_config({}, backend_options, noise_model)
+        self._session = backend._controller_session(config)
+
+    def backend(self):
+        """Return the backend for the session."""
+        return self._backend
+
+    def run(self, qobj, validate=True):
+        """Run a qobj on the session backend.
+
+        Args:
+            qobj (Qobj): the qobj to run.
+            validate (bool): validate the qobj for the backend.
+
+        Returns:
+            AerJob: the submitted job.
+        """
+        # Submit job
+        job_id = str(uuid.uuid4())
+        aer_job = AerJob(self._backend, job_id, self._run_job, qobj, validate)
+        aer_job.submit()
+        return aer_job
+
+    def _run_job(self, job_id, qobj, validate, experiment_callback=None,
+                 cancellation=None):
+        """Run a qobj job"""
+        start = time.time()
+        if validate:
+            self._backend._validate(qobj, self._backend_options,
+                                    self._noise_model)
+        output = self._backend._execute_controller(self._session.execute,
+                                                   qobj.as_dict(),
+                                                   experiment_callback,
+                                                   cancellation)
+        self._backend._validate_controller_output(output)
+        end = time.time()
+        return self._backend._format_results(job_id, output, end - start)
@@ -9,7 +9,7 @@
 Qiskit Aer qasm simulator backend.
 """
 
-import json
+import functools
 import logging
 import datetime
 import time
@@ -18,42 +18,24 @@ from numpy import ndarray
 
 from qiskit.providers import BaseBackend
 from qiskit.providers.models import BackendStatus
-from qiskit.qobj import QasmQobjConfig
 from qiskit.result import Result
+from qiskit.result.models import ExperimentResult
 from qiskit.util import local_hardware_info
 
 from ..aerjob import AerJob
+from ..aersession import AerSession
 from ..aererror import AerError
 
 # Logger
 logger = logging.getLogger(__name__)
 
 
-class AerJSONEncoder(json.JSONEncoder):
-    """
-    JSON encoder for NumPy arrays and complex numbers.
-
-    This functions as the standard JSON Encoder but adds support
-    for encoding:
-        complex numbers z as lists [z.real, z.imag]
-        ndarrays as nested lists.
-    """
-
-    # pylint: disable=method-hidden,arguments-differ
-    def default(self, obj):
-        if isinstance(obj, ndarray):
-            return obj.tolist()
-        if isinstance(obj, complex):
-            return [obj.real, obj.imag]
-        if hasattr(obj, "as_dict"):
-            return obj.as_dict()
-        return super().default(obj)
-
-
 class AerBackend(BaseBackend):
     """Qiskit Aer Backend class."""
 
-    def __init__(self, controller, configuration, provider=None):
+    def __init__(self, controller, configuration, provider=None,
+                 controller_session=None, controller_cancellation=None,
+                 default_backend_options=None, controller_estimate=None):
         """Aer class for backends.
 
         This method should initialize the module and its configuration, and
@@ -64,6 +46,12 @@ class AerBackend(BaseBackend):
             controller (function): Aer cython controller to be executed
             configuration (BackendConfiguration): backend configuration
             provider (BaseProvider): provider responsible for this backend
+            controller_session (type): Aer cython controller session class
+            controller_cancellation (type): Aer cython controller
+                cancellation class
+            default_backend_options (dict): backend options that are used
+                unless they are set by the qobj config or backend_options
+            controller_estimate (function): Aer cython controller estimate
 
         Raises:
             FileNotFoundError if backend executable is not available.
@@ -71,16 +59,90 @@ class AerBackend(BaseBackend):
         """
         super().__init__(configuration, provider=provider)
         self._controller = controller
+        self._controller_session = controller_session
+        self._controller_cancellation = controller_cancellation
+        self._default_backend_options = dict(default_backend_options or {})
+        self._controller_estimate = controller_estimate
+
+    def run(self, qobj, backend_options=None, noise_model=None, validate=True,
+            process_pool=None):
+        """Run a qobj on the backend.
 
-    def run(self, qobj, backend_options=None, noise_model=None, validate=True):
-        """Run a qobj on the backend."""
+        If a process_pool is given the qobj is executed in one of its worker
+        processes (see AerProcessPool) instead of in a thread of the current
+        process.
+        """
         # Submit job
         job_id = str(uuid.uuid4())
         aer_job = AerJob(self, job_id, self._run_job, qobj,
-                         backend_options, noise_model, validate)
+                         backend_options, noise_model, validate, process_pool)
         aer_job.submit()
         return aer_job
 
+    def session(self, backend_options=None, noise_model=None):
+        """Return a session for running several qobjs on the backend.
+
+        The backend options and noise model are loaded once when the
+        session is created and used for every qobj run on the session.
+        This avoids loading the noise model for each qobj when running
+        many qobjs with the same noise model.
+
+        Args:
+            backend_options (dict): backend options for the session.
+            noise_model (NoiseModel): noise model for the session.
+
+        Returns:
+            AerSession: the backend session.
+
+        Raises:
+            AerError: if the backend does not support sessions.
+        """
+        if self._controller_session is None:
+            raise AerError("{} does not support sessions.".format(self.name()))
+        return AerSession(self, backend_options, noise_model)
+
+    def estimate(self, qobj, backend_options=None, noise_model=None):
+        """Estimate the resources needed to run a qobj without running it.
+
+        The experiments are planned as they would be by ``run``. Each
+        experiment result of the returned dictionary contains:
+
+            * "method": the simulation method.
+            * "noise": whether noise is sampled for each shot.
+            * "measure_sampling": whether measurements are sampled from
+              a single simulation of the circuit.
+            * "error_free_probability": the probability of a noisy shot
+              without errors, which is sampled from the ideal circuit, or 0
+              if error free shots are simulated with noise.
+            * "memory_mb": the memory required by each state. This is also
+              reported for experiments that do not fit in the memory.
+            * "peak_memory_mb": the memory required by the states of
+              parallel shots.
+            * "parallel_threads", "parallel_shots" and
+              "parallel_state_update": the thread allocation.
+            * "time_estimate": the estimated time in seconds.
+
+        The "metadata" of the dictionary contains the "peak_memory_mb"
+        and "time_estimate" of the qobj. Times are estimated from the
+        "estimate_seconds_per_cost" backend option, which is calibrated for
+        the local machine by ``aer-autotune``, and are approximate.
+
+        Args:
+            qobj (Qobj): the qobj to estimate.
+            backend_options (dict): backend options for the qobj.
+            noise_model (NoiseModel): noise model for the qobj.
+
+        Returns:
+            dict: the estimate dictionary.
+
+        Raises:
+            AerError: if the backend does not support estimates.
+        """
+        if self._controller_estimate is None:
+            raise AerError("{} does not support estimates.".format(self.name()))
+        qobj_dict = self._format_qobj(qobj, backend_options, noise_model)
+        return self._controller_estimate(qobj_dict)
+
     def status(self):
         """Return backend status.
 
@@ -93,45 +155,107 @@ class AerBackend(BaseBackend):
                              pending_jobs=0,
                              status_msg='')
 
-    def _run_job(self, job_id, qobj, backend_options, noise_model, validate):
+    def _run_job(self, job_id, qobj, backend_options, noise_model, validate,
+                 process_pool=None, experiment_callback=None,
+                 cancellation=None):
         """Run a qobj job"""
         start = time.time()
         if validate:
             self._validate(qobj, backend_options, noise_model)
-        qobj_str = self._format_qobj_str(qobj, backend_options, noise_model)
-        output = json.loads(self._controller(qobj_str).decode('UTF-8'))
+        qobj_dict = self._format_qobj(qobj, backend_options, noise_model)
+        execute = self._controller
+        if process_pool is not None:
+            execute = functools.partial(process_pool.execute, self._controller)
+        output = self._execute_controller(execute, qobj_dict,
+                                          experiment_callback, cancellation)
         self._validate_controller_output(output)
         end = time.time()
         return self._format_results(job_id, output, end - start)
 
-    def _format_qobj_str(self, qobj, backend_options, noise_model):
-        """Format qobj string for qiskit aer controller"""
-        # Save original qobj config so we can revert our modification
-        # after execution
-        original_config = qobj.config
+    def _format_qobj(self, qobj, backend_options, noise_model):
+        """Format qobj dictionary for qiskit aer controller.
+
+        The returned dictionary is converted directly to the C++ qobj
+        by the controller wrapper, so it may contain complex numbers,
+        NumPy arrays and objects with an ``as_dict`` method (such as a
+        NoiseModel) without first being serialized to a JSON string.
+        """
         # Convert to dictionary and add new parameters
-        # from noise model and backend options
-        config = original_config.as_dict()
-        if backend_options is not None:
-            for key, val in backend_options.items():
-                config[key] = val
+        # from noise model and backend options. The original qobj
+        # is not modified.
+        qobj_dict = qobj.as_dict()
+        config = self._format_config(qobj_dict.get('config', {}),
+                                     backend_options, noise_model)
         if "max_memory_mb" not in config:
             max_memory_mb = int(local_hardware_info()['memory'] * 1024 / 2)
             config['max_memory_mb'] = max_memory_mb
+        qobj_dict['config'] = config
+        return qobj_dict
+
+    def _format_config(self, config, backend_options, noise_model):
+        """Return a copy of a config dictionary updated with the backend
+        options, noise model and runtime config for the controller."""
+        config = dict(self._default_backend_options, **config)
+        if backend_options is not None:
+            for key, val in backend_options.items():
+                config[key] = val
         # Add noise model
         if noise_model is not None:
             config["noise_model"] = noise_model
 
         # Add runtime config
         config['library_dir'] = self.configuration().library_dir
-        qobj.config = QasmQobjConfig.from_dict(config)
-        # Get the JSON serialized string
-        output = json.dumps(qobj, cls=AerJSONEncoder).encode('UTF-8')
-        # Revert original qobj
-        qobj.config = original_config
-        # Return output
+        return config
+
+    def _new_cancellation(self):
+        """Return a new cancellation flag for executing a qobj, or None
+        if the backend controller does not support cancellation."""
+        if self._controller_cancellation is None:
+            return None
+        return self._controller_cancellation()
+
+    @staticmethod
+    def _execute_controller(execute, qobj_dict, experiment_callback=None,
+                            cancellation=None):
+        """Execute a qobj dictionary with a controller execute function.
+
+        If an experiment_callback is given it is called with the index and
+        result dictionary of each experiment as soon as the experiment has
+        completed. The returned output contains all experiment results.
+        If a cancellation is given it may be used to cancel execution.
+        """
+        if cancellation is not None:
+            execute = functools.partial(execute, cancellation=cancellation)
+        if experiment_callback is None:
+            return execute(qobj_dict)
+        # The controller returns None in place of experiment results that
+        # were passed to the callback
+        results = {}
+
+        def callback(index, result):
+            results[index] = result
+            experiment_callback(index, result)
+
+        output = execute(qobj_dict, callback)
+        if isinstance(output, dict) and results:
+            for index, result in results.items():
+                output['results'][index] = result
         return output
 
+    @staticmethod
+    def _format_experiment_result(result):
+        """Construct an ExperimentResult object from an experiment result
+        dictionary of the simulator output. The dictionary is not modified."""
+        result = dict(result)
+        data = dict(result.get('data', {}))
+        arrays = {key: data.pop(key) for key in list(data)
+                  if isinstance(data[key], ndarray)}
+        result['data'] = data
+        experiment_result = ExperimentResult.from_dict(result)
+        for key, val in arrays.items():
+            setattr(experiment_result.data, key, val)
+        return experiment_result
+
     def _format_results(self, job_id, output, time_taken):
         """Construct Result object from simulator output."""
         # Add result metadata
@@ -140,7 +264,19 @@ class AerBackend(BaseBackend):
         output["backend_name"] = self.name()
         output["backend_version"] = self.configuration().backend_version
         output["time_taken"] = time_taken
-        return Result.from_dict(output)
+        # NumPy array data returned with the "return_numpy" backend option
+        # is removed before validating the result schema and added back to
+        # the result data afterwards so that it is not copied.
+        array_data = []
+        for res in output.get('results', []):
+            data = res.get('data', {})
+            array_data.append({key: data.pop(key) for key in list(data)
+                               if isinstance(data[key], ndarray)})
+        result = Result.from_dict(output)
+        for res, arrays in zip(result.results, array_data):
+            for key, val in arrays.items():
+                setattr(res.data, key, val)
+        return result
 
     def _validate_controller_output(self, output):
         """Validate output from the controller wrapper."""
@@ -153,6 +289,10 @@ class AerBackend(BaseBackend):
         # TODO: Once https://github.com/Qiskit/qiskit-terra/issues/1023
         #       is merged this should be updated to deal with errors using
         #       the Result object methods
+        # Cancelled jobs return the results of the experiments that completed
+        if output.get("status", None) == "CANCELLED":
+            logger.warning("%s: simulation cancelled", self.name())
+            return
         if not output.get("success", False):
             logger.error("%s: simulation failed", self.name())
             # Check for error message in the failed circuit
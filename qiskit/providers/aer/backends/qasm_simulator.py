@@ -15,7 +15,11 @@ from qiskit.util import local_hardware_info
 from qiskit.providers.models import BackendConfiguration
 from .aerbackend import AerBackend
 from .qasm_controller_wrapper import qasm_controller_execute
+from .qasm_controller_wrapper import qasm_controller_estimate
+from .qasm_controller_wrapper import QasmControllerSession
+from .qasm_controller_wrapper import QasmControllerCancellation
 from ..aererror import AerError
+from ..utils.autotune import load_profile
 from ..version import __version__
 
 logger = logging.getLogger(__name__)
@@ -52,6 +56,28 @@ class QasmSimulator(AerBackend):
         * "chop_threshold" (double): Sets the threshold for truncating small
             values to zero in the Result data (Default: 1e-15)
 
+        * "return_numpy" (bool): If set to True statevector snapshots are
+            returned as NumPy complex arrays instead of being converted to
+            nested lists (Default: False).
+
+        * "execution_timeout" (double): Cancel execution once this many
+            seconds have passed since it started. Experiments that had not
+            completed are returned with a "CANCELLED" status. If set to 0
+            there is no timeout (Default: 0).
+
+        * "profile_enable" (bool): If set to True the time taken by each
+            op type, noise sampling, circuit optimization passes,
+            measurement sampling and result serialization is recorded and
+            returned as histograms in the "profile" field of the result
+            metadata. This is also enabled by setting the
+            QISKIT_AER_PROFILING environment variable (Default: False).
+
+        * "profile_trace_file" (str): If set, profiling is enabled and the
+            timed sections are also written to this file in the Chrome
+            trace-event format, which may be viewed with chrome://tracing
+            or Perfetto. This may also be set with the
+            QISKIT_AER_PROFILING_TRACE environment variable (Default: "").
+
         * "max_parallel_threads" (int): Sets the maximum number of CPU
             cores used by OpenMP for parallelization. If set to 0 the
             maximum will be set to the number of CPU cores (Default: 0).
@@ -60,15 +86,61 @@ class QasmSimulator(AerBackend):
             qobj experiments that may be executed in parallel up to the
             max_parallel_threads value. If set to 1 parallel circuit
             execution will be disabled. If set to 0 the maximum will be
-            automatically set to max_parallel_threads (Default: 1).
+            automatically set to max_parallel_threads. Parallel
+            experiments share the max_parallel_threads budget, which is
+            divided between them in proportion to their estimated cost
+            (Default: 1).
 
         * "max_parallel_shots" (int): Sets the maximum number of
             shots that may be executed in parallel during each experiment
-            execution, up to the max_parallel_threads value. If set to 1
-            parallel shot execution wil be disabled. If set to 0 the
-            maximum will be automatically set to max_parallel_threads.
-            Note that this cannot be enabled at the same time as parallel
-            experiment execution (Default: 1).
+            execution, up to the threads allocated to the experiment. If
+            set to 1 parallel shot execution wil be disabled. If set to 0
+            the maximum will be automatically set to max_parallel_threads
+            (Default: 1).
+
+        * "shot_batch_size" (int): Sets the number of shots in each batch
+            handed out to a thread during parallel shot execution. Threads
+            take the next batch as soon as they finish the previous one.
+            If set to 0 ideal circuits use one batch per thread and noisy
+            circuits use smaller batches to balance the varying cost of
+            noisy shots (Default: 0).
+
+        * "estimate_seconds_per_cost" (dict): Sets the time in seconds per
+            unit of circuit cost for each simulation method, which is used
+            by the estimate method to predict the time taken by
+            experiments. This is calibrated for the local machine by
+            aer-autotune (Default: built in values).
+
+        * "shared_prefix_enable" (bool): If set to True, ideal experiments
+            that start with the same sequence of gates are executed from
+            the state after those gates, which is only simulated once.
+            This is only used if experiments are not executed in parallel
+            (Default: True).
+
+        * "shared_prefix_threshold" (int): Sets the minimum number of
+            initial gates experiments must share to be executed from a
+            shared state (Default: 10).
+
+        * "deduplication_enable" (bool): Execute identical ideal experiments
+            that can be sampled from a single final state once with their
+            total shots, and randomly split the sampled shots between them
+            (Default: True).
+
+        * "noise_prefix_enable" (bool): If set to True, the noise of
+            noisy experiments using the "statevector" or "stabilizer"
+            method is sampled for batches of shots first, and the ideal
+            gates before the first error of each shot are only simulated
+            once for the batch. This uses memory for a second state
+            (Default: True).
+
+        * "error_free_sampling_enable" (bool): If set to True, shots of
+            noisy experiments using the "statevector" or "stabilizer"
+            method that sample no errors are measure sampled from a
+            single simulation of the ideal circuit, if it supports measure
+            sampling. Readout errors are applied to the sampled outcomes.
+            The other shots are simulated with noise. A noise model with
+            only readout errors samples all shots from a single simulation
+            regardless of this option (Default: True).
 
         * "max_statevector_memory_mb" (int): Sets the maximum size of memory
             to store a state vector. If a state vector needs more, an error
@@ -95,6 +167,19 @@ class QasmSimulator(AerBackend):
             cores. For systems with a small number of cores it enabling
             can reduce performance (Default: False).
 
+        * "statevector_numa_policy" (str): Sets the placement of the
+            statevector memory on systems with multiple NUMA nodes. If
+            "local" memory is allocated on the node of the thread that
+            first uses it. If "interleave" memory pages are interleaved
+            across all nodes. If "partition" the statevector is divided
+            into one contiguous block per node, and if OpenMP thread
+            binding is not set (eg. by OMP_PROC_BIND) the threads used for
+            parallel state updates are pinned to the CPUs of the node of
+            the block they update while the statevector is simulated.
+            Threads are only pinned to CPUs in the CPU affinity of the
+            process. Only supported on Linux, on other systems this option
+            has no effect (Default: "local").
+
         * "extended_stabilizer_approximation_error" (double): Set the error
             in the approximation for the extended_stabilizer method. A
             smaller error needs more memory and computational time.
@@ -121,6 +206,16 @@ class QasmSimulator(AerBackend):
             OpenMP parallelisation. If parallel circuit or shot execution
             is enabled this will only use unallocated CPU cores up to
             max_parallel_threads. (Default: 100)
+
+    Machine profile:
+
+        The ``aer-autotune`` command benchmarks this machine and saves the
+        fastest values of the parallelization, measure sampling, fusion
+        and extended stabilizer thresholds to a profile file (see
+        ``utils.autotune``). If a profile made on this machine exists at
+        ``~/.qiskit/aer_profile.json``, or at the path set by the
+        QISKIT_AER_PROFILE environment variable, its values replace the
+        defaults listed above.
     """
 
     MAX_QUBIT_MEMORY = int(
@@ -157,7 +252,11 @@ class QasmSimulator(AerBackend):
         super().__init__(
             qasm_controller_execute,
             BackendConfiguration.from_dict(self.DEFAULT_CONFIGURATION),
-            provider=provider)
+            provider=provider,
+            controller_session=QasmControllerSession,
+            controller_cancellation=QasmControllerCancellation,
+            default_backend_options=load_profile(),
+            controller_estimate=qasm_controller_estimate)
 
     def _validate(self, qobj, backend_options, noise_model):
         """Semantic validations of the qobj which cannot be done via schemas.
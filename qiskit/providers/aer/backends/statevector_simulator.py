@@ -18,6 +18,9 @@ from qiskit.util import local_hardware_info
 from qiskit.providers.models import BackendConfiguration
 from .aerbackend import AerBackend
 from .statevector_controller_wrapper import statevector_controller_execute
+from .statevector_controller_wrapper import statevector_controller_estimate
+from .statevector_controller_wrapper import StatevectorControllerSession
+from .statevector_controller_wrapper import StatevectorControllerCancellation
 from ..aererror import AerError
 from ..version import __version__
 
@@ -41,6 +44,31 @@ class StatevectorSimulator(AerBackend):
         * "chop_threshold" (double): Sets the threshold for truncating small
             values to zero in the Result data (Default: 1e-15)
 
+        * "return_numpy" (bool): If set to True the final statevector and
+            any statevector snapshots are returned as NumPy complex arrays
+            that use the simulator memory directly, instead of being
+            converted to nested lists. This reduces the memory and time
+            required to return results for large numbers of qubits
+            (Default: False).
+
+        * "execution_timeout" (double): Cancel execution once this many
+            seconds have passed since it started. Experiments that had not
+            completed are returned with a "CANCELLED" status. If set to 0
+            there is no timeout (Default: 0).
+
+        * "profile_enable" (bool): If set to True the time taken by each
+            op type, noise sampling, circuit optimization passes,
+            measurement sampling and result serialization is recorded and
+            returned as histograms in the "profile" field of the result
+            metadata. This is also enabled by setting the
+            QISKIT_AER_PROFILING environment variable (Default: False).
+
+        * "profile_trace_file" (str): If set, profiling is enabled and the
+            timed sections are also written to this file in the Chrome
+            trace-event format, which may be viewed with chrome://tracing
+            or Perfetto. This may also be set with the
+            QISKIT_AER_PROFILING_TRACE environment variable (Default: "").
+
         * "max_parallel_threads" (int): Sets the maximum number of CPU
             cores used by OpenMP for parallelization. If set to 0 the
             maximum will be set to the number of CPU cores (Default: 0).
@@ -49,7 +77,10 @@ class StatevectorSimulator(AerBackend):
             qobj experiments that may be executed in parallel up to the
             max_parallel_threads value. If set to 1 parallel circuit
             execution will be disabled. If set to 0 the maximum will be
-            automatically set to max_parallel_threads (Default: 1).
+            automatically set to max_parallel_threads. Parallel
+            experiments share the max_parallel_threads budget, which is
+            divided between them in proportion to their estimated cost
+            (Default: 1).
 
         * "statevector_parallel_threshold" (int): Sets the threshold that
             "n_qubits" must be greater than to enable OpenMP
@@ -64,6 +95,19 @@ class StatevectorSimulator(AerBackend):
             increase performance on systems with a large number of CPU
             cores. For systems with a small number of cores it enabling
             can reduce performance (Default: False).
+
+        * "statevector_numa_policy" (str): Sets the placement of the
+            statevector memory on systems with multiple NUMA nodes. If
+            "local" memory is allocated on the node of the thread that
+            first uses it. If "interleave" memory pages are interleaved
+            across all nodes. If "partition" the statevector is divided
+            into one contiguous block per node, and if OpenMP thread
+            binding is not set (eg. by OMP_PROC_BIND) the threads used for
+            parallel state updates are pinned to the CPUs of the node of
+            the block they update while the statevector is simulated.
+            Threads are only pinned to CPUs in the CPU affinity of the
+            process. Only supported on Linux, on other systems this option
+            has no effect (Default: "local").
     """
 
     MAX_QUBIT_MEMORY = int(log2(local_hardware_info()['memory'] * (1024 ** 3) / 16))
@@ -99,7 +143,10 @@ class StatevectorSimulator(AerBackend):
     def __init__(self, configuration=None, provider=None):
         super().__init__(statevector_controller_execute,
                          BackendConfiguration.from_dict(self.DEFAULT_CONFIGURATION),
-                         provider=provider)
+                         provider=provider,
+                         controller_session=StatevectorControllerSession,
+                         controller_cancellation=StatevectorControllerCancellation,
+                         controller_estimate=statevector_controller_estimate)
 
     def _validate(self, qobj, backend_options, noise_model):
         """Semantic validations of the qobj which cannot be done via schemas.
@@ -20,6 +20,9 @@ from qiskit.providers.models import BackendConfiguration
 from .aerbackend import AerBackend
 from ..aererror import AerError
 from .unitary_controller_wrapper import unitary_controller_execute
+from .unitary_controller_wrapper import unitary_controller_estimate
+from .unitary_controller_wrapper import UnitaryControllerSession
+from .unitary_controller_wrapper import UnitaryControllerCancellation
 from ..version import __version__
 
 # Logger
@@ -41,6 +44,31 @@ class UnitarySimulator(AerBackend):
         * "chop_threshold" (double): Sets the threshold for truncating small
             values to zero in the Result data (Default: 1e-15)
 
+        * "return_numpy" (bool): If set to True the final unitary and
+            any unitary snapshots are returned as NumPy complex arrays
+            that use the simulator memory directly, instead of being
+            converted to nested lists. This reduces the memory and time
+            required to return results for large numbers of qubits
+            (Default: False).
+
+        * "execution_timeout" (double): Cancel execution once this many
+            seconds have passed since it started. Experiments that had not
+            completed are returned with a "CANCELLED" status. If set to 0
+            there is no timeout (Default: 0).
+
+        * "profile_enable" (bool): If set to True the time taken by each
+            op type, noise sampling, circuit optimization passes,
+            measurement sampling and result serialization is recorded and
+            returned as histograms in the "profile" field of the result
+            metadata. This is also enabled by setting the
+            QISKIT_AER_PROFILING environment variable (Default: False).
+
+        * "profile_trace_file" (str): If set, profiling is enabled and the
+            timed sections are also written to this file in the Chrome
+            trace-event format, which may be viewed with chrome://tracing
+            or Perfetto. This may also be set with the
+            QISKIT_AER_PROFILING_TRACE environment variable (Default: "").
+
         * "max_parallel_threads" (int): Sets the maximum number of CPU
             cores used by OpenMP for parallelization. If set to 0 the
             maximum will be set to the number of CPU cores (Default: 0).
@@ -49,7 +77,10 @@ class UnitarySimulator(AerBackend):
             qobj experiments that may be executed in parallel up to the
             max_parallel_threads value. If set to 1 parallel circuit
             execution will be disabled. If set to 0 the maximum will be
-            automatically set to max_parallel_threads (Default: 1).
+            automatically set to max_parallel_threads. Parallel
+            experiments share the max_parallel_threads budget, which is
+            divided between them in proportion to their estimated cost
+            (Default: 1).
 
         * "unitary_parallel_threshold" (int): Sets the threshold that
             "n_qubits" must be greater than to enable OpenMP
@@ -94,7 +125,10 @@ class UnitarySimulator(AerBackend):
     def __init__(self, configuration=None, provider=None):
         super().__init__(unitary_controller_execute,
                          BackendConfiguration.from_dict(self.DEFAULT_CONFIGURATION),
-                         provider=provider)
+                         provider=provider,
+                         controller_session=UnitaryControllerSession,
+                         controller_cancellation=UnitaryControllerCancellation,
+                         controller_estimate=unitary_controller_estimate)
 
     def _validate(self, qobj, backend_options, noise_model):
         """Semantic validations of the qobj which cannot be done via schemas.
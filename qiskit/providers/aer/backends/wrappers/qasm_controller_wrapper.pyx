@@ -16,9 +16,142 @@ cdef extern from "simulators/qasm/qasm_controller.hpp" namespace "AER::Simulator
         QasmController() except +
 
 cdef extern from "base/controller.hpp" namespace "AER":
-    cdef string controller_execute[QasmController](string &qobj) except +
+    cdef cppclass ControllerSession[T]:
+        ControllerSession() except +
+    cdef string controller_execute[QasmController](string &qobj) except + nogil
 
+cdef extern from "base/python_controller.hpp" namespace "AER":
+    cdef object controller_execute_python[QasmController](object qobj,
+                                                          object callback,
+                                                          object cancellation) except +
+    cdef object controller_estimate_python[QasmController](object qobj) except +
+    cdef void session_set_config_python[T](ControllerSession[T] &session,
+                                           object config) except +
+    cdef object session_execute_python[T](ControllerSession[T] &session,
+                                          object qobj,
+                                          object callback,
+                                          object cancellation) except +
 
-def qasm_controller_execute(qobj):
-    """Execute qobj on Aer C++ QasmController"""
-    return controller_execute[QasmController](qobj)
+cdef extern from "base/python_controller.hpp" namespace "AER::Python":
+    cdef object new_cancellation() except +
+    cdef void set_cancelled(object cancellation) except +
+    cdef bint is_cancelled(object cancellation) except +
+
+
+cdef class QasmControllerCancellation:
+    """Cancellation flag for executing qobjs on the Aer C++ QasmController.
+
+    Execution is cancelled cooperatively: the controller checks the flag
+    between experiments, between shots and between the instructions applied
+    to the simulator state. Experiments that had not completed when
+    execution was cancelled return a "CANCELLED" status, while completed
+    experiments return their results.
+    """
+    cdef object capsule
+
+    def __init__(self):
+        self.capsule = new_cancellation()
+
+    def cancel(self):
+        """Cancel execution. This may be called from any Python thread."""
+        set_cancelled(self.capsule)
+
+    def cancelled(self):
+        """Return True if execution has been cancelled."""
+        return is_cancelled(self.capsule)
+
+
+def qasm_controller_execute(qobj, experiment_callback=None,
+                            QasmControllerCancellation cancellation=None):
+    """Execute qobj on Aer C++ QasmController
+
+    The Python GIL is released while the qobj is executed, so this
+    function may be called concurrently from several Python threads.
+
+    If an experiment_callback is given it is called as
+    ``experiment_callback(index, result)`` with the index and result
+    dictionary of each experiment as soon as the experiment has completed,
+    and the experiment is set to None in the results of the returned
+    result dictionary. Callbacks are only supported for qobj dictionaries.
+
+    Args:
+        qobj (dict or bytes): qobj dictionary, or JSON serialized qobj bytes.
+        experiment_callback (callable): function called with each
+            experiment result.
+        cancellation (QasmControllerCancellation): cancellation flag that
+            may be used to cancel execution of a qobj dictionary.
+
+    Returns:
+        dict or bytes: the result dictionary, or the JSON serialized result
+        bytes if the qobj was passed as bytes.
+    """
+    cdef string qobj_str
+    cdef string result_str
+    if isinstance(qobj, bytes):
+        qobj_str = qobj
+        with nogil:
+            result_str = controller_execute[QasmController](qobj_str)
+        return result_str
+    return controller_execute_python[QasmController](
+        qobj, experiment_callback,
+        cancellation.capsule if cancellation is not None else None)
+
+
+
+def qasm_controller_estimate(qobj):
+    """Estimate the resources needed to execute qobj on Aer C++ QasmController
+
+    The qobj is planned as for execution but no experiments are executed.
+
+    Args:
+        qobj (dict): qobj dictionary.
+
+    Returns:
+        dict: the estimate dictionary. Each result contains the simulation
+        method, the memory required by each state, the peak memory and
+        the estimated time of an experiment, and the metadata contains the
+        peak memory and estimated time of the qobj.
+    """
+    return controller_estimate_python[QasmController](qobj)
+
+cdef class QasmControllerSession:
+    """Aer C++ QasmController session.
+
+    A session stores a controller configured with the session config
+    settings and noise model that is used to execute a sequence of qobjs,
+    so that the config and noise model are only loaded once. The session
+    config settings take precedence over the config settings of each qobj.
+
+    The Python GIL is released while a qobj is executed, and the session
+    is not modified by execution, so a session may be used concurrently
+    from several Python threads.
+
+    Args:
+        config (dict): session config settings, which may include a
+            "noise_model".
+    """
+    cdef ControllerSession[QasmController] session
+
+    def __init__(self, config=None):
+        if config is not None:
+            session_set_config_python[QasmController](self.session, config)
+
+    def execute(self, qobj, experiment_callback=None,
+                QasmControllerCancellation cancellation=None):
+        """Execute a qobj using the session config and noise model.
+
+        Args:
+            qobj (dict): qobj dictionary.
+            experiment_callback (callable): function called with the index
+                and result dictionary of each experiment as soon as the
+                experiment has completed, as for the controller execute
+                function.
+            cancellation (QasmControllerCancellation): cancellation flag that
+                may be used to cancel execution.
+
+        Returns:
+            dict: the result dictionary.
+        """
+        return session_execute_python[QasmController](
+            self.session, qobj, experiment_callback,
+            cancellation.capsule if cancellation is not None else None)
@@ -8,3 +8,4 @@
 """Utilities"""
 
 from . import qobj_utils
+from . import autotune
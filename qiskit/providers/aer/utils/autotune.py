@@ -0,0 +1,374 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2019, IBM.
+#
+# This source code is licensed under the Apache License, Version 2.0 found in
+# the LICENSE.txt file in the root directory of this source tree.
+"""
+Auto-tuning of simulator thresholds for the local machine.
+
+The ``aer-autotune`` command runs short benchmarks of the simulator kernels
+and saves the backend option values that were fastest on this machine to a
+profile file. The QasmSimulator uses the options of the profile as default
+backend options.
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import math
+import os
+import platform
+
+from ..aererror import AerError
+from ..version import __version__
+
+logger = logging.getLogger(__name__)
+
+# Environment variable for the location of the profile file
+PROFILE_ENV = 'QISKIT_AER_PROFILE'
+
+# Extent of a T gate for the extended stabilizer decomposition
+_T_EXTENT = 1 / math.cos(math.pi / 8) ** 2
+
+
+def default_profile_path():
+    """Return the path of the profile file.
+
+    This is the value of the QISKIT_AER_PROFILE environment variable if it
+    is set, and otherwise ``~/.qiskit/aer_profile.json``.
+    """
+    path = os.environ.get(PROFILE_ENV)
+    if path:
+        return path
+    return os.path.join(os.path.expanduser('~'), '.qiskit',
+                        'aer_profile.json')
+
+
+def machine_info():
+    """Return a dictionary describing the machine a profile is made for."""
+    processor = platform.processor()
+    try:
+        with open('/proc/cpuinfo', 'r') as cpuinfo:
+            for line in cpuinfo:
+                if line.startswith('model name'):
+                    processor = line.split(':', 1)[1].strip()
+                    break
+    except OSError:
+        pass
+    return {
+        'system': platform.system(),
+        'machine': platform.machine(),
+        'processor': processor,
+        'cpus': os.cpu_count()
+    }
+
+
+def load_profile(path=None):
+    """Return the backend options of a saved profile.
+
+    Args:
+        path (str): the profile file (Default: default_profile_path()).
+
+    Returns:
+        dict: the backend options of the profile. This is empty if there is
+        no profile, or if the profile was made on a different machine.
+    """
+    if path is None:
+        path = default_profile_path()
+    if not os.path.isfile(path):
+        return {}
+    try:
+        with open(path, 'r') as file:
+            profile = json.load(file)
+    except (OSError, ValueError) as error:
+        logger.warning('Ignoring invalid Aer profile "%s": %s', path, error)
+        return {}
+    if profile.get('machine') != machine_info():
+        logger.warning('Ignoring Aer profile "%s" made on a different '
+                       'machine. Run aer-autotune to update it.', path)
+        return {}
+    return dict(profile.get('backend_options', {}))
+
+
+def save_profile(backend_options, path=None):
+    """Save backend options to a profile for this machine.
+
+    Args:
+        backend_options (dict): the backend options to save.
+        path (str): the profile file (Default: default_profile_path()).
+
+    Returns:
+        str: the path of the saved profile.
+    """
+    if path is None:
+        path = default_profile_path()
+    directory = os.path.dirname(os.path.abspath(path))
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    profile = {
+        'backend_options': backend_options,
+        'machine': machine_info(),
+        'backend_version': __version__,
+        'date': datetime.datetime.now().isoformat()
+    }
+    with open(path, 'w') as file:
+        json.dump(profile, file, indent=2, sort_keys=True)
+    return path
+
+
+def autotune(controller=None, min_qubits=8, max_qubits=20, repeats=3,
+             estimate=None):
+    """Return the fastest values of simulator thresholds on this machine.
+
+    The following backend options are tuned by timing benchmark circuits
+    of min_qubits to max_qubits qubits:
+
+        * "statevector_parallel_threshold"
+        * "statevector_sample_measure_opt"
+        * "fusion_threshold"
+        * "fusion_cost_factor"
+        * "extended_stabilizer_parallel_threshold"
+        * "estimate_seconds_per_cost"
+
+    The parallel thresholds are only tuned if there is more than one CPU.
+    The seconds per unit of circuit cost used for time estimates are the
+    single thread times of benchmarks of each simulation method divided by
+    their estimated costs.
+
+    Args:
+        controller (function): the qasm controller execute function
+            (Default: the QasmSimulator controller).
+        min_qubits (int): the smallest benchmark circuit width.
+        max_qubits (int): the largest benchmark circuit width.
+        repeats (int): the number of times each benchmark is timed. The
+            fastest time is used.
+        estimate (function): the qasm controller estimate function
+            (Default: the QasmSimulator controller).
+
+    Returns:
+        dict: the tuned backend options.
+
+    Raises:
+        AerError: if a benchmark fails.
+    """
+    if controller is None:
+        # pylint: disable=no-name-in-module
+        from ..backends.qasm_controller_wrapper import qasm_controller_execute
+        controller = qasm_controller_execute
+    if estimate is None:
+        # pylint: disable=no-name-in-module
+        from ..backends.qasm_controller_wrapper import qasm_controller_estimate
+        estimate = qasm_controller_estimate
+    widths = list(range(min_qubits, max_qubits + 1))
+    parallel = (os.cpu_count() or 1) > 1
+    options = {}
+
+    def time_widths(circuit, config):
+        return [_time(controller, circuit(n), dict(options, **config), repeats)
+                for n in widths]
+
+    # Parallel state updates
+    if parallel:
+        config = {'method': 'statevector', 'fusion_enable': False}
+        serial = time_widths(_layers, dict(config, max_parallel_threads=1))
+        threads = time_widths(
+            _layers, dict(config, statevector_parallel_threshold=1))
+        options['statevector_parallel_threshold'] = _best_threshold(
+            widths, serial, threads)
+
+    # Indexing of measure sampling. The index size is also the threshold
+    # the number of qubits must reach to use the index.
+    sample_widths = widths[-4:]
+    sample_times = {}
+    for index_size in range(max(1, min_qubits - 4), max_qubits + 1, 2):
+        sample_times[index_size] = sum(
+            _time(controller, _sampling(n),
+                  dict(options, method='statevector', shots=4096,
+                       statevector_sample_measure_opt=index_size), repeats)
+            for n in sample_widths)
+    options['statevector_sample_measure_opt'] = min(sample_times,
+                                                    key=sample_times.get)
+
+    # Gate fusion. Fusion is applied to circuits with at least the threshold
+    # number of qubits.
+    config = {'method': 'statevector'}
+    unfused = time_widths(_layers, dict(config, fusion_enable=False))
+    fused = time_widths(
+        _layers, dict(config, fusion_enable=True, fusion_threshold=1))
+    options['fusion_threshold'] = _best_threshold(widths, unfused, fused) + 1
+    cost_times = {}
+    for cost_factor in [1.5, 2.0, 2.5, 3.0, 4.0]:
+        cost_times[cost_factor] = _time(
+            controller, _layers(max_qubits),
+            dict(options, method='statevector', fusion_enable=True,
+                 fusion_threshold=1, fusion_cost_factor=cost_factor),
+            repeats)
+    options['fusion_cost_factor'] = min(cost_times, key=cost_times.get)
+
+    # Parallel extended stabilizer decomposition. The number of states of
+    # the decomposition is set by the approximation error.
+    if parallel:
+        ranks = [16, 32, 64, 128, 256, 512]
+        config = {'method': 'extended_stabilizer', 'shots': 10,
+                  'extended_stabilizer_mixing_time': 200}
+        circuit = _stabilizer_rank(min(min_qubits, 10))
+        times = {'serial': [], 'parallel': []}
+        for rank in ranks:
+            config['extended_stabilizer_approximation_error'] = math.sqrt(
+                _T_EXTENT / rank)
+            times['serial'].append(_time(
+                controller, circuit,
+                dict(config, max_parallel_threads=1), repeats))
+            times['parallel'].append(_time(
+                controller, circuit,
+                dict(config, extended_stabilizer_parallel_threshold=1),
+                repeats))
+        options['extended_stabilizer_parallel_threshold'] = _best_threshold(
+            ranks, times['serial'], times['parallel'])
+
+    # Time estimates
+    benchmarks = [('statevector', _layers(max_qubits)),
+                  ('stabilizer', _clifford(max(max_qubits, 50))),
+                  ('extended_stabilizer', _stabilizer_rank(min(min_qubits, 10)))]
+    seconds_per_cost = {}
+    for method, circuit in benchmarks:
+        config = dict(options, method=method, max_parallel_threads=1)
+        cost = _cost(estimate, circuit, config)
+        seconds_per_cost[method] = _time(controller, circuit, config,
+                                         repeats) / cost
+    options['estimate_seconds_per_cost'] = seconds_per_cost
+    return options
+
+
+def main(argv=None):
+    """Run the aer-autotune command."""
+    parser = argparse.ArgumentParser(
+        prog='aer-autotune',
+        description='Tune the Qiskit Aer simulator thresholds for this '
+        'machine and save them to a profile that the QasmSimulator uses as '
+        'default backend options.')
+    parser.add_argument('-o', '--output', default=None,
+                        help='profile file (default: {})'.format(
+                            default_profile_path()))
+    parser.add_argument('--min-qubits', type=int, default=8,
+                        help='smallest benchmark circuit width (default: 8)')
+    parser.add_argument('--max-qubits', type=int, default=20,
+                        help='largest benchmark circuit width (default: 20)')
+    parser.add_argument('--repeats', type=int, default=3,
+                        help='number of times each benchmark is timed '
+                        '(default: 3)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='print the tuned options without saving them')
+    args = parser.parse_args(argv)
+    if not 1 <= args.min_qubits <= args.max_qubits:
+        parser.error('invalid benchmark circuit widths')
+
+    options = autotune(min_qubits=args.min_qubits, max_qubits=args.max_qubits,
+                       repeats=args.repeats)
+    print(json.dumps(options, indent=2, sort_keys=True))
+    if not args.dry_run:
+        path = save_profile(options, args.output)
+        print('Saved profile to {}'.format(path))
+    return 0
+
+
+def _best_threshold(sizes, disabled_times, enabled_times):
+    """Return the threshold that sizes must be greater than to enable an
+    optimization with the smallest total time for the benchmarks."""
+    candidates = [sizes[0] - 1] + list(sizes)
+
+    def total(threshold):
+        return sum(enabled if size > threshold else disabled
+                   for size, disabled, enabled
+                   in zip(sizes, disabled_times, enabled_times))
+    return min(candidates, key=total)
+
+
+def _time(controller, experiment, config, repeats):
+    """Return the fastest time taken by an experiment."""
+    config = dict(config)
+    config.setdefault('shots', 1)
+    config.setdefault('seed', 1)
+    qobj = {'qobj_id': 'autotune', 'type': 'QASM', 'schema_version': '1.0',
+            'config': config, 'experiments': [experiment]}
+    best = None
+    for _ in range(repeats):
+        output = controller(qobj)
+        result = output.get('results', [{}])[0]
+        if not result.get('success', False):
+            raise AerError('autotune benchmark failed: {}'.format(
+                result.get('status', output.get('status'))))
+        if best is None or result['time_taken'] < best:
+            best = result['time_taken']
+    return best
+
+
+def _cost(estimate, experiment, config):
+    """Return the estimated cost of an experiment."""
+    config = dict(config)
+    config.setdefault('shots', 1)
+    qobj = {'qobj_id': 'autotune', 'type': 'QASM', 'schema_version': '1.0',
+            'config': config, 'experiments': [experiment]}
+    result = estimate(qobj).get('results', [{}])[0]
+    if not result.get('success', False) or result.get('cost', 0) <= 0:
+        raise AerError('autotune estimate failed: {}'.format(
+            result.get('status')))
+    return result['cost']
+
+
+def _experiment(num_qubits, instructions):
+    """Return an experiment dictionary."""
+    return {
+        'header': {'name': 'autotune'},
+        'config': {'n_qubits': num_qubits, 'memory_slots': num_qubits},
+        'instructions': instructions
+    }
+
+
+def _layers(num_qubits, depth=10):
+    """Return layers of single-qubit gates and CNOTs on all qubits."""
+    instructions = []
+    for layer in range(depth):
+        for qubit in range(num_qubits):
+            instructions.append({'name': 'u3', 'qubits': [qubit],
+                                 'params': [0.1 * (layer + 1), 0.2, 0.3]})
+        for qubit in range(layer % 2, num_qubits - 1, 2):
+            instructions.append({'name': 'cx', 'qubits': [qubit, qubit + 1]})
+    return _experiment(num_qubits, instructions)
+
+
+def _sampling(num_qubits):
+    """Return a uniform superposition with measurements on all qubits."""
+    instructions = [{'name': 'h', 'qubits': [qubit]}
+                    for qubit in range(num_qubits)]
+    instructions.append({'name': 'measure', 'qubits': list(range(num_qubits)),
+                         'memory': list(range(num_qubits))})
+    return _experiment(num_qubits, instructions)
+
+
+def _clifford(num_qubits, depth=20):
+    """Return layers of Hadamards and CNOTs with measurements."""
+    instructions = []
+    for layer in range(depth):
+        instructions += [{'name': 'h', 'qubits': [qubit]}
+                         for qubit in range(num_qubits)]
+        instructions += [{'name': 'cx', 'qubits': [qubit, qubit + 1]}
+                         for qubit in range(layer % 2, num_qubits - 1, 2)]
+    instructions.append({'name': 'measure', 'qubits': list(range(num_qubits)),
+                         'memory': list(range(num_qubits))})
+    return _experiment(num_qubits, instructions)
+
+
+def _stabilizer_rank(num_qubits):
+    """Return a Clifford circuit with a single T gate and measurements."""
+    instructions = [{'name': 'h', 'qubits': [qubit]}
+                    for qubit in range(num_qubits)]
+    instructions += [{'name': 'cx', 'qubits': [qubit, qubit + 1]}
+                     for qubit in range(num_qubits - 1)]
+    instructions.append({'name': 't', 'qubits': [0]})
+    instructions.append({'name': 'h', 'qubits': [0]})
+    instructions.append({'name': 'measure', 'qubits': list(range(num_qubits)),
+                         'memory': list(range(num_qubits))})
+    return _experiment(num_qubits, instructions)
@@ -62,6 +62,40 @@ def get_instr_pos(qobj, exp_index, name):
     return positions
 
 
+def set_parameter_binds(qobj, exp_index, positions, binds):
+    """Make a Qobj experiment a parameterized experiment.
+
+    A parameterized experiment is executed once for each row of the
+    parameter bind table, with the instruction parameters at the
+    parameter positions set to the values in that row. The results for
+    each row are returned consecutively in the result in row order.
+
+    Args:
+        qobj (Qobj): a Qobj object.
+        exp_index (int): The index of the experiment in the qobj.
+        positions (list): list of pairs (instr_pos, param_pos) of the
+                          instruction and parameter indices bound by each
+                          column of the bind table.
+        binds (matrix_like): a 2-D bind table with one row of parameter
+                             values for each experiment to execute.
+
+    Returns:
+        Qobj: The qobj with the parameterized experiment.
+
+    Raises:
+        ValueError: if the bind table shape does not match the positions.
+    """
+    binds = np.array(binds, dtype=float, ndmin=2)
+    positions = [[int(pos[0]), int(pos[1])] for pos in positions]
+    if binds.ndim != 2 or binds.shape[1] != len(positions):
+        raise ValueError("Parameter bind table must be a 2-D array with a "
+                         "column for each parameter position.")
+    config = qobj.experiments[exp_index].config
+    config.parameter_positions = positions
+    config.parameter_binds = binds
+    return qobj
+
+
 def unitary_instr(mat, qubits, label=None):
     """Create a unitary gate QasmQobjInstruction.
 
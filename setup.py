@@ -58,5 +58,10 @@ setup(
     ],
     install_requires=requirements,
     include_package_data=True,
+    entry_points={
+        'console_scripts': [
+            'aer-autotune = qiskit.providers.aer.utils.autotune:main'
+        ]
+    },
     keywords="qiskit aer simulator quantum addon backend"
 )
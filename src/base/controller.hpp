@@ -8,13 +8,24 @@
 #ifndef _aer_base_controller_hpp_
 #define _aer_base_controller_hpp_
 
+#include <algorithm>
+#include <atomic>
 #include <chrono>
+#include <cmath>
+#include <condition_variable>
 #include <cstdint>
+#include <functional>
 #include <iostream>
+#include <limits>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <numeric>
 #include <random>
 #include <sstream>
 #include <stdexcept>
 #include <string>
+#include <unordered_map>
 #include <vector>
 
 #if defined(__linux__) || defined(__APPLE__)
@@ -26,6 +37,10 @@
 #endif
 
 // Base Controller
+#include "framework/buffer_pool.hpp"
+#include "framework/cancellation.hpp"
+#include "framework/memory_tracker.hpp"
+#include "framework/profiler.hpp"
 #include "framework/qobj.hpp"
 #include "framework/data.hpp"
 #include "framework/rng.hpp"
@@ -45,16 +60,135 @@ namespace AER {
 //=========================================================================
 
 // This is used to make wrapping Controller classes in Cython easier
-// by handling the parsing of std::string input into JSON objects.
+// by handling the configuration and execution of a qobj JSON object.
 template <class controller_t>
-std::string controller_execute(const std::string &qobj_str) {
+json_t controller_execute(const json_t &qobj_js) {
   controller_t controller;
-  auto qobj_js = json_t::parse(qobj_str);
   // Check for config
   if (JSON::check_key("config", qobj_js)) {
     controller.set_config(qobj_js["config"]);
   }
-  return controller.execute(qobj_js).dump(-1);
+  return controller.execute(qobj_js);
+}
+
+// This handles the parsing of std::string input into JSON objects and the
+// serialization of the output JSON into a std::string.
+template <class controller_t>
+std::string controller_execute(const std::string &qobj_str) {
+  return controller_execute<controller_t>(json_t::parse(qobj_str)).dump(-1);
+}
+
+//=========================================================================
+// Controller Session
+//=========================================================================
+
+// A controller session stores a controller configured with the session
+// config settings and noise model, which is used to execute a sequence of
+// qobjs, so that the config and noise model are loaded once for the session
+// rather than once for every qobj.
+//
+// Each qobj is executed on a copy of the session controller, which shares
+// its noise model, updated with the settings of the qobj config that are
+// not session settings, so that session settings take precedence over qobj
+// settings. If the session has no noise model, a "noise_model" in the qobj
+// config is used instead.
+//
+// A session is not modified by executing a qobj, so several qobjs may be
+// executed concurrently on the same session.
+
+template <class controller_t>
+class ControllerSession {
+public:
+
+  ControllerSession() = default;
+  explicit ControllerSession(const json_t &config) {set_config(config);}
+
+  // Set the session config settings and load the session noise model.
+  // This replaces any previous session config.
+  void set_config(const json_t &config);
+
+  // Return the session config settings, without the noise model
+  const json_t &config() const {return config_;}
+
+  // Execute a qobj using the session config and noise model
+  json_t execute(json_t qobj_js) const;
+
+  // Execute a qobj using the session config and noise model. Complex array
+  // data is returned in the array_results vector, as for
+  // Controller::execute. If a callback is given it is called with each
+  // experiment result as it completes (see
+  // Controller::set_experiment_callback), and if a cancellation is given
+  // it may be used to cancel execution (see Controller::set_cancellation).
+  json_t execute(json_t qobj_js,
+                 std::vector<ArrayData> &array_results,
+                 typename controller_t::ExperimentCallback callback = nullptr,
+                 std::shared_ptr<Cancellation> cancellation = nullptr) const;
+
+protected:
+
+  // Return a controller configured for the qobj. The qobj config is
+  // updated with the session config.
+  controller_t configure(json_t &qobj_js) const;
+
+  // Session config settings
+  json_t config_ = json_t::object();
+
+  // Controller configured with the session config and noise model
+  controller_t controller_;
+  bool has_noise_model_ = false;
+};
+
+template <class controller_t>
+void ControllerSession<controller_t>::set_config(const json_t &config) {
+  config_ = config.is_object() ? config : json_t::object();
+  has_noise_model_ = JSON::check_key("noise_model", config_);
+  std::shared_ptr<const Noise::NoiseModel> noise_model;
+  if (has_noise_model_) {
+    noise_model = std::make_shared<const Noise::NoiseModel>(config_["noise_model"]);
+    config_.erase("noise_model");
+  }
+  controller_ = controller_t();
+  controller_.set_config(config_);
+  if (has_noise_model_)
+    controller_.set_noise_model(std::move(noise_model));
+}
+
+template <class controller_t>
+controller_t ControllerSession<controller_t>::configure(json_t &qobj_js) const {
+  json_t &config = qobj_js["config"];
+  if (!config.is_object())
+    config = json_t::object();
+  // Settings of the qobj config that are not set by the session
+  json_t qobj_config = json_t::object();
+  for (auto it = config.cbegin(); it != config.cend(); ++it) {
+    if (config_.find(it.key()) == config_.end() &&
+        !(has_noise_model_ && it.key() == "noise_model"))
+      qobj_config[it.key()] = it.value();
+  }
+  for (auto it = config_.cbegin(); it != config_.cend(); ++it)
+    config[it.key()] = it.value();
+  if (has_noise_model_)
+    config.erase("noise_model");
+  controller_t controller(controller_);
+  if (!qobj_config.empty())
+    controller.set_config(qobj_config);
+  return controller;
+}
+
+template <class controller_t>
+json_t ControllerSession<controller_t>::execute(json_t qobj_js) const {
+  return configure(qobj_js).execute(qobj_js);
+}
+
+template <class controller_t>
+json_t ControllerSession<controller_t>::execute(json_t qobj_js,
+                                                std::vector<ArrayData> &array_results,
+                                                typename controller_t::ExperimentCallback callback,
+                                                std::shared_ptr<Cancellation> cancellation) const {
+  controller_t controller = configure(qobj_js);
+  controller.set_experiment_callback(std::move(callback));
+  controller.set_cancellation(std::move(cancellation));
+  return controller.execute(qobj_js, array_results);
 }
 
 namespace Base {
@@ -77,11 +211,15 @@ namespace Base {
  *  2. Parallel execution of shots in a Circuit
  *  3. Parallelization used by the State class for performing gates.
  *
- * Options 1 and 2 are mutually exclusive: enabling circuit parallelization
- * disables shot parallelization. Option 3 is available for both cases but
- * conservatively limits the number of threads since these are subthreads
- * spawned by the higher level threads. If no parallelization is used for
- * 1 and 2, all available threads will be used for 3.
+ * All levels share one budget of max_parallel_threads threads and
+ * max_memory_mb memory. When circuits are executed in parallel each
+ * experiment is allocated a share of the threads proportional to its
+ * estimated cost (see `circuit_cost`), and experiments are executed as
+ * soon as their threads and memory are free, with the most costly
+ * experiments started first. The threads allocated to an experiment are
+ * then divided between parallel shots and State updates (see
+ * `allocate_threads`). If circuits are executed serially each experiment
+ * is allocated all threads.
  *
  * -------------------------
  * Config settings:
@@ -99,6 +237,34 @@ namespace Base {
  * - "max_memory_mb" (int): Sets the maximum size of memory for a store.
  *      If a state needs more, an error is thrown. If set to 0, the maximum
  *      will be automatically set to the system memory size [Default: 0].
+ * - "shared_prefix_enable" (bool): Execute circuits that start with the
+ *      same sequence of gates from the state after those gates, which is
+ *      only simulated once. Only used if experiments are not executed in
+ *      parallel [Default: True].
+ * - "shared_prefix_threshold" (int): The minimum number of shared initial
+ *      gates for circuits to be executed from a shared state [Default: 10].
+ * - "deduplication_enable" (bool): Execute identical circuits once with
+ *      their total shots, and randomly split the sampled shots between
+ *      them, if supported by the controller [Default: True].
+ * - "execution_timeout" (double): Cancel execution once this many seconds
+ *      have passed since it started. Set to 0 for no timeout [Default: 0].
+ * - "shot_batch_size" (int): The number of shots in each batch handed out
+ *      to a thread for parallel shot execution. Set to 0 to use one batch
+ *      per thread for ideal circuits, and batches of at most 1/16th of the
+ *      shots per thread for noisy circuits [Default: 0].
+ * - "estimate_seconds_per_cost" (json): Seconds taken per unit of
+ *      circuit_cost for each simulation method, used for the time
+ *      estimates of `estimate` [Default: built in values].
+ * - "profile_enable" (bool): Record the time taken by each op type, noise
+ *      sampling, circuit optimization passes, measurement sampling and
+ *      result serialization, and return the aggregated times in the
+ *      "profile" field of the qobj result metadata. This is also enabled by
+ *      setting the QISKIT_AER_PROFILING environment variable
+ *      [Default: False].
+ * - "profile_trace_file" (str): If set, profiling is enabled and the timed
+ *      sections are also written to this file as a Chrome trace-event JSON
+ *      file. This may also be set by the QISKIT_AER_PROFILING_TRACE
+ *      environment variable [Default: ""].
  *
  * Config settings from Data class:
  *
@@ -123,17 +289,67 @@ public:
   // class.
   virtual json_t execute(const json_t &qobj);
 
+  // Load a QOBJ from a JSON file and execute on the State type class.
+  // Any complex array data stored by the simulation (see the
+  // "return_numpy" config option) is returned in the array_results
+  // vector, which has one entry for each experiment, instead of being
+  // added to the JSON result.
+  virtual json_t execute(const json_t &qobj,
+                         std::vector<ArrayData> &array_results);
+
+  // Return an estimate of the resources needed to execute a qobj without
+  // executing it. For each experiment this reports the simulation method,
+  // the required and peak memory, the thread allocation, whether noise is
+  // sampled and measurements are sampled, and a time estimate from the
+  // circuit cost and the "estimate_seconds_per_cost" config setting.
+  virtual json_t estimate(const json_t &qobj);
+
+  // Function called with the index, result and array data of each
+  // experiment during qobj execution.
+  using ExperimentCallback = std::function<void(size_t, json_t &, ArrayData &)>;
+
+  // Set a function that is called with the result of each experiment as
+  // soon as the experiment has completed, in order of completion. If the
+  // callback moves the result or array data out, they are left empty in
+  // the returned qobj result. Calls are serialized, and the callback must
+  // not throw if experiments are executed in parallel.
+  void set_experiment_callback(ExperimentCallback callback);
+
+  // Set a cancellation flag for qobj execution. Execution is cancelled
+  // cooperatively: the flag is checked between experiments, between shots
+  // and between the ops applied to a State. Experiments that were not
+  // completed when execution was cancelled return a "CANCELLED" status,
+  // while completed experiments return their results.
+  void set_cancellation(std::shared_ptr<Cancellation> cancellation);
+
+  // Return the profiler of the current or last execution, or nullptr if
+  // profiling is disabled (see the "profile_enable" config setting)
+  Profiler *profiler() const {return profiler_.get();}
+
+  // Return the memory tracker of the current or last execution, whose
+  // peaks are reported in the qobj result metadata
+  MemoryTracker *memory_tracker() const {return memory_tracker_.get();}
+
   //-----------------------------------------------------------------------
   // Config settings
   //-----------------------------------------------------------------------
 
   // Load Controller, State and Data config from a JSON
-  // config settings will be passed to the State and Data classes
+  // config settings will be passed to the State and Data classes.
+  // Settings that are not in the config keep their current values.
   virtual void set_config(const json_t &config);
 
   // Clear the current config
   void virtual clear_config();
 
+  // Set the noise model used for simulation. This replaces any noise model
+  // loaded from the "noise_model" config setting.
+  void set_noise_model(const Noise::NoiseModel &noise_model);
+
+  // Set a noise model used for simulation that is shared with other
+  // controllers, without copying it
+  void set_noise_model(std::shared_ptr<const Noise::NoiseModel> noise_model);
+
   // Add circuit optimization
   template <typename Type>
   inline auto add_circuit_optimization(Type&& opt)-> typename std::enable_if_t<std::is_base_of<CircuitOptimization, std::remove_const_t<std::remove_reference_t<Type>>>::value >
@@ -147,17 +363,172 @@ protected:
   // Circuit Execution
   //-----------------------------------------------------------------------
 
-  // Parallel execution of a circuit
-  // This function manages parallel shot configuration and internally calls
-  // the `run_circuit` method for each shot thread
-  virtual json_t execute_circuit(Circuit &circ);
+  // Thread allocation for executing a circuit
+  struct ThreadAllocation {
+    int threads = 1;      // Total number of threads
+    int shots = 1;        // Threads for executing shots in parallel
+    int state_update = 1; // Threads for each State of a shot thread
+  };
+
+  // Execution plan of a circuit. The plan is computed once for each circuit
+  // by `plan_circuit` before it is executed, and is then used for
+  // parallelization, shot pooling and by `run_circuit` instead of
+  // inspecting the circuit again.
+  struct ExecutionPlan {
+    int method = 0;                 // Simulation method of the controller
+    size_t memory_mb = 0;           // Required memory of a State
+    double cost = 0.;               // Estimated relative cost
+    bool noise = false;             // Noise is sampled for each shot
+    bool measure_sampling = false;  // Measurements may be sampled
+    size_t measure_pos = 0;         // Position of the first measurement
+    size_t noise_prefix = 0;        // Ideal prefix ops shared by noisy shots
+    double error_free_probability = 0.; // Probability of a shot without errors
+    // Errors of the circuit ops compiled from the noise model, which are
+    // shared by all shots of the circuit
+    std::shared_ptr<const Noise::NoiseModel::CircuitNoise> circuit_noise;
+    ThreadAllocation threads;       // Threads allocated for execution
+    std::string error;              // Error if the circuit cannot be executed
+    MemoryTracker *memory_tracker = nullptr; // Tracker of the experiment memory
+
+    // Return true if all shots are measure sampled from a single
+    // simulation, which is the case for ideal circuits that support measure
+    // sampling and noisy circuits whose quantum errors are all ideal
+    bool sampled() const {
+      return measure_sampling &&
+        (!noise || (circuit_noise && circuit_noise->ideal_probability == 1.));
+    }
+  };
+
+  // Return the execution plan of a circuit. The thread allocation is set
+  // when the circuit is executed. An exception is thrown if the circuit
+  // cannot be executed.
+  virtual ExecutionPlan plan_circuit(const Circuit &circ) const;
+
+  // Return the execution plan of a circuit, with the error message set
+  // instead of throwing if the circuit cannot be executed
+  ExecutionPlan try_plan_circuit(const Circuit &circ) const;
+
+  // Return the name of the simulation method of a plan
+  virtual std::string method_name(const ExecutionPlan &plan) const = 0;
+
+  // Return the default seconds taken per unit of circuit cost for a
+  // simulation method
+  static double default_seconds_per_cost(const std::string &method);
+
+  // Return the threads and memory allocated to each of the experiments,
+  // which are pairs (circuit index, bind row), when experiments are
+  // executed in parallel. Experiments are allocated a share of the threads
+  // proportional to their estimated cost, and enough memory to use their
+  // threads for parallel shots. Skipped experiments are allocated one
+  // thread and no memory.
+  void allocate_experiments(const std::vector<Circuit> &circuits,
+                            const std::vector<ExecutionPlan> &plans,
+                            const std::vector<std::pair<int, uint_t>> &experiments,
+                            const std::vector<bool> &skipped,
+                            std::vector<int> &exp_threads,
+                            std::vector<size_t> &exp_memory) const;
+
+  // Parallel execution of a circuit using at most the input number of
+  // threads and memory. This function manages parallel shot configuration
+  // and internally calls the `run_circuit` method for each shot thread.
+  // Complex array data is moved into the array_data argument.
+  virtual json_t execute_circuit(Circuit &circ, ExecutionPlan plan,
+                                 int threads, size_t memory_mb,
+                                 ArrayData &array_data);
+
+  // Execute a single experiment of a circuit. If the circuit is
+  // parameterized its parameters are bound to the given row of the
+  // parameter bind table before calling `execute_circuit`.
+  json_t execute_experiment(Circuit &circ, const ExecutionPlan &plan,
+                            uint_t bind_row, int threads, size_t memory_mb,
+                            ArrayData &array_data);
+
+  //-----------------------------------------------------------------------
+  // Shared prefix optimization
+  //-----------------------------------------------------------------------
+
+  // Circuits that start with the same sequence of deterministic ops
+  // (non-conditional gates and matrices) may be executed from the state
+  // after applying those ops, which is then only simulated once for all of
+  // the circuits.
+
+  // Prepare the state after applying the first prefix_size ops of a
+  // circuit. While it is set, `run_circuit` must use this state as the
+  // initial state for the remaining ops of the circuits sharing the
+  // prefix. Returns false if this is not supported for the circuit.
+  // The base class does not support shared prefixes.
+  virtual bool set_shared_prefix(const Circuit &circ,
+                                 const ExecutionPlan &plan,
+                                 size_t prefix_size);
+
+  // Clear the shared prefix state
+  virtual void clear_shared_prefix();
+
+  // Return groups of indexes of non-parameterized circuits that share at
+  // least the first shared_prefix_threshold_ ops and are planned with the
+  // same simulation method, and the number of shared ops for each group.
+  // Circuits with excluded set to true or that cannot be executed are
+  // ignored.
+  std::vector<std::pair<std::vector<int>, size_t>>
+  shared_prefix_groups(const std::vector<Circuit> &circuits,
+                       const std::vector<ExecutionPlan> &plans,
+                       const std::vector<bool> &excluded) const;
+
+  // Execute the ops of a circuit after a shared prefix. This requires the
+  // shared prefix state to be set, and the circuit after the prefix is
+  // planned from that state.
+  json_t execute_circuit_suffix(const Circuit &circ, size_t prefix_size,
+                                ArrayData &array_data);
+
+  // Return true if an op may be part of a shared prefix
+  static bool shared_prefix_op(const Operations::Op &op);
+
+  //-----------------------------------------------------------------------
+  // Duplicate experiment pooling
+  //-----------------------------------------------------------------------
+
+  // Identical circuits whose shots may be pooled (see `pool_shots`) are
+  // executed once with the total shots of all the circuits. The sampled
+  // shots are then randomly partitioned between the circuits, which gives
+  // the same distribution of results as executing each circuit separately.
+
+  // Return true if the shots of identical copies of a circuit may be
+  // executed together and then split between the copies. The base class
+  // returns false.
+  virtual bool pool_shots(const Circuit &circ, const ExecutionPlan &plan) const;
+
+  // Return groups of indexes of identical non-parameterized circuits whose
+  // shots may be pooled. The first circuit in each group is executed.
+  std::vector<std::vector<int>>
+  pooled_circuit_groups(const std::vector<Circuit> &circuits,
+                        const std::vector<ExecutionPlan> &plans) const;
+
+  // Split the result of executing pooled circuits into results with the
+  // input number of shots by randomly partitioning the sampled shots
+  std::vector<json_t> split_pooled_result(const json_t &result,
+                                          const std::vector<uint_t> &shots,
+                                          RngEngine &rng) const;
+
+  //-----------------------------------------------------------------------
+  // Op comparison
+  //-----------------------------------------------------------------------
+
+  // Return a hash of an op for finding identical ops
+  static size_t op_hash(const Operations::Op &op);
 
-  // Abstract method for executing a circuit.
-  // This method must initialize a state and return output data for
-  // the required number of shots.
+  // Return true if two ops are identical
+  static bool op_equal(const Operations::Op &lhs, const Operations::Op &rhs);
+
+  // Abstract method for executing a circuit with its execution plan.
+  // This method must initialize a state that uses the plan's state update
+  // threads and return output data for the required number of shots,
+  // starting from the shot with index first_shot. The random numbers of
+  // each shot should be taken from the rng stream of its index for the
+  // circuit seed, so that results do not depend on how shots are batched.
   virtual OutputData run_circuit(const Circuit &circ,
+                                 const ExecutionPlan &plan,
                                  uint_t shots,
-                                 uint_t rng_seed) const = 0;
+                                 uint_t first_shot) const = 0;
 
   //-------------------------------------------------------------------------
   // State validation
@@ -201,12 +572,63 @@ protected:
   // Controller config settings
   json_t config_;
 
-  // Noise model
-  Noise::NoiseModel noise_model_;
+  // Noise model, which is shared by copies of the controller
+  std::shared_ptr<const Noise::NoiseModel> noise_model_ =
+    std::make_shared<const Noise::NoiseModel>();
 
   // Circuit optimization
   std::vector<std::shared_ptr<CircuitOptimization>> optimizations_;
 
+  // Shared prefix optimization settings
+  bool shared_prefix_enable_ = true;
+  uint_t shared_prefix_threshold_ = 10;
+
+  // Duplicate experiment pooling setting
+  bool deduplication_enable_ = true;
+
+  // Number of shots in each batch for parallel shot execution, or 0 to
+  // choose the batch size automatically
+  uint_t shot_batch_size_ = 0;
+
+  // Seconds taken per unit of circuit cost for each simulation method
+  std::map<std::string, double> seconds_per_cost_;
+
+  // Called with each completed experiment result
+  ExperimentCallback experiment_callback_;
+
+  //-----------------------------------------------------------------------
+  // Cancellation
+  //-----------------------------------------------------------------------
+
+  // Throw a CancelledError if execution has been cancelled
+  void check_cancelled() const;
+
+  // Cancellation flag for execution, which may be null
+  std::shared_ptr<Cancellation> cancellation_;
+
+  // Execution timeout in seconds, or 0 for no timeout
+  double execution_timeout_ = 0;
+
+  //-----------------------------------------------------------------------
+  // Profiling
+  //-----------------------------------------------------------------------
+
+  // Add the profile of an execution to the qobj result metadata, and write
+  // the trace file if it is set
+  void add_profile(json_t &result) const;
+
+  // Profiling settings, which default to the environment variable settings
+  bool profile_enable_ = Profiler::env_enable();
+  std::string profile_trace_file_ = Profiler::env_trace_file();
+
+  // Profiler of the current execution, which is null if profiling is
+  // disabled
+  std::shared_ptr<Profiler> profiler_;
+
+  // Memory tracker of the current execution. The trackers of experiments
+  // are children of this tracker.
+  std::shared_ptr<MemoryTracker> memory_tracker_;
+
   //-----------------------------------------------------------------------
   // Parallelization Config
   //-----------------------------------------------------------------------
@@ -214,11 +636,27 @@ protected:
   // Set OpenMP thread settings to default values
   void clear_parallelization();
 
-  // Set parallelization for experiments
-  virtual void set_parallelization(const std::vector<Circuit>& circuits);
+  // Set the number of experiments that may be executed in parallel
+  virtual void set_parallelization(const std::vector<Circuit>& circuits,
+                                   const std::vector<ExecutionPlan>& plans);
+
+  // Return the allocation of the input number of threads between parallel
+  // shots and State updates for a circuit, where the States of parallel
+  // shots may use at most memory_mb memory in total
+  virtual ThreadAllocation allocate_threads(const Circuit& circuit,
+                                            const ExecutionPlan& plan,
+                                            int threads,
+                                            size_t memory_mb) const;
+
+  // Return an estimate of the relative cost of executing a circuit, which
+  // is used to divide threads between experiments executed in parallel
+  virtual double circuit_cost(const Circuit& circuit,
+                              const ExecutionPlan& plan) const;
 
-  // Set parallelization for a circuit
-  virtual void set_parallelization(const Circuit& circuit);
+  // Return the number of shots in each batch for parallel shot execution
+  // of a circuit with the plan's number of shot threads
+  uint_t shot_batch_size(const Circuit& circuit,
+                         const ExecutionPlan& plan) const;
 
   // Return an estimate of the required memory for a circuit.
   virtual size_t required_memory_mb(const Circuit& circuit) const = 0;
@@ -234,10 +672,8 @@ protected:
   int max_parallel_shots_;
   int max_memory_mb_;
 
-  // Parameters for parallelization management for experiments
+  // Number of experiments that may be executed in parallel
   int parallel_experiments_;
-  int parallel_shots_;
-  int parallel_state_update_;
 };
 
 
@@ -250,67 +686,145 @@ protected:
 //-------------------------------------------------------------------------
 
 void Controller::set_config(const json_t &config) {
+  // Settings update those of any previous config, so a configured
+  // controller may be updated with the settings that differ
+  const bool configured = config_.is_object();
+  if (!configured)
+    config_ = json_t::object();
   // Save config for passing to State and Data classes
-  config_ = config;
+  for (auto it = config.cbegin(); it != config.cend(); ++it)
+    config_[it.key()] = it.value();
 
   // Load noise model
   if (JSON::check_key("noise_model", config))
-    noise_model_ = Noise::NoiseModel(config["noise_model"]);
+    noise_model_ = std::make_shared<const Noise::NoiseModel>(config["noise_model"]);
 
   // Load OpenMP maximum thread settings
   JSON::get_value(max_parallel_threads_, "max_parallel_threads", config);
   JSON::get_value(max_parallel_shots_, "max_parallel_shots", config);
   JSON::get_value(max_parallel_experiments_, "max_parallel_experiments", config);
 
-  // Prevent using both parallel circuits and parallel shots
-  // with preference given to parallel circuit execution
-  if (max_parallel_experiments_ > 1)
-    max_parallel_shots_ = 1;
+  // Load shared prefix optimization settings
+  JSON::get_value(shared_prefix_enable_, "shared_prefix_enable", config);
+  JSON::get_value(shared_prefix_threshold_, "shared_prefix_threshold", config);
+  JSON::get_value(deduplication_enable_, "deduplication_enable", config);
+  JSON::get_value(execution_timeout_, "execution_timeout", config);
+  JSON::get_value(shot_batch_size_, "shot_batch_size", config);
+  JSON::get_value(profile_enable_, "profile_enable", config);
+  JSON::get_value(profile_trace_file_, "profile_trace_file", config);
+  if (JSON::check_key("estimate_seconds_per_cost", config)) {
+    for (auto it = config["estimate_seconds_per_cost"].cbegin();
+         it != config["estimate_seconds_per_cost"].cend(); ++it)
+      seconds_per_cost_[it.key()] = it.value().get<double>();
+  }
 
   if (JSON::check_key("max_memory_mb", config)) {
     JSON::get_value(max_memory_mb_, "max_memory_mb", config);
-  } else {
+  } else if (!configured) {
     auto system_memory_mb = get_system_memory_mb();
     max_memory_mb_ = system_memory_mb / 2;
   }
 
-  for (std::shared_ptr<CircuitOptimization> opt: optimizations_)
+  // The optimizations may be shared with the controller this controller
+  // was copied from, so they are replaced by configured copies
+  for (auto &opt : optimizations_) {
+    opt = opt->clone();
     opt->set_config(config_);
+  }
 
-  std::string path;
-  JSON::get_value(path, "library_dir", config);
-  // Fix for MacOS and OpenMP library double initialization crash.
-  // Issue: https://github.com/Qiskit/qiskit-aer/issues/1
-  Hacks::maybe_load_openmp(path);
+  if (!configured || JSON::check_key("library_dir", config)) {
+    std::string path;
+    JSON::get_value(path, "library_dir", config);
+    // Fix for MacOS and OpenMP library double initialization crash.
+    // Issue: https://github.com/Qiskit/qiskit-aer/issues/1
+    Hacks::maybe_load_openmp(path);
+  }
 }
 
 void Controller::clear_config() {
   config_ = json_t();
-  noise_model_ = Noise::NoiseModel();
+  noise_model_ = std::make_shared<const Noise::NoiseModel>();
+  shared_prefix_enable_ = true;
+  shared_prefix_threshold_ = 10;
+  deduplication_enable_ = true;
+  execution_timeout_ = 0;
+  shot_batch_size_ = 0;
+  seconds_per_cost_.clear();
+  profile_enable_ = Profiler::env_enable();
+  profile_trace_file_ = Profiler::env_trace_file();
   clear_parallelization();
 }
 
+void Controller::set_experiment_callback(ExperimentCallback callback) {
+  experiment_callback_ = std::move(callback);
+}
+
+void Controller::set_cancellation(std::shared_ptr<Cancellation> cancellation) {
+  cancellation_ = std::move(cancellation);
+}
+
+void Controller::check_cancelled() const {
+  if (cancellation_)
+    cancellation_->check();
+}
+
+void Controller::add_profile(json_t &result) const {
+  if (!profiler_)
+    return;
+  json_t &profile = result["metadata"]["profile"];
+  profile = profiler_->summary();
+  if (!profile_trace_file_.empty()) {
+    // A trace that can't be written shouldn't fail the simulation
+    try {
+      profiler_->write_trace(profile_trace_file_);
+      profile["trace_file"] = profile_trace_file_;
+    } catch (std::exception &e) {
+      profile["trace_error"] = std::string(e.what());
+    }
+  }
+}
+
+void Controller::set_noise_model(const Noise::NoiseModel &noise_model) {
+  noise_model_ = std::make_shared<const Noise::NoiseModel>(noise_model);
+}
+
+void Controller::set_noise_model(std::shared_ptr<const Noise::NoiseModel> noise_model) {
+  noise_model_ = std::move(noise_model);
+}
+
 void Controller::clear_parallelization() {
   max_parallel_threads_ = 0;
   max_parallel_experiments_ = 1;
   max_parallel_shots_ = 1;
 
   parallel_experiments_ = 1;
-  parallel_shots_ = 1;
-  parallel_state_update_ = 1;
 }
 
-void Controller::set_parallelization(const std::vector<Circuit>& circuits) {
+void Controller::set_parallelization(const std::vector<Circuit>& circuits,
+                                     const std::vector<ExecutionPlan>& plans) {
 
-  if (max_parallel_experiments_ <= 0)
-    return;
+  // Use the maximum number of threads if max_parallel_experiments is 0
+  const int max_experiments = (max_parallel_experiments_ > 0)
+    ? max_parallel_experiments_ : max_parallel_threads_;
 
   // if memory allows, execute experiments in parallel
   std::vector<size_t> required_memory_mb_list;
-  for (const Circuit &circ : circuits)
-    required_memory_mb_list.push_back(required_memory_mb(circ));
+  size_t num_experiments = 0;
+  for (size_t i = 0; i < circuits.size(); ++i) {
+    // Circuits that cannot be executed report their errors when executed
+    if (!plans[i].error.empty())
+      continue;
+    // Parameterized circuits are executed once for each parameter bind
+    for (uint_t row = 0; row < circuits[i].num_experiments(); ++row)
+      required_memory_mb_list.push_back(plans[i].memory_mb);
+    num_experiments += circuits[i].num_experiments();
+  }
   std::sort(required_memory_mb_list.begin(), required_memory_mb_list.end(), std::greater<size_t>());
 
+  if (required_memory_mb_list.empty()) {
+    parallel_experiments_ = 1;
+    return;
+  }
   int total_memory = 0;
   parallel_experiments_ = 0;
   for (int required_memory_mb : required_memory_mb_list) {
@@ -324,39 +838,376 @@ void Controller::set_parallelization(const std::vector<Circuit>& circuits) {
     throw std::runtime_error("a circuit requires more memory than max_memory_mb.");
   } else if (parallel_experiments_ != 1) {
     parallel_experiments_ = std::min<int> ({ parallel_experiments_,
-                                             max_parallel_experiments_,
+                                             max_experiments,
                                              max_parallel_threads_,
-                                             static_cast<int>(circuits.size()) });
+                                             static_cast<int>(num_experiments) });
   }
 }
 
-void Controller::set_parallelization(const Circuit& circ) {
+Controller::ThreadAllocation
+Controller::allocate_threads(const Circuit& circ, const ExecutionPlan& plan,
+                             int threads, size_t memory_mb) const {
+  ThreadAllocation alloc;
+  alloc.threads = std::max(1, threads);
 
-  if (max_parallel_threads_ < max_parallel_shots_)
-    max_parallel_shots_ = max_parallel_threads_;
+  const size_t circ_memory_mb = plan.memory_mb;
 
-  auto circ_memory_mb = required_memory_mb(circ);
-
-  if (max_memory_mb_ < circ_memory_mb)
+  if (memory_mb < circ_memory_mb)
     throw std::runtime_error("a circuit requires more memory than max_memory_mb.");
 
   if (circ_memory_mb == 0)
-    parallel_shots_ = max_parallel_threads_;
+    alloc.shots = alloc.threads;
   else
-    parallel_shots_ = std::min<int> ({ static_cast<int>(max_memory_mb_ / circ_memory_mb),
-                                       max_parallel_threads_,
-                                       static_cast<int>(circ.shots) });
+    alloc.shots = std::min<int> ({ static_cast<int>(memory_mb / circ_memory_mb),
+                                   alloc.threads,
+                                   static_cast<int>(circ.shots) });
+  alloc.shots = std::max(1, alloc.shots);
 
   if (max_parallel_shots_ < 1) { // no nested parallelization if max_parallel_shots is not configured
-    if (parallel_shots_ == max_parallel_threads_) {
-      parallel_state_update_ = 1;
+    if (alloc.shots == alloc.threads) {
+      alloc.state_update = 1;
     } else {
-      parallel_shots_ = 1;
-      parallel_state_update_ = max_parallel_threads_;
+      alloc.shots = 1;
+      alloc.state_update = alloc.threads;
     }
   } else {
-    parallel_state_update_ = max_parallel_threads_ / parallel_shots_;
+    alloc.state_update = alloc.threads / alloc.shots;
+  }
+  return alloc;
+}
+
+double Controller::circuit_cost(const Circuit& circ,
+                                const ExecutionPlan& plan) const {
+  // Gates on an n-qubit state cost O(2^n), and noisy circuits execute
+  // every shot that is not sampled from the ideal circuit
+  double shots = 1.;
+  if (plan.noise && plan.error_free_probability > 0.)
+    shots += circ.shots * (1. - plan.error_free_probability);
+  else if (plan.noise)
+    shots = circ.shots;
+  return shots * (circ.ops.size() + 1) * std::pow(2., circ.num_qubits);
+}
+
+uint_t Controller::shot_batch_size(const Circuit& circ,
+                                   const ExecutionPlan& plan) const {
+  if (shot_batch_size_ > 0)
+    return shot_batch_size_;
+  const uint_t threads = std::max<int>(1, plan.threads.shots);
+  // Ideal shots have the same cost, and each batch may need to simulate
+  // the circuit before sampling measurements, so use one batch per thread
+  if (!plan.noise || plan.sampled())
+    return std::max<uint_t>(1, (circ.shots + threads - 1) / threads);
+  // The cost of noisy shots varies with the errors sampled for each shot,
+  // so use smaller batches that are balanced dynamically between threads
+  return std::max<uint_t>(1, circ.shots / (16 * threads));
+}
+
+
+//-------------------------------------------------------------------------
+// Shared prefix optimization
+//-------------------------------------------------------------------------
+
+bool Controller::set_shared_prefix(const Circuit &circ,
+                                   const ExecutionPlan &plan,
+                                   size_t prefix_size) {
+  return false;
+}
+
+void Controller::clear_shared_prefix() {}
+
+bool Controller::shared_prefix_op(const Operations::Op &op) {
+  if (op.conditional || op.old_conditional)
+    return false;
+  switch (op.type) {
+    case Operations::OpType::gate:
+    case Operations::OpType::matrix:
+    case Operations::OpType::matrix_sequence:
+    case Operations::OpType::barrier:
+      return true;
+    default:
+      return false;
+  }
+}
+
+std::vector<std::pair<std::vector<int>, size_t>>
+Controller::shared_prefix_groups(const std::vector<Circuit> &circuits,
+                                 const std::vector<ExecutionPlan> &plans,
+                                 const std::vector<bool> &excluded) const {
+  std::vector<std::pair<std::vector<int>, size_t>> groups;
+  const size_t threshold = std::max<size_t>(1, shared_prefix_threshold_);
+
+  // Hash the ops of each circuit that may be part of a shared prefix
+  std::vector<int> candidates;
+  std::vector<std::vector<size_t>> hashes(circuits.size());
+  for (size_t i = 0; i < circuits.size(); ++i) {
+    const auto &circ = circuits[i];
+    if (circ.parameterized() || excluded[i] || !plans[i].error.empty())
+      continue;
+    for (const auto &op : circ.ops) {
+      if (!shared_prefix_op(op))
+        break;
+      hashes[i].push_back(op_hash(op));
+    }
+    if (hashes[i].size() >= threshold)
+      candidates.push_back(i);
+  }
+  if (candidates.size() < 2)
+    return groups;
+
+  // Sort candidates so that circuits sharing a prefix are adjacent
+  std::sort(candidates.begin(), candidates.end(), [&](int a, int b) {
+    if (plans[a].method != plans[b].method)
+      return plans[a].method < plans[b].method;
+    if (circuits[a].num_qubits != circuits[b].num_qubits)
+      return circuits[a].num_qubits < circuits[b].num_qubits;
+    if (hashes[a] != hashes[b])
+      return std::lexicographical_compare(hashes[a].begin(), hashes[a].end(),
+                                          hashes[b].begin(), hashes[b].end());
+    return a < b;
+  });
+
+  // Return the number of shared prefix ops of two candidates. The prefix
+  // state is simulated with the method of the first circuit of a group, so
+  // circuits with different methods do not share a prefix.
+  auto shared_size = [&](int a, int b) -> size_t {
+    if (plans[a].method != plans[b].method ||
+        circuits[a].num_qubits != circuits[b].num_qubits)
+      return 0;
+    const size_t max_size = std::min(hashes[a].size(), hashes[b].size());
+    size_t size = 0;
+    while (size < max_size && hashes[a][size] == hashes[b][size] &&
+           op_equal(circuits[a].ops[size], circuits[b].ops[size]))
+      ++size;
+    return size;
+  };
+
+  // Group adjacent candidates which share at least the prefix shared by
+  // the first two circuits in the group
+  std::vector<int> group = {candidates[0]};
+  size_t prefix_size = 0;
+  for (size_t k = 1; k <= candidates.size(); ++k) {
+    size_t size = 0;
+    if (k < candidates.size())
+      size = shared_size(candidates[k - 1], candidates[k]);
+    if (size >= threshold && (group.size() == 1 || size >= prefix_size)) {
+      if (group.size() == 1)
+        prefix_size = size;
+      group.push_back(candidates[k]);
+      continue;
+    }
+    if (group.size() > 1) {
+      std::sort(group.begin(), group.end());
+      groups.emplace_back(group, prefix_size);
+    }
+    if (k < candidates.size())
+      group = {candidates[k]};
+  }
+  return groups;
+}
+
+
+//-------------------------------------------------------------------------
+// Duplicate experiment pooling
+//-------------------------------------------------------------------------
+
+bool Controller::pool_shots(const Circuit &circ,
+                            const ExecutionPlan &plan) const {
+  return false;
+}
+
+std::vector<std::vector<int>>
+Controller::pooled_circuit_groups(const std::vector<Circuit> &circuits,
+                                  const std::vector<ExecutionPlan> &plans) const {
+  std::vector<std::vector<int>> groups;
+  // Register data can only be split if it is returned with memory data
+  bool memory = false;
+  bool registers = false;
+  JSON::get_value(memory, "memory", config_);
+  JSON::get_value(registers, "register", config_);
+  if (registers && !memory)
+    return groups;
+
+  // Group circuits by a hash of their ops and sizes
+  std::unordered_map<size_t, std::vector<std::vector<int>>> hash_groups;
+  for (size_t i = 0; i < circuits.size(); ++i) {
+    const auto &circ = circuits[i];
+    if (circ.parameterized() || !plans[i].error.empty() ||
+        !pool_shots(circ, plans[i]))
+      continue;
+    size_t hash = std::hash<uint_t>()(circ.num_qubits);
+    auto combine = [&hash](size_t val) {
+      hash ^= val + 0x9e3779b9 + (hash << 6) + (hash >> 2);
+    };
+    combine(std::hash<uint_t>()(circ.num_memory));
+    combine(std::hash<uint_t>()(circ.num_registers));
+    for (const auto &op : circ.ops)
+      combine(op_hash(op));
+    // Add to a group of identical circuits, or start a new group
+    auto &candidates = hash_groups[hash];
+    bool added = false;
+    for (auto &group : candidates) {
+      const auto &other = circuits[group[0]];
+      if (other.num_qubits == circ.num_qubits &&
+          other.num_memory == circ.num_memory &&
+          other.num_registers == circ.num_registers &&
+          other.ops.size() == circ.ops.size() &&
+          std::equal(other.ops.begin(), other.ops.end(), circ.ops.begin(),
+                     op_equal)) {
+        group.push_back(i);
+        added = true;
+        break;
+      }
+    }
+    if (!added)
+      candidates.push_back({static_cast<int>(i)});
   }
+  for (auto &pair : hash_groups) {
+    for (auto &group : pair.second) {
+      if (group.size() > 1)
+        groups.push_back(std::move(group));
+    }
+  }
+  // Sort groups by their first circuit for a deterministic order
+  std::sort(groups.begin(), groups.end());
+  return groups;
+}
+
+std::vector<json_t>
+Controller::split_pooled_result(const json_t &result,
+                                const std::vector<uint_t> &shots,
+                                RngEngine &rng) const {
+  std::vector<json_t> split_results(shots.size(), result);
+  if (result["success"].get<bool>() == false)
+    return split_results;
+
+  const json_t &data = result["data"];
+  const bool has_counts = JSON::check_key("counts", data);
+  const bool has_memory = JSON::check_key("memory", data);
+  const bool has_register = JSON::check_key("register", data);
+
+  // Outcome of each sampled shot
+  std::vector<std::string> outcomes;
+  if (has_memory) {
+    outcomes = data["memory"].get<std::vector<std::string>>();
+  } else if (has_counts) {
+    for (auto it = data["counts"].cbegin(); it != data["counts"].cend(); ++it) {
+      const uint_t count = it.value();
+      outcomes.insert(outcomes.end(), count, it.key());
+    }
+  }
+  std::vector<std::string> registers;
+  if (has_register)
+    registers = data["register"].get<std::vector<std::string>>();
+
+  // Random permutation of the sampled shots
+  std::vector<size_t> perm(outcomes.size());
+  std::iota(perm.begin(), perm.end(), 0);
+  for (size_t k = perm.size(); k > 1; --k)
+    std::swap(perm[k - 1], perm[rng.rand_int(uint_t(0), uint_t(k - 1))]);
+
+  // Partition the shots between the results
+  size_t pos = 0;
+  for (size_t k = 0; k < shots.size(); ++k) {
+    json_t &split_data = split_results[k]["data"];
+    std::map<std::string, uint_t> counts;
+    std::vector<std::string> memory;
+    std::vector<std::string> split_registers;
+    for (uint_t shot = 0; shot < shots[k] && pos < perm.size(); ++shot, ++pos) {
+      const size_t idx = perm[pos];
+      counts[outcomes[idx]] += 1;
+      if (has_memory)
+        memory.push_back(outcomes[idx]);
+      if (has_register)
+        split_registers.push_back(registers[idx]);
+    }
+    if (has_counts)
+      split_data["counts"] = counts;
+    if (has_memory)
+      split_data["memory"] = memory;
+    if (has_register)
+      split_data["register"] = split_registers;
+  }
+  return split_results;
+}
+
+//-------------------------------------------------------------------------
+// Op comparison
+//-------------------------------------------------------------------------
+
+size_t Controller::op_hash(const Operations::Op &op) {
+  size_t seed = std::hash<std::string>()(op.name);
+  auto combine = [&seed](size_t val) {
+    seed ^= val + 0x9e3779b9 + (seed << 6) + (seed >> 2);
+  };
+  combine(static_cast<size_t>(op.type));
+  for (const auto &qubit : op.qubits)
+    combine(std::hash<uint_t>()(qubit));
+  for (const auto &param : op.params) {
+    combine(std::hash<double>()(param.real()));
+    combine(std::hash<double>()(param.imag()));
+  }
+  for (const auto &mat : op.mats) {
+    for (size_t k = 0; k < mat.size(); ++k) {
+      combine(std::hash<double>()(mat[k].real()));
+      combine(std::hash<double>()(mat[k].imag()));
+    }
+  }
+  for (const auto &bit : op.memory)
+    combine(std::hash<uint_t>()(bit));
+  for (const auto &bit : op.registers)
+    combine(std::hash<uint_t>()(bit));
+  return seed;
+}
+
+bool Controller::op_equal(const Operations::Op &lhs,
+                          const Operations::Op &rhs) {
+  auto mat_equal = [](const cmatrix_t &lmat, const cmatrix_t &rmat) {
+    if (lmat.GetRows() != rmat.GetRows() ||
+        lmat.GetColumns() != rmat.GetColumns())
+      return false;
+    for (size_t k = 0; k < lmat.size(); ++k) {
+      if (lmat[k] != rmat[k])
+        return false;
+    }
+    return true;
+  };
+  if (lhs.type != rhs.type || lhs.name != rhs.name ||
+      lhs.qubits != rhs.qubits || lhs.regs != rhs.regs ||
+      lhs.params != rhs.params || lhs.string_params != rhs.string_params ||
+      lhs.memory != rhs.memory || lhs.registers != rhs.registers ||
+      lhs.probs != rhs.probs ||
+      lhs.params_expval_pauli != rhs.params_expval_pauli)
+    return false;
+  // Conditionals
+  if (lhs.conditional != rhs.conditional ||
+      (lhs.conditional && (lhs.conditional_reg != rhs.conditional_reg ||
+                           lhs.bfunc != rhs.bfunc)))
+    return false;
+  if (lhs.old_conditional != rhs.old_conditional ||
+      (lhs.old_conditional &&
+       (lhs.old_conditional_mask != rhs.old_conditional_mask ||
+        lhs.old_conditional_val != rhs.old_conditional_val)))
+    return false;
+  // Matrices
+  if (lhs.mats.size() != rhs.mats.size() ||
+      lhs.params_expval_matrix.size() != rhs.params_expval_matrix.size())
+    return false;
+  for (size_t m = 0; m < lhs.mats.size(); ++m) {
+    if (!mat_equal(lhs.mats[m], rhs.mats[m]))
+      return false;
+  }
+  for (size_t m = 0; m < lhs.params_expval_matrix.size(); ++m) {
+    const auto &lcomp = lhs.params_expval_matrix[m];
+    const auto &rcomp = rhs.params_expval_matrix[m];
+    if (lcomp.first != rcomp.first || lcomp.second.size() != rcomp.second.size())
+      return false;
+    for (size_t n = 0; n < lcomp.second.size(); ++n) {
+      if (lcomp.second[n].first != rcomp.second[n].first ||
+          !mat_equal(lcomp.second[n].second, rcomp.second[n].second))
+        return false;
+    }
+  }
+  return true;
 }
 
 
@@ -446,8 +1297,10 @@ Circuit Controller::optimize_circuit(const Circuit &input_circ,
   allowed_opset.gates = state.allowed_gates();
   allowed_opset.snapshots = state.allowed_snapshots();
 
-  for (std::shared_ptr<CircuitOptimization> opt: optimizations_)
+  for (std::shared_ptr<CircuitOptimization> opt: optimizations_) {
+    Profiler::Timer timer(profiler(), "optimization", opt->name());
     opt->optimize_circuit(working_circ, allowed_opset, data);
+  }
 
   return working_circ;
 }
@@ -457,6 +1310,19 @@ Circuit Controller::optimize_circuit(const Circuit &input_circ,
 //-------------------------------------------------------------------------
 
 json_t Controller::execute(const json_t &qobj_js) {
+  std::vector<ArrayData> array_results;
+  json_t result = execute(qobj_js, array_results);
+  // Add any array data to the JSON result
+  for (size_t j = 0; j < array_results.size(); ++j) {
+    if (!array_results[j].empty())
+      array_results[j].add_to_json(result["results"][j]["data"]);
+  }
+  return result;
+}
+
+
+json_t Controller::execute(const json_t &qobj_js,
+                           std::vector<ArrayData> &array_results) {
 
   // Start QOBJ timer
   auto timer_start = myclock_t::now();
@@ -492,6 +1358,27 @@ json_t Controller::execute(const json_t &qobj_js) {
   // Qobj was loaded successfully, now we proceed
   try {
 
+    // Start profiling
+    profiler_ = nullptr;
+    if (profile_enable_ || !profile_trace_file_.empty())
+      profiler_ = std::make_shared<Profiler>(!profile_trace_file_.empty());
+
+    // Start memory accounting with the parsed qobj
+    memory_tracker_ = std::make_shared<MemoryTracker>();
+    memory_tracker_->allocate("qobj", JSON::memory_bytes(qobj_js));
+
+    // Bound the state memory in use and pooled for reuse by the memory limit
+    BufferPool::global().set_max_bytes(
+      (max_memory_mb_ > 0) ? static_cast<size_t>(max_memory_mb_) << 20
+                           : std::numeric_limits<size_t>::max());
+
+    // Start the execution timeout
+    if (execution_timeout_ > 0) {
+      if (!cancellation_)
+        cancellation_ = std::make_shared<Cancellation>();
+      cancellation_->set_timeout(execution_timeout_);
+    }
+
     // Set max_parallel_threads_
     if (max_parallel_threads_ < 1)
     #ifdef _OPENMP
@@ -500,8 +1387,15 @@ json_t Controller::execute(const json_t &qobj_js) {
       max_parallel_threads_ = 1;
     #endif
 
+    // Plan the execution of each circuit once
+    const int num_circuits = qobj.circuits.size();
+    std::vector<ExecutionPlan> plans;
+    plans.reserve(num_circuits);
+    for (const Circuit &circ : qobj.circuits)
+      plans.push_back(try_plan_circuit(circ));
+
     // set parallelization for experiments
-    set_parallelization(qobj.circuits);
+    set_parallelization(qobj.circuits, plans);
 
   #ifdef _OPENMP
     result["metadata"]["omp_enabled"] = true;
@@ -509,54 +1403,448 @@ json_t Controller::execute(const json_t &qobj_js) {
     result["metadata"]["omp_enabled"] = false;
   #endif
     result["metadata"]["parallel_experiments"] = parallel_experiments_;
+    result["metadata"]["max_parallel_threads"] = max_parallel_threads_;
     result["metadata"]["max_memory_mb"] = max_memory_mb_;
 
-    const int num_circuits = qobj.circuits.size();
-
   #ifdef _OPENMP
-    if (parallel_shots_ > 1 || parallel_state_update_ > 1)
+    // Parallel shots and State updates may be nested inside parallel
+    // experiments and parallel shots
+    if (max_parallel_threads_ > 1)
       omp_set_nested(1);
   #endif
 
+    // Expand parameterized circuits into one experiment for each row of
+    // their parameter bind table as pairs (circuit index, bind row)
+    std::vector<std::pair<int, uint_t>> experiments;
+    std::vector<int> circuit_experiment(num_circuits, -1);
+    for (int i = 0; i < num_circuits; ++i) {
+      const uint_t num_binds = qobj.circuits[i].num_experiments();
+      if (!qobj.circuits[i].parameterized())
+        circuit_experiment[i] = experiments.size();
+      for (uint_t row = 0; row < num_binds; ++row)
+        experiments.emplace_back(i, row);
+    }
+    const int num_experiments = experiments.size();
+
+    // Experiments that have been executed, or whose shots are pooled
+    // with an identical experiment
+    std::vector<bool> executed(num_experiments, false);
+
+    // Pool the shots of identical circuits into the first circuit of
+    // each group, storing the original shots of each circuit
+    std::vector<std::vector<int>> pooled_groups;
+    std::vector<std::vector<uint_t>> pooled_shots;
+    if (deduplication_enable_)
+      pooled_groups = pooled_circuit_groups(qobj.circuits, plans);
+    for (const auto &group : pooled_groups) {
+      std::vector<uint_t> shots;
+      for (const int i : group) {
+        shots.push_back(qobj.circuits[i].shots);
+        if (i != group[0]) {
+          qobj.circuits[group[0]].shots += qobj.circuits[i].shots;
+          executed[circuit_experiment[i]] = true;
+        }
+      }
+      pooled_shots.push_back(shots);
+    }
+
+    // Record the success of each completed experiment and pass its result
+    // to the experiment callback. Pooled experiments are completed once
+    // their results have been split.
+    std::vector<bool> pooled(num_experiments, false);
+    for (const auto &group : pooled_groups)
+      pooled[circuit_experiment[group[0]]] = true;
+    bool experiments_success = true;
+    bool experiments_cancelled = false;
+    auto complete_experiment = [&](int j) {
+      #pragma omp critical (complete_experiment)
+      {
+        json_t &experiment = result["results"][j];
+        if (experiment["success"].get<bool>() == false)
+          experiments_success = false;
+        if (experiment["status"] == "CANCELLED")
+          experiments_cancelled = true;
+        if (experiment_callback_) {
+          Profiler::Timer timer(profiler(), "serialization", "experiment_callback");
+          experiment_callback_(j, experiment, array_results[j]);
+        }
+      }
+    };
+
     // Initialize container to store parallel circuit output
-    result["results"] = std::vector<json_t>(num_circuits);
+    result["results"] = std::vector<json_t>(num_experiments);
+    array_results = std::vector<ArrayData>(num_experiments);
     if (parallel_experiments_ > 1) {
       // Parallel circuit execution
-      #pragma omp parallel for num_threads(parallel_experiments_)
-      for (int j = 0; j < num_circuits; ++j) {
-        result["results"][j] = execute_circuit(qobj.circuits[j]);
+      // Plan the threads and memory of each experiment
+      std::vector<int> exp_threads;
+      std::vector<size_t> exp_memory;
+      allocate_experiments(qobj.circuits, plans, experiments, executed,
+                           exp_threads, exp_memory);
+      // Execute the most costly experiments first. Invalid circuits have
+      // no cost and report their errors when they are executed.
+      std::vector<double> costs(num_experiments, 0.);
+      std::vector<int> order;
+      for (int j = 0; j < num_experiments; ++j) {
+        if (executed[j])
+          continue;
+        order.push_back(j);
+        const ExecutionPlan &plan = plans[experiments[j].first];
+        if (plan.error.empty())
+          costs[j] = plan.cost;
+      }
+      std::stable_sort(order.begin(), order.end(),
+                       [&](int a, int b) {return costs[a] > costs[b];});
+
+      // Each experiment thread executes the next experiment once enough of
+      // the thread and memory budget is free
+      std::mutex budget_mutex;
+      std::condition_variable budget_cv;
+      int free_threads = max_parallel_threads_;
+      size_t free_memory = max_memory_mb_;
+      std::atomic<size_t> next(0);
+      #pragma omp parallel num_threads(parallel_experiments_)
+      {
+        size_t pos;
+        while ((pos = next++) < order.size()) {
+          const int j = order[pos];
+          {
+            std::unique_lock<std::mutex> lock(budget_mutex);
+            budget_cv.wait(lock, [&]() {
+              return free_threads >= exp_threads[j] && free_memory >= exp_memory[j];
+            });
+            free_threads -= exp_threads[j];
+            free_memory -= exp_memory[j];
+          }
+          const int i = experiments[j].first;
+          result["results"][j] = execute_experiment(qobj.circuits[i], plans[i],
+                                                    experiments[j].second,
+                                                    exp_threads[j], exp_memory[j],
+                                                    array_results[j]);
+          {
+            std::lock_guard<std::mutex> lock(budget_mutex);
+            free_threads += exp_threads[j];
+            free_memory += exp_memory[j];
+          }
+          budget_cv.notify_all();
+          if (!pooled[j])
+            complete_experiment(j);
+        }
       }
     } else {
       // Serial circuit execution
-      for (int j = 0; j < num_circuits; ++j) {
-        result["results"][j] = execute_circuit(qobj.circuits[j]);
+      if (shared_prefix_enable_) {
+        // Execute groups of circuits sharing a prefix from the prefix state
+        std::vector<bool> excluded(num_circuits, false);
+        for (int i = 0; i < num_circuits; ++i)
+          excluded[i] = circuit_experiment[i] >= 0 && executed[circuit_experiment[i]];
+        for (const auto &group : shared_prefix_groups(qobj.circuits, plans, excluded)) {
+          const auto &circ_indexes = group.first;
+          const size_t prefix_size = group.second;
+          bool prefix_set = false;
+          try {
+            const int i = circ_indexes[0];
+            prefix_set = plans[i].error.empty() &&
+                         set_shared_prefix(qobj.circuits[i], plans[i],
+                                           prefix_size);
+          } catch (std::exception &) {
+            // Circuits will be executed normally and report any errors
+            prefix_set = false;
+          }
+          if (prefix_set) {
+            for (const int i : circ_indexes) {
+              const int j = circuit_experiment[i];
+              result["results"][j] = execute_circuit_suffix(qobj.circuits[i],
+                                                            prefix_size,
+                                                            array_results[j]);
+              executed[j] = true;
+              if (!pooled[j])
+                complete_experiment(j);
+            }
+          }
+          clear_shared_prefix();
+        }
+      }
+      for (int j = 0; j < num_experiments; ++j) {
+        if (executed[j])
+          continue;
+        const int i = experiments[j].first;
+        result["results"][j] = execute_experiment(qobj.circuits[i], plans[i],
+                                                  experiments[j].second,
+                                                  max_parallel_threads_,
+                                                  max_memory_mb_,
+                                                  array_results[j]);
+        if (!pooled[j])
+          complete_experiment(j);
       }
     }
 
-    // check success
-    for (const auto& experiment: result["results"]) {
-      if (experiment["success"].get<bool>() == false) {
-        result["success"] = false;
-        break;
+    // Split the results of pooled circuits between the identical circuits
+    for (size_t g = 0; g < pooled_groups.size(); ++g) {
+      const auto &group = pooled_groups[g];
+      // The shots are partitioned with the rng stream after the streams
+      // used for simulating the pooled shots
+      RngEngine rng;
+      rng.set_seed(qobj.circuits[group[0]].seed);
+      rng.set_stream(qobj.circuits[group[0]].shots);
+      auto split_results = split_pooled_result(
+        result["results"][circuit_experiment[group[0]]], pooled_shots[g], rng);
+      for (size_t k = 0; k < group.size(); ++k) {
+        const Circuit &circ = qobj.circuits[group[k]];
+        json_t &split = split_results[k];
+        split["header"] = circ.header;
+        split["shots"] = pooled_shots[g][k];
+        split["seed"] = circ.seed;
+        if (split["success"].get<bool>())
+          split["metadata"]["pooled_shots"] = qobj.circuits[group[0]].shots;
+        result["results"][circuit_experiment[group[k]]] = std::move(split);
       }
+      for (const int i : group)
+        complete_experiment(circuit_experiment[i]);
     }
-    // Set status to completed
-    result["status"] = std::string("COMPLETED");
+
+    // check success
+    if (!experiments_success)
+      result["success"] = false;
+    // Set status to completed, or cancelled if any experiment was cancelled
+    result["status"] = std::string(experiments_cancelled ? "CANCELLED"
+                                                         : "COMPLETED");
 
     // Stop the timer and add total timing data
     auto timer_stop = myclock_t::now();
     result["metadata"]["time_taken"] = std::chrono::duration<double>(timer_stop - timer_start).count();
+    result["metadata"].update(memory_tracker_->json());
+    add_profile(result);
   }
   // If execution failed return valid output reporting error
   catch (std::exception &e) {
     result["success"] = false;
     result["status"] = std::string("ERROR: ") + e.what();
   }
+  // State memory is pooled for reuse between the experiments of a qobj.
+  // Free it so that it is not held between qobjs.
+  BufferPool::global().clear();
+  return result;
+}
+
+
+json_t Controller::execute_circuit_suffix(const Circuit &circ,
+                                          size_t prefix_size,
+                                          ArrayData &array_data) {
+  Circuit suffix_circ(circ);
+  suffix_circ.ops.erase(suffix_circ.ops.begin(),
+                        suffix_circ.ops.begin() + prefix_size);
+  const ExecutionPlan plan = try_plan_circuit(suffix_circ);
+  json_t result = execute_circuit(suffix_circ, plan, max_parallel_threads_,
+                                  max_memory_mb_, array_data);
+  result["metadata"]["shared_prefix_size"] = prefix_size;
+  return result;
+}
+
+
+json_t Controller::execute_experiment(Circuit &circ, const ExecutionPlan &plan,
+                                      uint_t bind_row, int threads,
+                                      size_t memory_mb, ArrayData &array_data) {
+  if (!circ.parameterized())
+    return execute_circuit(circ, plan, threads, memory_mb, array_data);
+  // Binding parameters does not change the ops of a circuit, so the
+  // circuit's plan is used for each bind
+  Circuit bound_circ = circ.bind_parameters(bind_row);
+  json_t result = execute_circuit(bound_circ, plan, threads, memory_mb,
+                                  array_data);
+  result["metadata"]["parameter_bind"] = bind_row;
+  return result;
+}
+
+
+Controller::ExecutionPlan Controller::plan_circuit(const Circuit &circ) const {
+  ExecutionPlan plan;
+  plan.noise = !noise_model_->ideal();
+  plan.memory_mb = required_memory_mb(circ);
+  plan.cost = circuit_cost(circ, plan);
+  return plan;
+}
+
+
+Controller::ExecutionPlan Controller::try_plan_circuit(const Circuit &circ) const {
+  try {
+    return plan_circuit(circ);
+  } catch (std::exception &e) {
+    ExecutionPlan plan;
+    plan.error = e.what();
+    return plan;
+  }
+}
+
+
+void Controller::allocate_experiments(const std::vector<Circuit> &circuits,
+                                      const std::vector<ExecutionPlan> &plans,
+                                      const std::vector<std::pair<int, uint_t>> &experiments,
+                                      const std::vector<bool> &skipped,
+                                      std::vector<int> &exp_threads,
+                                      std::vector<size_t> &exp_memory) const {
+  const size_t num_experiments = experiments.size();
+  double total_cost = 0.;
+  for (size_t j = 0; j < num_experiments; ++j) {
+    const ExecutionPlan &plan = plans[experiments[j].first];
+    if (!skipped[j] && plan.error.empty())
+      total_cost += plan.cost;
+  }
+  exp_threads.assign(num_experiments, 1);
+  exp_memory.assign(num_experiments, 0);
+  for (size_t j = 0; j < num_experiments; ++j) {
+    const ExecutionPlan &plan = plans[experiments[j].first];
+    if (skipped[j] || !plan.error.empty())
+      continue;
+    if (total_cost > 0)
+      exp_threads[j] = std::max(1, static_cast<int>(max_parallel_threads_ * plan.cost / total_cost));
+    const uint_t shots = circuits[experiments[j].first].shots;
+    exp_memory[j] = std::min<size_t>(max_memory_mb_,
+      plan.memory_mb * std::max<uint_t>(1, std::min<uint_t>(shots, exp_threads[j])));
+  }
+}
+
+
+json_t Controller::estimate(const json_t &qobj_js) {
+  json_t result;
+  result["qobj_id"] = nullptr;
+  result["success"] = true;
+  result["status"] = nullptr;
+
+  Qobj qobj;
+  try {
+    qobj.load_qobj_from_json(qobj_js);
+  }
+  catch (std::exception &e) {
+    result["success"] = false;
+    result["status"] = std::string("ERROR: Failed to load qobj: ") + e.what();
+    return result;
+  }
+  result["qobj_id"] = qobj.id;
+  if (!qobj.header.empty())
+      result["header"] = qobj.header;
+
+  try {
+    if (max_parallel_threads_ < 1)
+    #ifdef _OPENMP
+      max_parallel_threads_ = std::max(1, omp_get_max_threads());
+    #else
+      max_parallel_threads_ = 1;
+    #endif
+
+    // Plan the circuits and experiments as for execution
+    const int num_circuits = qobj.circuits.size();
+    std::vector<ExecutionPlan> plans;
+    plans.reserve(num_circuits);
+    for (const Circuit &circ : qobj.circuits)
+      plans.push_back(try_plan_circuit(circ));
+    set_parallelization(qobj.circuits, plans);
+
+    std::vector<std::pair<int, uint_t>> experiments;
+    for (int i = 0; i < num_circuits; ++i) {
+      for (uint_t row = 0; row < qobj.circuits[i].num_experiments(); ++row)
+        experiments.emplace_back(i, row);
+    }
+    const size_t num_experiments = experiments.size();
+    std::vector<int> exp_threads(num_experiments, max_parallel_threads_);
+    std::vector<size_t> exp_memory(num_experiments, max_memory_mb_);
+    if (parallel_experiments_ > 1)
+      allocate_experiments(qobj.circuits, plans, experiments,
+                           std::vector<bool>(num_experiments, false),
+                           exp_threads, exp_memory);
+
+    // Estimate each experiment
+    result["results"] = std::vector<json_t>(num_experiments);
+    bool success = true;
+    double total_time = 0.;
+    double thread_time = 0.;
+    double max_time = 0.;
+    std::vector<size_t> peak_memory;
+    for (size_t j = 0; j < num_experiments; ++j) {
+      const Circuit &circ = qobj.circuits[experiments[j].first];
+      ExecutionPlan plan = plans[experiments[j].first];
+      json_t &exp_result = result["results"][j];
+      exp_result["header"] = circ.header;
+      exp_result["shots"] = circ.shots;
+      if (!plan.error.empty()) {
+        exp_result["success"] = false;
+        exp_result["status"] = std::string("ERROR: ") + plan.error;
+        // Report the memory required by circuits that do not fit in the
+        // available memory
+        try {
+          exp_result["memory_mb"] = required_memory_mb(circ);
+        } catch (std::exception &) {}
+        success = false;
+        continue;
+      }
+      plan.threads = allocate_threads(circ, plan, exp_threads[j], exp_memory[j]);
+      const std::string method = method_name(plan);
+      const auto it = seconds_per_cost_.find(method);
+      const double seconds_per_cost = (it != seconds_per_cost_.end())
+        ? it->second : default_seconds_per_cost(method);
+      // Assume perfect scaling with the threads of the experiment
+      const double time = plan.cost * seconds_per_cost /
+                          (plan.threads.shots * plan.threads.state_update);
+      const size_t memory_mb = plan.memory_mb * plan.threads.shots;
+      exp_result["success"] = true;
+      exp_result["status"] = std::string("DONE");
+      exp_result["method"] = method;
+      exp_result["noise"] = plan.noise;
+      exp_result["measure_sampling"] = plan.sampled();
+      exp_result["error_free_probability"] = plan.error_free_probability;
+      exp_result["memory_mb"] = plan.memory_mb;
+      exp_result["peak_memory_mb"] = memory_mb;
+      exp_result["parallel_threads"] = plan.threads.threads;
+      exp_result["parallel_shots"] = plan.threads.shots;
+      exp_result["parallel_state_update"] = plan.threads.state_update;
+      exp_result["cost"] = plan.cost;
+      exp_result["time_estimate"] = time;
+      total_time += time;
+      thread_time += time * plan.threads.threads;
+      max_time = std::max(max_time, time);
+      peak_memory.push_back(memory_mb);
+    }
+
+    // Parallel experiments share the threads, and the most memory is
+    // needed when the largest experiments are executed together
+    std::sort(peak_memory.rbegin(), peak_memory.rend());
+    size_t qobj_memory = 0;
+    for (size_t j = 0; j < std::min<size_t>(parallel_experiments_, peak_memory.size()); ++j)
+      qobj_memory += peak_memory[j];
+    if (parallel_experiments_ > 1) {
+      qobj_memory = std::min<size_t>(qobj_memory, max_memory_mb_);
+      total_time = std::max(max_time, thread_time / max_parallel_threads_);
+    }
+    result["metadata"]["parallel_experiments"] = parallel_experiments_;
+    result["metadata"]["max_parallel_threads"] = max_parallel_threads_;
+    result["metadata"]["max_memory_mb"] = max_memory_mb_;
+    result["metadata"]["peak_memory_mb"] = qobj_memory;
+    result["metadata"]["time_estimate"] = total_time;
+    result["success"] = success;
+    result["status"] = std::string("COMPLETED");
+  }
+  catch (std::exception &e) {
+    result["success"] = false;
+    result["status"] = std::string("ERROR: ") + e.what();
+  }
   return result;
 }
 
 
-json_t Controller::execute_circuit(Circuit &circ) {
+double Controller::default_seconds_per_cost(const std::string &method) {
+  // Approximate single thread times for a recent x86-64 CPU. These are
+  // calibrated for a machine by aer-autotune.
+  if (method == "stabilizer")
+    return 1e-7;
+  if (method == "extended_stabilizer")
+    return 1e-9;
+  return 4e-9;
+}
+
+
+json_t Controller::execute_circuit(Circuit &circ, ExecutionPlan plan,
+                                   int threads, size_t memory_mb,
+                                   ArrayData &array_data) {
 
   // Start individual circuit timer
   auto timer_start = myclock_t::now(); // state circuit timer
@@ -567,47 +1855,75 @@ json_t Controller::execute_circuit(Circuit &circ) {
   // Execute in try block so we can catch errors and return the error message
   // for individual circuit failures.
   try {
-    // set parallelization for this circuit
-    if (parallel_experiments_ == 1)
-      set_parallelization(circ);
+    // Don't start the circuit if execution has been cancelled
+    check_cancelled();
+    // Report the error of a circuit that could not be planned
+    if (!plan.error.empty())
+      throw std::runtime_error(plan.error);
+    // Allocate the threads of this circuit
+    plan.threads = allocate_threads(circ, plan, threads, memory_mb);
+    const ThreadAllocation &alloc = plan.threads;
+    // Track the memory of the States and output data of this circuit
+    MemoryTracker memory(memory_tracker());
+    plan.memory_tracker = &memory;
     // Single shot thread execution
-    if (parallel_shots_ <= 1) {
-      result["data"] = run_circuit(circ, circ.shots, circ.seed);
+    if (alloc.shots <= 1) {
+      OutputData data = run_circuit(circ, plan, circ.shots, 0);
+      MemoryTracker::Allocation data_memory;
+      data_memory.set_tracker(&memory, "output_data");
+      data_memory.resize(data.memory_bytes());
+      array_data = std::move(data.array_data());
+      Profiler::Timer timer(profiler(), "serialization", "output_data");
+      result["data"] = data;
     // Parallel shot thread execution
     } else {
-      // Calculate shots per thread
-      std::vector<unsigned int> subshots;
-      for (int j = 0; j < parallel_shots_; ++j) {
-        subshots.push_back(circ.shots / parallel_shots_);
-      }
-      // If shots is not perfectly divisible by threads, assign the remaineder
-      for (int j=0; j < int(circ.shots % parallel_shots_); ++j) {
-        subshots[j] += 1;
-      }
-
-      // Vector to store parallel thread output data
-      std::vector<OutputData> data(parallel_shots_);
-      std::vector<std::string> error_msgs(parallel_shots_);
-      for (int i = 0; i < parallel_shots_; ++i)
-      #pragma omp parallel for if (parallel_shots_ > 1) num_threads(parallel_shots_)
-      for (int j = 0; j < parallel_shots_; j++) {
+      // Shots are executed in batches that are handed out to threads
+      // dynamically as they finish their previous batch. Each shot uses
+      // the rng stream of its index, and the output data of the batches is
+      // combined in batch order so that single shot data is in shot order.
+      const uint_t batch_size = shot_batch_size(circ, plan);
+      const int_t num_batches = (circ.shots + batch_size - 1) / batch_size;
+      std::vector<OutputData> data(num_batches);
+      std::vector<MemoryTracker::Allocation> data_memory(alloc.shots);
+      for (auto &allocation : data_memory)
+        allocation.set_tracker(&memory, "output_data");
+      std::vector<std::string> error_msgs(alloc.shots);
+      std::atomic<bool> failed(false);
+      #pragma omp parallel for schedule(dynamic, 1) num_threads(alloc.shots)
+      for (int_t b = 0; b < num_batches; b++) {
+        // Skip the remaining batches once a batch has failed
+        if (failed)
+          continue;
+        int thread = 0;
+        #ifdef _OPENMP
+        thread = omp_get_thread_num();
+        #endif
+        const uint_t shots = std::min<uint_t>(batch_size,
+                                              circ.shots - b * batch_size);
         try {
-          data[j] = run_circuit(circ, subshots[j], circ.seed + j);
-        } catch (std::runtime_error error) {
-          error_msgs[j] = error.what();
+          data[b] = run_circuit(circ, plan, shots, b * batch_size);
+          data_memory[thread].resize(data_memory[thread].size() +
+                                     data[b].memory_bytes());
+        } catch (std::exception &error) {
+          error_msgs[thread] = error.what();
+          failed = true;
         }
       }
 
+      // Errors in shot threads may have been caused by cancellation
+      check_cancelled();
       for (std::string error_msg: error_msgs)
         if (error_msg != "")
           throw std::runtime_error(error_msg);
 
-      // Accumulate results across shots
-      for (uint_t j=1; j<data.size(); j++) {
-        data[0].combine(data[j]);
-      }
+      // Accumulate results across batches
+      for (int_t b = 1; b < num_batches; b++)
+        data[0].combine(data[b]);
       // Update output
+      array_data = std::move(data[0].array_data());
+      Profiler::Timer timer(profiler(), "serialization", "output_data");
       result["data"] = data[0];
+      result["metadata"]["shot_batches"] = num_batches;
     }
     // Report success
     result["success"] = true;
@@ -627,13 +1943,25 @@ json_t Controller::execute_circuit(Circuit &circ) {
       // Remove the metatdata field from data
       result["data"].erase("metadata");
     }
-    result["metadata"]["parallel_shots"] = parallel_shots_;
-    result["metadata"]["parallel_state_update"] = parallel_state_update_;
+    result["metadata"]["parallel_threads"] = alloc.threads;
+    result["metadata"]["parallel_shots"] = alloc.shots;
+    result["metadata"]["parallel_state_update"] = alloc.state_update;
+    result["metadata"].update(memory.json());
     // Add timer data
     auto timer_stop = myclock_t::now(); // stop timer
     double time_taken = std::chrono::duration<double>(timer_stop - timer_start).count();
     result["time_taken"] = time_taken;
   }
+  // If execution was cancelled return the circuit without data
+  catch (CancelledError &e) {
+    result = json_t();
+    result["success"] = false;
+    result["status"] = std::string("CANCELLED");
+    result["header"] = circ.header;
+    result["shots"] = circ.shots;
+    result["seed"] = circ.seed;
+    result["data"] = json_t::object();
+  }
   // If an exception occurs during execution, catch it and pass it to the output
   catch (std::exception &e) {
     result["success"] = false;
@@ -0,0 +1,431 @@
+/**
+ * Copyright 2018, IBM.
+ *
+ * This source code is licensed under the Apache License, Version 2.0 found in
+ * the LICENSE.txt file in the root directory of this source tree.
+ */
+
+#ifndef _aer_base_python_controller_hpp_
+#define _aer_base_python_controller_hpp_
+
+#include <Python.h>
+
+#include <memory>
+#include <string>
+
+#define NPY_NO_DEPRECATED_API NPY_1_7_API_VERSION
+#include <numpy/arrayobject.h>
+
+#include "base/controller.hpp"
+#include "framework/python_json.hpp"
+
+namespace AER {
+
+//=========================================================================
+// Python Controller Execute interface
+//=========================================================================
+
+// This is used by the Cython wrappers of the Controller classes. It
+// converts the input qobj dictionary directly to JSON and returns the
+// result as a Python dictionary, without serializing either to a string.
+// Complex array data stored with the "return_numpy" config option is
+// returned as NumPy arrays that take ownership of the simulator buffers.
+//
+// The Python GIL must be held when calling this function. It is held while
+// converting the qobj and result and while configuring the controller, and
+// released while the qobj is executed, so that several simulations may run
+// concurrently from different Python threads.
+//
+// If callback is not None it is called as callback(index, result) with the
+// index and result dictionary of each experiment as soon as the experiment
+// has completed. These results are converted while the experiments that
+// follow are executed, and are set to None in the returned result.
+//
+// If cancellation is not None it must be a cancellation capsule returned by
+// `Python::new_cancellation`, which may be used to cancel execution from
+// another Python thread with `Python::set_cancelled`.
+template <class controller_t>
+PyObject *controller_execute_python(PyObject *qobj, PyObject *callback,
+                                    PyObject *cancellation);
+
+// Return the resource estimate of a qobj dictionary without executing it,
+// as returned by `Controller::estimate`. The GIL is released while the qobj
+// is estimated.
+template <class controller_t>
+PyObject *controller_estimate_python(PyObject *qobj);
+
+// Set the config of a controller session from a Python dictionary. The GIL
+// is released while the noise model is loaded.
+template <class controller_t>
+void session_set_config_python(ControllerSession<controller_t> &session,
+                               PyObject *config);
+
+// Execute a qobj dictionary on a controller session. The GIL is released
+// while the qobj is configured and executed. The callback and cancellation
+// are used as for controller_execute_python.
+template <class controller_t>
+PyObject *session_execute_python(const ControllerSession<controller_t> &session,
+                                 PyObject *qobj, PyObject *callback,
+                                 PyObject *cancellation);
+
+namespace Python {
+
+// Release the Python GIL for the lifetime of this object. The GIL is
+// re-acquired when it goes out of scope, including during exception
+// unwinding.
+class GILRelease {
+public:
+  GILRelease() : state_(PyEval_SaveThread()) {}
+  ~GILRelease() {PyEval_RestoreThread(state_);}
+  GILRelease(const GILRelease &obj) = delete;
+  GILRelease &operator=(const GILRelease &obj) = delete;
+
+private:
+  PyThreadState *state_;
+};
+
+// Experiment callback that converts each experiment result to a Python
+// dictionary and passes it to a Python callable. The GIL is acquired for
+// each call. If the callable raises an exception no further results are
+// passed to it, and the error is thrown by `check_error`.
+class ExperimentCallback {
+public:
+  explicit ExperimentCallback(PyObject *callback);
+
+  void operator()(size_t index, json_t &result, ArrayData &array_data);
+
+  // Throw an exception if the callable raised an exception. This must be
+  // called with the GIL held.
+  void check_error() const;
+
+  // Return true if there is no callable
+  bool empty() const {return callback_ == nullptr;}
+
+private:
+  PyObject *callback_; // borrowed reference
+  std::shared_ptr<std::string> error_;
+};
+
+// Return a new cancellation flag wrapped in a Python capsule. Capsules may
+// be passed between the controller wrapper modules.
+PyObject *new_cancellation();
+
+// Return the cancellation flag of a cancellation capsule, or null if the
+// object is None
+std::shared_ptr<Cancellation> get_cancellation(PyObject *capsule);
+
+// Cancel execution using a cancellation capsule
+void set_cancelled(PyObject *capsule);
+
+// Return true if a cancellation capsule has been cancelled
+bool is_cancelled(PyObject *capsule);
+
+// Convert a complex array to a NumPy complex128 array. The NumPy array
+// takes ownership of the array buffer and no data is copied.
+PyObject *to_numpy(ComplexArray &&arr);
+
+// Add complex array data to the data dictionary of an experiment result
+void add_array_data(PyObject *data, ArrayData &arrays);
+
+// Convert a controller JSON result and its array data to a Python dict
+PyObject *result_to_python(const json_t &result,
+                           std::vector<ArrayData> &array_results);
+
+// Replace the profile in the metadata of a Python result dict with the
+// current profile of a profiler, which includes the time taken to convert
+// the result to Python. The trace file is not updated.
+void update_profile(PyObject *result, const Profiler &profiler);
+
+} // end namespace Python
+
+/*******************************************************************************
+ *
+ * Implementations
+ *
+ ******************************************************************************/
+
+template <class controller_t>
+PyObject *controller_execute_python(PyObject *qobj, PyObject *callback,
+                                    PyObject *cancellation) {
+  // Convert the qobj while holding the GIL
+  json_t qobj_js = JSON::from_python(qobj);
+
+  controller_t controller;
+  Python::ExperimentCallback experiment_callback(callback);
+  if (!experiment_callback.empty())
+    controller.set_experiment_callback(experiment_callback);
+  controller.set_cancellation(Python::get_cancellation(cancellation));
+  std::vector<ArrayData> array_results;
+  json_t result;
+  {
+    // Configure and execute without holding the GIL
+    Python::GILRelease nogil;
+    if (JSON::check_key("config", qobj_js)) {
+      controller.set_config(qobj_js["config"]);
+    }
+    result = controller.execute(qobj_js, array_results);
+  }
+  experiment_callback.check_error();
+  Profiler *profiler = controller.profiler();
+  if (profiler == nullptr)
+    return Python::result_to_python(result, array_results);
+  const auto start = Profiler::clock_t::now();
+  PyObject *ret = Python::result_to_python(result, array_results);
+  profiler->record("serialization", "to_python", start, Profiler::clock_t::now());
+  Python::update_profile(ret, *profiler);
+  return ret;
+}
+
+template <class controller_t>
+PyObject *controller_estimate_python(PyObject *qobj) {
+  json_t qobj_js = JSON::from_python(qobj);
+  controller_t controller;
+  json_t result;
+  {
+    Python::GILRelease nogil;
+    if (JSON::check_key("config", qobj_js)) {
+      controller.set_config(qobj_js["config"]);
+    }
+    result = controller.estimate(qobj_js);
+  }
+  return JSON::to_python(result);
+}
+
+template <class controller_t>
+void session_set_config_python(ControllerSession<controller_t> &session,
+                               PyObject *config) {
+  json_t config_js = JSON::from_python(config);
+  Python::GILRelease nogil;
+  session.set_config(config_js);
+}
+
+template <class controller_t>
+PyObject *session_execute_python(const ControllerSession<controller_t> &session,
+                                 PyObject *qobj, PyObject *callback,
+                                 PyObject *cancellation) {
+  json_t qobj_js = JSON::from_python(qobj);
+  Python::ExperimentCallback experiment_callback(callback);
+  typename controller_t::ExperimentCallback callback_fn = nullptr;
+  if (!experiment_callback.empty())
+    callback_fn = experiment_callback;
+  auto cancellation_flag = Python::get_cancellation(cancellation);
+  std::vector<ArrayData> array_results;
+  json_t result;
+  {
+    // Configure and execute without holding the GIL
+    Python::GILRelease nogil;
+    result = session.execute(std::move(qobj_js), array_results,
+                             std::move(callback_fn),
+                             std::move(cancellation_flag));
+  }
+  experiment_callback.check_error();
+  return Python::result_to_python(result, array_results);
+}
+
+namespace Python {
+
+// Name of cancellation capsules
+constexpr char cancellation_capsule_name[] = "AER::Cancellation";
+
+// Destructor for the capsule that owns a cancellation flag
+inline void free_cancellation_capsule(PyObject *capsule) {
+  delete static_cast<std::shared_ptr<Cancellation>*>(
+    PyCapsule_GetPointer(capsule, cancellation_capsule_name));
+}
+
+PyObject *new_cancellation() {
+  auto ptr = new std::shared_ptr<Cancellation>(std::make_shared<Cancellation>());
+  PyObject *capsule = PyCapsule_New(ptr, cancellation_capsule_name,
+                                    free_cancellation_capsule);
+  if (capsule == nullptr) {
+    delete ptr;
+    JSON::Python::throw_error("failed to create cancellation", "Python");
+  }
+  return capsule;
+}
+
+std::shared_ptr<Cancellation> get_cancellation(PyObject *capsule) {
+  if (capsule == nullptr || capsule == Py_None)
+    return nullptr;
+  auto ptr = static_cast<std::shared_ptr<Cancellation>*>(
+    PyCapsule_GetPointer(capsule, cancellation_capsule_name));
+  if (ptr == nullptr)
+    JSON::Python::throw_error("invalid cancellation object", "Python");
+  return *ptr;
+}
+
+void set_cancelled(PyObject *capsule) {
+  auto cancellation = get_cancellation(capsule);
+  if (cancellation)
+    cancellation->cancel();
+}
+
+bool is_cancelled(PyObject *capsule) {
+  auto cancellation = get_cancellation(capsule);
+  return cancellation && cancellation->cancelled();
+}
+
+// Destructor for the capsule that owns a NumPy array buffer
+inline void free_capsule_buffer(PyObject *capsule) {
+  free(PyCapsule_GetPointer(capsule, nullptr));
+}
+
+// Import the NumPy C-API for the current extension module
+inline void import_numpy() {
+  if (PyArray_API == nullptr && _import_array() < 0)
+    JSON::Python::throw_error("failed to import NumPy", "Python");
+}
+
+PyObject *to_numpy(ComplexArray &&arr) {
+  import_numpy();
+  const auto &shape = arr.shape();
+  std::vector<npy_intp> dims(shape.begin(), shape.end());
+  const int flags = arr.fortran_order() ? NPY_ARRAY_FARRAY : NPY_ARRAY_CARRAY;
+  PyObject *ret = PyArray_New(&PyArray_Type, static_cast<int>(dims.size()),
+                              dims.data(), NPY_COMPLEX128, nullptr,
+                              arr.data(), 0, flags, nullptr);
+  if (ret == nullptr)
+    JSON::Python::throw_error("failed to create NumPy array", "Python");
+  // Transfer ownership of the buffer to a capsule owned by the array
+  PyObject *capsule = PyCapsule_New(arr.data(), nullptr, free_capsule_buffer);
+  if (capsule == nullptr) {
+    Py_DECREF(ret);
+    JSON::Python::throw_error("failed to create NumPy array", "Python");
+  }
+  arr.release();
+  if (PyArray_SetBaseObject(reinterpret_cast<PyArrayObject*>(ret),
+                            capsule) != 0) { // steals capsule reference
+    Py_DECREF(ret);
+    JSON::Python::throw_error("failed to create NumPy array", "Python");
+  }
+  return ret;
+}
+
+// Return a borrowed reference to the dict at key, inserting a new one if
+// it doesn't exist
+inline PyObject *get_or_insert_dict(PyObject *dict, const std::string &key) {
+  PyObject *item = PyDict_GetItemString(dict, key.c_str());
+  if (item != nullptr)
+    return item;
+  item = PyDict_New();
+  if (item == nullptr || PyDict_SetItemString(dict, key.c_str(), item) != 0) {
+    Py_XDECREF(item);
+    JSON::Python::throw_error("failed to set dictionary item", "Python");
+  }
+  Py_DECREF(item);
+  return item;
+}
+
+// Set a dict item, stealing the reference to the value
+inline void set_item(PyObject *dict, const std::string &key, PyObject *value) {
+  int status = PyDict_SetItemString(dict, key.c_str(), value);
+  Py_DECREF(value);
+  if (status != 0)
+    JSON::Python::throw_error("failed to set dictionary item", "Python");
+}
+
+void add_array_data(PyObject *data, ArrayData &arrays) {
+  for (auto &pair : arrays.additional_data()) {
+    set_item(data, pair.first, to_numpy(std::move(pair.second)));
+  }
+  for (auto &type : arrays.singleshot_snapshots()) {
+    PyObject *snapshots = get_or_insert_dict(data, "snapshots");
+    PyObject *snapshot_type = get_or_insert_dict(snapshots, type.first);
+    for (auto &label : type.second) {
+      PyObject *shots = PyList_New(label.second.size());
+      if (shots == nullptr)
+        JSON::Python::throw_error("failed to create list", "Python");
+      Py_ssize_t pos = 0;
+      for (auto &datum : label.second) {
+        PyObject *item;
+        try {
+          item = to_numpy(std::move(datum));
+        } catch (...) {
+          Py_DECREF(shots);
+          throw;
+        }
+        PyList_SET_ITEM(shots, pos++, item); // steals reference
+      }
+      set_item(snapshot_type, label.first, shots);
+    }
+  }
+  arrays.clear();
+}
+
+ExperimentCallback::ExperimentCallback(PyObject *callback)
+  : callback_((callback == nullptr || callback == Py_None) ? nullptr : callback),
+    error_(std::make_shared<std::string>()) {}
+
+void ExperimentCallback::operator()(size_t index, json_t &result,
+                                    ArrayData &array_data) {
+  // Acquire the GIL since this is called from the executing thread
+  PyGILState_STATE gil_state = PyGILState_Ensure();
+  if (error_->empty()) {
+    PyObject *ret = nullptr;
+    try {
+      PyObject *res = JSON::to_python(result);
+      if (!array_data.empty()) {
+        try {
+          add_array_data(get_or_insert_dict(res, "data"), array_data);
+        } catch (...) {
+          Py_DECREF(res);
+          throw;
+        }
+      }
+      ret = PyObject_CallFunction(callback_, "nN", static_cast<Py_ssize_t>(index), res);
+      if (ret == nullptr)
+        JSON::Python::throw_error("experiment callback failed", "Python");
+      Py_DECREF(ret);
+      // The callback owns the result now
+      result = json_t();
+      array_data.clear();
+    } catch (std::exception &e) {
+      *error_ = e.what();
+    }
+  }
+  PyGILState_Release(gil_state);
+}
+
+void ExperimentCallback::check_error() const {
+  if (!error_->empty())
+    throw std::runtime_error(*error_);
+}
+
+PyObject *result_to_python(const json_t &result,
+                           std::vector<ArrayData> &array_results) {
+  PyObject *ret = JSON::to_python(result);
+  try {
+    PyObject *results = PyDict_GetItemString(ret, "results");
+    for (size_t j = 0; j < array_results.size(); ++j) {
+      if (array_results[j].empty() || results == nullptr ||
+          !PyList_Check(results) ||
+          static_cast<size_t>(PyList_GET_SIZE(results)) <= j)
+        continue;
+      PyObject *data = get_or_insert_dict(PyList_GET_ITEM(results, j), "data");
+      add_array_data(data, array_results[j]);
+    }
+  } catch (...) {
+    Py_DECREF(ret);
+    throw;
+  }
+  return ret;
+}
+
+void update_profile(PyObject *result, const Profiler &profiler) {
+  PyObject *metadata = PyDict_GetItemString(result, "metadata");
+  if (metadata == nullptr || !PyDict_Check(metadata))
+    return;
+  PyObject *profile = PyDict_GetItemString(metadata, "profile");
+  if (profile == nullptr || !PyDict_Check(profile))
+    return;
+  json_t summary = profiler.summary();
+  for (auto it = summary.begin(); it != summary.end(); ++it)
+    set_item(profile, it.key(), JSON::to_python(it.value()));
+}
+
+} // end namespace Python
+
+//-------------------------------------------------------------------------
+} // end namespace AER
+//-------------------------------------------------------------------------
+#endif
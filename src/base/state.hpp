@@ -8,8 +8,11 @@
 #ifndef _aer_base_state_hpp_
 #define _aer_base_state_hpp_
 
+#include "framework/cancellation.hpp"
 #include "framework/json.hpp"
+#include "framework/memory_tracker.hpp"
 #include "framework/operations.hpp"
+#include "framework/profiler.hpp"
 #include "framework/types.hpp"
 #include "framework/data.hpp"
 #include "framework/creg.hpp"
@@ -112,6 +115,12 @@ public:
                                             uint_t shots,
                                             RngEngine &rng);
 
+  // Sample a measurement outcome for each rng, so that the outcome of a
+  // shot only depends on its own rng. The default implementation samples
+  // a single shot for each rng.
+  virtual std::vector<reg_t> sample_measure(const reg_t &qubits,
+                                            std::vector<RngEngine> &rngs);
+
   //=======================================================================
   // Standard Methods
   //
@@ -179,12 +188,56 @@ public:
   // If negative there is no restriction on the backend
   inline void set_parallalization(int n) {threads_ = n;}
 
+  //-----------------------------------------------------------------------
+  // Cancellation
+  //-----------------------------------------------------------------------
+
+  // Set the cancellation flag checked between ops by `apply_ops`. The
+  // cancellation must outlive its use by the State.
+  inline void set_cancellation(const Cancellation *cancellation) {
+    cancellation_ = cancellation;
+  }
+
+  // Throw a CancelledError if execution has been cancelled
+  inline void check_cancelled() const {
+    if (cancellation_ != nullptr)
+      cancellation_->check();
+  }
+
+  //-----------------------------------------------------------------------
+  // Profiling
+  //-----------------------------------------------------------------------
+
+  // Set the profiler that records the time of the ops applied by
+  // `apply_ops`, or nullptr to disable profiling. The profiler must outlive
+  // its use by the State.
+  inline void set_profiler(Profiler *profiler) {profiler_ = profiler;}
+
+  // Return a timer that records the time of applying an op until it goes
+  // out of scope
+  inline Profiler::Timer profile_op(const Operations::Op &op) const {
+    return Profiler::Timer(profiler_, "ops", op);
+  }
+
+  //-----------------------------------------------------------------------
+  // Memory accounting
+  //-----------------------------------------------------------------------
+
+  // Set the tracker that accounts the memory of the quantum state, or
+  // nullptr to disable tracking. The tracker must outlive its use by the
+  // State. States that track their memory should override this method or
+  // update `memory_` when the size of the state changes.
+  virtual void set_memory_tracker(MemoryTracker *tracker) {
+    memory_.set_tracker(tracker, name());
+  }
+
   //-----------------------------------------------------------------------
   // Data accessors
   //-----------------------------------------------------------------------
 
-  // Returns a const reference to the states data structure
+  // Returns a reference to the states data structure
   inline const state_t &qreg() const {return qreg_;}
+  inline state_t &qreg() {return qreg_;}
   inline const auto &creg() const {return creg_;}
 
 protected:
@@ -198,6 +251,15 @@ protected:
   // Maximum threads which may be used by the backend for OpenMP multithreading
   // Default value is single-threaded unless overridden
   int threads_ = 1;
+
+  // Cancellation flag for execution, or nullptr if it can't be cancelled
+  const Cancellation *cancellation_ = nullptr;
+
+  // Profiler for execution, or nullptr if profiling is disabled
+  Profiler *profiler_ = nullptr;
+
+  // Tracked memory of the quantum state
+  MemoryTracker::Allocation memory_;
 };
 
 
@@ -221,6 +283,19 @@ std::vector<reg_t> State<state_t>::sample_measure(const reg_t &qubits,
 }
 
 
+template <class state_t>
+std::vector<reg_t> State<state_t>::sample_measure(const reg_t &qubits,
+                                                  std::vector<RngEngine> &rngs) {
+  std::vector<reg_t> samples;
+  samples.reserve(rngs.size());
+  for (auto &rng : rngs) {
+    auto sample = sample_measure(qubits, 1, rng);
+    samples.insert(samples.end(), sample.begin(), sample.end());
+  }
+  return samples;
+}
+
+
 
 template <class state_t>
 bool State<state_t>::validate_opset(const Operations::OpSet &opset) const {
@@ -0,0 +1,157 @@
+/**
+ * Copyright 2018, IBM.
+ *
+ * This source code is licensed under the Apache License, Version 2.0 found in
+ * the LICENSE.txt file in the root directory of this source tree.
+ */
+
+#ifndef _aer_framework_buffer_pool_hpp_
+#define _aer_framework_buffer_pool_hpp_
+
+#include <algorithm>
+#include <cstdlib>
+#include <iterator>
+#include <limits>
+#include <list>
+#include <mutex>
+#include <new>
+#include <utility>
+
+namespace AER {
+
+//============================================================================
+// BufferPool class
+//============================================================================
+
+// This class keeps released memory buffers so that they can be reused by
+// later allocations of the same size, avoiding the cost of allocating and
+// page faulting large state buffers for each experiment. Buffers are
+// allocated with malloc and may be released to the pool or freed by their
+// owner.
+//
+// The pool holds buffers of any size, and is bounded by the total memory of
+// the buffers acquired from it: when a new buffer is allocated, pooled
+// buffers are freed, least recently released first, until the memory of the
+// buffers in use, the pooled buffers and the new buffer is at most the
+// maximum bytes of the pool. Buffers in use are never freed by the pool.
+//
+// All methods may be called concurrently from different threads.
+
+class BufferPool {
+public:
+
+  BufferPool() = default;
+  BufferPool(const BufferPool &obj) = delete;
+  BufferPool &operator=(const BufferPool &obj) = delete;
+  ~BufferPool() {clear();}
+
+  // Return a buffer of the input size in bytes. The contents of the buffer
+  // are uninitialized. Throws std::bad_alloc if allocation fails.
+  void* acquire(size_t bytes);
+
+  // Return a buffer of the input size in bytes to the pool
+  void release(void* buffer, size_t bytes);
+
+  // Stop counting a buffer of the input size in bytes acquired from the
+  // pool as in use, when its ownership is passed to an owner that frees it
+  void detach(size_t bytes);
+
+  // Set the maximum bytes of the buffers in use and in the pool, freeing
+  // pooled buffers if they exceed it
+  void set_max_bytes(size_t bytes);
+
+  // Free all pooled buffers
+  void clear();
+
+  // Return the pool shared by all State classes
+  static BufferPool& global();
+
+protected:
+  // Free pooled buffers, least recently released first, until the buffers
+  // in use and in the pool leave room for the input bytes. The mutex must
+  // be held by the caller.
+  void evict(size_t bytes);
+
+  std::mutex mutex_;
+  std::list<std::pair<size_t, void*>> buffers_; // Pooled buffers in release order
+  size_t pooled_bytes_ = 0;
+  size_t used_bytes_ = 0;
+  size_t max_bytes_ = std::numeric_limits<size_t>::max();
+};
+
+/*******************************************************************************
+ *
+ * Implementations
+ *
+ ******************************************************************************/
+
+void* BufferPool::acquire(size_t bytes) {
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    // Reuse the most recently released buffer of the size
+    for (auto it = buffers_.rbegin(); it != buffers_.rend(); ++it) {
+      if (it->first == bytes) {
+        void* buffer = it->second;
+        buffers_.erase(std::next(it).base());
+        pooled_bytes_ -= bytes;
+        used_bytes_ += bytes;
+        return buffer;
+      }
+    }
+    evict(bytes);
+    used_bytes_ += bytes;
+  }
+  void* buffer = malloc(bytes);
+  if (buffer == nullptr && bytes > 0) {
+    detach(bytes);
+    throw std::bad_alloc();
+  }
+  return buffer;
+}
+
+void BufferPool::release(void* buffer, size_t bytes) {
+  if (buffer == nullptr)
+    return;
+  std::lock_guard<std::mutex> lock(mutex_);
+  buffers_.emplace_back(bytes, buffer);
+  pooled_bytes_ += bytes;
+  used_bytes_ -= std::min(used_bytes_, bytes);
+}
+
+void BufferPool::detach(size_t bytes) {
+  std::lock_guard<std::mutex> lock(mutex_);
+  used_bytes_ -= std::min(used_bytes_, bytes);
+}
+
+void BufferPool::set_max_bytes(size_t bytes) {
+  std::lock_guard<std::mutex> lock(mutex_);
+  max_bytes_ = bytes;
+  evict(0);
+}
+
+void BufferPool::clear() {
+  std::lock_guard<std::mutex> lock(mutex_);
+  for (auto &pair : buffers_)
+    free(pair.second);
+  buffers_.clear();
+  pooled_bytes_ = 0;
+}
+
+void BufferPool::evict(size_t bytes) {
+  while (!buffers_.empty() &&
+         used_bytes_ + pooled_bytes_ + bytes > max_bytes_) {
+    free(buffers_.front().second);
+    pooled_bytes_ -= buffers_.front().first;
+    buffers_.pop_front();
+  }
+}
+
+BufferPool& BufferPool::global() {
+  static BufferPool pool;
+  return pool;
+}
+
+//------------------------------------------------------------------------------
+} // end namespace AER
+//------------------------------------------------------------------------------
+#endif
@@ -0,0 +1,96 @@
+/**
+ * Copyright 2018, IBM.
+ *
+ * This source code is licensed under the Apache License, Version 2.0 found in
+ * the LICENSE.txt file in the root directory of this source tree.
+ */
+
+#ifndef _aer_framework_cancellation_hpp_
+#define _aer_framework_cancellation_hpp_
+
+#include <atomic>
+#include <chrono>
+#include <cstdint>
+#include <stdexcept>
+#include <string>
+
+namespace AER {
+
+//============================================================================
+// Cancellation class
+//============================================================================
+
+// Exception thrown when execution is stopped by a Cancellation
+class CancelledError : public std::runtime_error {
+public:
+  explicit CancelledError(const std::string &msg) : std::runtime_error(msg) {}
+};
+
+// This class is a cancellation flag shared between an executing qobj and the
+// code that may cancel it. Cancellation is cooperative: the Controller checks
+// the flag between experiments and shots, and State classes between ops, and
+// throw a CancelledError if it is set. Execution is also cancelled once an
+// optional deadline has passed.
+//
+// All methods may be called concurrently from different threads.
+
+class Cancellation {
+public:
+  using clock_t = std::chrono::steady_clock;
+
+  Cancellation() = default;
+  Cancellation(const Cancellation &obj) = delete;
+  Cancellation &operator=(const Cancellation &obj) = delete;
+
+  // Request cancellation
+  void cancel() {cancelled_ = true;}
+
+  // Cancel execution once the input number of seconds from now has passed.
+  // This replaces any previous deadline.
+  void set_timeout(double seconds);
+
+  // Return true if cancellation has been requested or the deadline passed
+  bool cancelled() const;
+
+  // Throw a CancelledError if cancelled
+  void check() const;
+
+protected:
+  mutable std::atomic<bool> cancelled_{false};
+  std::atomic<bool> has_deadline_{false};
+  std::atomic<clock_t::rep> deadline_{0};
+};
+
+/*******************************************************************************
+ *
+ * Implementations
+ *
+ ******************************************************************************/
+
+void Cancellation::set_timeout(double seconds) {
+  const auto timeout = std::chrono::duration_cast<clock_t::duration>(
+    std::chrono::duration<double>(seconds));
+  deadline_ = (clock_t::now() + timeout).time_since_epoch().count();
+  has_deadline_ = true;
+}
+
+bool Cancellation::cancelled() const {
+  if (cancelled_)
+    return true;
+  if (has_deadline_ &&
+      clock_t::now().time_since_epoch().count() >= deadline_) {
+    cancelled_ = true;
+    return true;
+  }
+  return false;
+}
+
+void Cancellation::check() const {
+  if (cancelled())
+    throw CancelledError("execution cancelled");
+}
+
+//------------------------------------------------------------------------------
+} // end namespace AER
+//------------------------------------------------------------------------------
+#endif
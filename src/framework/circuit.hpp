@@ -8,6 +8,7 @@
 #ifndef _aer_framework_circuit_hpp_
 #define _aer_framework_circuit_hpp_
 
+#include <memory>
 #include <random>
 
 #include "framework/operations.hpp"
@@ -38,6 +39,14 @@ public:
   // Optional data members from QOBJ
   json_t header;
 
+  // Parameterized circuits
+  // A parameterized circuit is executed as one experiment for each row of
+  // its parameter bind table. Column k of the table contains values for the
+  // parameter ops[i].params[j] where (i, j) = parameter_positions[k].
+  // The bind table is shared between copies of the circuit.
+  std::vector<std::pair<uint_t, uint_t>> parameter_positions;
+  std::shared_ptr<const std::vector<rvector_t>> parameter_binds;
+
   // Constructor
   // The constructor automatically calculates the num_qubits, num_memory, num_registers
   // parameters by scaning the input list of ops.
@@ -60,6 +69,20 @@ public:
   // Return the opset for the circuit
   inline const Operations::OpSet& opset() const {return opset_;}
 
+  // Return true if the circuit has a parameter bind table
+  inline bool parameterized() const {return parameter_binds != nullptr;}
+
+  // Return the number of experiments executed for the circuit. This is the
+  // number of rows of the parameter bind table for a parameterized circuit
+  // and 1 otherwise.
+  uint_t num_experiments() const;
+
+  // Return a copy of a parameterized circuit with its parameters bound to
+  // a row of the parameter bind table. The returned circuit is not
+  // parameterized, and its seed is shifted by the row index so that
+  // results for different rows are not correlated.
+  Circuit bind_parameters(uint_t row) const;
+
   // Check if any circuit ops are conditional ops
   bool has_conditional() const;
 
@@ -77,6 +100,9 @@ public:
 
 private:
   Operations::OpSet opset_;  // Set of operation types contained in circuit
+
+  // Load and check parameter positions and bind table from config
+  void load_parameter_binds(const json_t &config);
 };
 
 // Json conversion function
@@ -163,6 +189,65 @@ Circuit::Circuit(const json_t &circ, const json_t &qobj_config) : Circuit() {
     // override qubit number
     num_qubits = n_qubits;
   }
+
+  // Load parameter bind table for parameterized experiments
+  load_parameter_binds(config);
+}
+
+
+void Circuit::load_parameter_binds(const json_t &config) {
+  const bool has_positions = JSON::check_key("parameter_positions", config);
+  const bool has_binds = JSON::check_key("parameter_binds", config);
+  if (!has_positions && !has_binds)
+    return;
+  if (!has_positions || !has_binds) {
+    throw std::invalid_argument("Invalid Qobj experiment: parameterized experiments require "
+                                "both \"parameter_positions\" and \"parameter_binds\".");
+  }
+  JSON::get_value(parameter_positions, "parameter_positions", config);
+  auto binds = std::make_shared<std::vector<rvector_t>>();
+  JSON::get_value(*binds, "parameter_binds", config);
+  if (binds->empty()) {
+    throw std::invalid_argument("Invalid Qobj experiment: \"parameter_binds\" is empty.");
+  }
+  for (const auto &pos : parameter_positions) {
+    if (pos.first >= ops.size() || pos.second >= ops[pos.first].params.size()) {
+      throw std::invalid_argument("Invalid Qobj experiment: parameter position (" +
+                                  std::to_string(pos.first) + ", " +
+                                  std::to_string(pos.second) +
+                                  ") is not an instruction parameter.");
+    }
+  }
+  for (const auto &row : *binds) {
+    if (row.size() != parameter_positions.size()) {
+      throw std::invalid_argument("Invalid Qobj experiment: \"parameter_binds\" row length "
+                                  "does not match the number of parameter positions.");
+    }
+  }
+  parameter_binds = binds;
+}
+
+
+uint_t Circuit::num_experiments() const {
+  return parameterized() ? parameter_binds->size() : 1;
+}
+
+
+Circuit Circuit::bind_parameters(uint_t row) const {
+  if (!parameterized())
+    throw std::invalid_argument("Circuit: cannot bind parameters of a non-parameterized circuit.");
+  if (row >= parameter_binds->size())
+    throw std::invalid_argument("Circuit: parameter bind row is out of range.");
+  Circuit circ(*this);
+  const auto &values = (*parameter_binds)[row];
+  for (size_t k = 0; k < values.size(); ++k) {
+    const auto &pos = parameter_positions[k];
+    circ.ops[pos.first].params[pos.second] = values[k];
+  }
+  circ.parameter_positions.clear();
+  circ.parameter_binds.reset();
+  circ.seed += row;
+  return circ;
 }
 
 
@@ -11,6 +11,7 @@
 #include <chrono>
 #include <cstdint>
 #include <iostream>
+#include <memory>
 #include <random>
 #include <sstream>
 #include <stdexcept>
@@ -30,6 +31,12 @@ public:
 
   virtual void set_config(const json_t &config);
 
+  // Return a copy of the optimization
+  virtual std::shared_ptr<CircuitOptimization> clone() const = 0;
+
+  // Return the name of the optimization, used for profiling
+  virtual std::string name() const {return "circuit_optimization";}
+
 protected:
   json_t config_;
 };
@@ -0,0 +1,192 @@
+/**
+ * Copyright 2018, IBM.
+ *
+ * This source code is licensed under the Apache License, Version 2.0 found in
+ * the LICENSE.txt file in the root directory of this source tree.
+ */
+
+#ifndef _aer_framework_complex_array_hpp_
+#define _aer_framework_complex_array_hpp_
+
+#include <complex>
+#include <cstdlib>
+#include <functional>
+#include <numeric>
+#include <stdexcept>
+#include <vector>
+
+#include "framework/json.hpp"
+
+namespace AER {
+
+//============================================================================
+// Complex array class
+//============================================================================
+
+// This class owns a contiguous buffer of complex doubles allocated with
+// malloc, together with the shape of the array it represents. It is used to
+// return large statevector and unitary data from a simulation without
+// converting it to JSON. The buffer of a QubitVector can be moved into a
+// ComplexArray without copying, and the Python wrappers release the buffer
+// to back a NumPy array.
+//
+// Data is stored in row-major (C) order, unless fortran_order is true in
+// which case it is stored in column-major (Fortran) order.
+
+class ComplexArray {
+public:
+  using complex_t = std::complex<double>;
+
+  //-----------------------------------------------------------------------
+  // Constructors and Destructor
+  //-----------------------------------------------------------------------
+
+  ComplexArray() = default;
+
+  // Take ownership of a buffer allocated with malloc
+  ComplexArray(complex_t *data, const std::vector<size_t> &shape,
+               bool fortran_order = false);
+
+  // Allocate an uninitialized buffer for the given shape
+  explicit ComplexArray(const std::vector<size_t> &shape,
+                        bool fortran_order = false);
+
+  ComplexArray(const ComplexArray &obj) = delete;
+  ComplexArray &operator=(const ComplexArray &obj) = delete;
+  ComplexArray(ComplexArray &&obj) noexcept;
+  ComplexArray &operator=(ComplexArray &&obj) noexcept;
+
+  ~ComplexArray();
+
+  //-----------------------------------------------------------------------
+  // Data access
+  //-----------------------------------------------------------------------
+
+  // Returns a pointer to the underlying buffer
+  complex_t *data() const {return data_;}
+
+  // Returns the array shape
+  const std::vector<size_t> &shape() const {return shape_;}
+
+  // Returns the number of elements in the array
+  size_t size() const;
+
+  // Returns true if the data is stored in column-major order
+  bool fortran_order() const {return fortran_order_;}
+
+  // Returns true if the array does not own a buffer
+  bool empty() const {return data_ == nullptr;}
+
+  // Release ownership of the buffer. The caller is responsible for
+  // freeing the returned pointer with free.
+  complex_t *release();
+
+  // Return JSON serialization of the array as nested lists of
+  // complex numbers [real(z), imag(z)]
+  json_t json() const;
+
+protected:
+
+  complex_t *data_ = nullptr;
+  std::vector<size_t> shape_;
+  bool fortran_order_ = false;
+
+  // Recursive helper for JSON serialization
+  json_t json_helper(size_t dim, size_t offset,
+                     const std::vector<size_t> &strides) const;
+};
+
+/*******************************************************************************
+ *
+ * Implementations
+ *
+ ******************************************************************************/
+
+inline void to_json(json_t &js, const ComplexArray &arr) {
+  js = arr.json();
+}
+
+ComplexArray::ComplexArray(complex_t *data, const std::vector<size_t> &shape,
+                           bool fortran_order)
+  : data_(data), shape_(shape), fortran_order_(fortran_order) {}
+
+ComplexArray::ComplexArray(const std::vector<size_t> &shape,
+                           bool fortran_order)
+  : shape_(shape), fortran_order_(fortran_order) {
+  data_ = reinterpret_cast<complex_t*>(malloc(sizeof(complex_t) * size()));
+  if (data_ == nullptr && size() > 0)
+    throw std::runtime_error("ComplexArray: failed to allocate memory.");
+}
+
+ComplexArray::ComplexArray(ComplexArray &&obj) noexcept
+  : data_(obj.data_), shape_(std::move(obj.shape_)),
+    fortran_order_(obj.fortran_order_) {
+  obj.data_ = nullptr;
+  obj.shape_.clear();
+}
+
+ComplexArray &ComplexArray::operator=(ComplexArray &&obj) noexcept {
+  if (this != &obj) {
+    if (data_)
+      free(data_);
+    data_ = obj.data_;
+    shape_ = std::move(obj.shape_);
+    fortran_order_ = obj.fortran_order_;
+    obj.data_ = nullptr;
+    obj.shape_.clear();
+  }
+  return *this;
+}
+
+ComplexArray::~ComplexArray() {
+  if (data_)
+    free(data_);
+}
+
+size_t ComplexArray::size() const {
+  if (shape_.empty())
+    return 0;
+  return std::accumulate(shape_.begin(), shape_.end(), size_t(1),
+                         std::multiplies<size_t>());
+}
+
+ComplexArray::complex_t *ComplexArray::release() {
+  complex_t *data = data_;
+  data_ = nullptr;
+  shape_.clear();
+  return data;
+}
+
+json_t ComplexArray::json() const {
+  if (empty())
+    return json_t::array();
+  // Compute element strides for the storage order
+  const size_t ndim = shape_.size();
+  std::vector<size_t> strides(ndim, 1);
+  if (fortran_order_) {
+    for (size_t d = 1; d < ndim; ++d)
+      strides[d] = strides[d - 1] * shape_[d - 1];
+  } else {
+    for (size_t d = ndim - 1; d > 0; --d)
+      strides[d - 1] = strides[d] * shape_[d];
+  }
+  return json_helper(0, 0, strides);
+}
+
+json_t ComplexArray::json_helper(size_t dim, size_t offset,
+                                 const std::vector<size_t> &strides) const {
+  json_t js = json_t::array();
+  if (dim + 1 == shape_.size()) {
+    for (size_t j = 0; j < shape_[dim]; ++j)
+      js.push_back(data_[offset + j * strides[dim]]);
+  } else {
+    for (size_t j = 0; j < shape_[dim]; ++j)
+      js.push_back(json_helper(dim + 1, offset + j * strides[dim], strides));
+  }
+  return js;
+}
+
+//------------------------------------------------------------------------------
+} // end namespace AER
+//------------------------------------------------------------------------------
+#endif
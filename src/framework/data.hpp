@@ -8,12 +8,76 @@
 #ifndef _aer_framework_data_hpp_
 #define _aer_framework_data_hpp_
 
+#include "framework/complex_array.hpp"
 #include "framework/json.hpp"
 #include "framework/snapshot.hpp"
 #include "framework/utils.hpp"
 
 namespace AER {
 
+//============================================================================
+// Array data class for Qiskit-Aer
+//============================================================================
+
+// Storage for complex array data (statevectors and unitaries) that is kept
+// out of the JSON output so that it can be returned to Python as NumPy arrays
+// without serialization. The stored arrays mirror the location they would
+// have in the circuit data JSON: additional data keys, and singleshot
+// snapshot types and labels.
+
+class ArrayData {
+public:
+
+  // Add an array to the additional data at the specified key
+  void add_additional_data(const std::string &key, ComplexArray &&data);
+
+  // Add an array to the singleshot snapshot of the specified type and label
+  void add_singleshot_snapshot(const std::string &type,
+                               const std::string &label,
+                               ComplexArray &&datum);
+
+  // Delete all singleshot snapshots of a given type
+  void clear_singleshot_snapshot(const std::string &type);
+
+  // Delete all singleshot snapshots of a given type and label
+  void clear_singleshot_snapshot(const std::string &type,
+                                 const std::string &label);
+
+  // Delete additional data at the specified key
+  void clear_additional_data(const std::string &key);
+
+  // Empty all stored data
+  void clear();
+
+  // Return true if there is no stored data
+  bool empty() const;
+
+  // Return the memory used by the stored arrays in bytes
+  size_t memory_bytes() const;
+
+  // Combine with another ArrayData object using move semantics.
+  // The input object is cleared after combining.
+  ArrayData& combine(ArrayData &data);
+
+  // Add all stored arrays to a circuit data JSON object as nested lists.
+  // This is used when results are serialized to JSON rather than returned
+  // as NumPy arrays.
+  void add_to_json(json_t &js) const;
+
+  // Access stored data
+  stringmap_t<ComplexArray> &additional_data() {return additional_data_;}
+  stringmap_t<stringmap_t<std::vector<ComplexArray>>> &singleshot_snapshots() {
+    return singleshot_snapshots_;
+  }
+
+protected:
+  // Additional data arrays
+  stringmap_t<ComplexArray> additional_data_;
+
+  // Singleshot snapshot arrays (type -> label -> shots)
+  stringmap_t<stringmap_t<std::vector<ComplexArray>>> singleshot_snapshots_;
+};
+
 //============================================================================
 // Output data class for Qiskit-Aer
 //============================================================================
@@ -25,6 +89,9 @@ namespace AER {
  * - "snapshots" (bool): Return snapshots object in circuit data [Default: True]
  * - "memory" (bool): Return memory array in circuit data [Default: False]
  * - "register" (bool): Return register array in circuit data [Default: False]
+ * - "return_numpy" (bool): Store statevector and unitary data as complex
+ *      arrays so that it can be returned as NumPy arrays by the Python
+ *      wrappers instead of being serialized to JSON [Default: False]
  **************************************************************************/
 
 class OutputData {
@@ -89,6 +156,28 @@ public:
 
   void clear_additional_data(const std::string &key);
 
+  //----------------------------------------------------------------
+  // Array data
+  //----------------------------------------------------------------
+
+  // Add a complex array to the additional data
+  // This is stored separately from the JSON data and should only be
+  // used if return_numpy() is true
+  void add_additional_data(const std::string &key, ComplexArray &&data);
+
+  // Add a complex array to the snapshot of the specified type and label
+  // This is stored separately from the JSON data and should only be
+  // used if return_numpy() is true
+  void add_singleshot_snapshot(const std::string &type,
+                               const std::string &label,
+                               ComplexArray &&datum);
+
+  // Return true if statevector and unitary data should be stored as arrays
+  bool return_numpy() const {return return_numpy_;}
+
+  // Access the stored array data
+  ArrayData &array_data() {return array_data_;}
+
   //----------------------------------------------------------------
   // Config
   //----------------------------------------------------------------
@@ -102,6 +191,9 @@ public:
   // Serialize engine data to JSON
   json_t json() const;
 
+  // Return the approximate memory used by the stored data in bytes
+  size_t memory_bytes() const;
+
   // Combine engines for accumulating data
   // Second engine should no longer be used after combining
   // as this function should use move semantics to minimize copying
@@ -111,8 +203,19 @@ public:
   // Note this operator is not defined to be const on the input argument
   inline OutputData& operator+=(OutputData &eng) {return combine(eng);}
 
+  // Combine engines of interleaved shots
+  // The single shot memory and registers of the second engine are inserted
+  // at the given shot positions of the combined engine, where positions[j]
+  // is the position of the j-th shot of the second engine.
+  OutputData& combine(OutputData &eng, const std::vector<uint_t> &positions);
+
 protected:
 
+  // Insert the single shot values of other at positions of the combined shots
+  static void insert_singleshots(std::vector<std::string> &values,
+                                 std::vector<std::string> &other,
+                                 const std::vector<uint_t> &positions);
+
   //----------------------------------------------------------------
   // OutputData
   //----------------------------------------------------------------
@@ -129,6 +232,9 @@ protected:
   // Miscelaneous data
   json_t additional_data_;
 
+  // Array data
+  ArrayData array_data_;
+
   //----------------------------------------------------------------
   // Config
   //----------------------------------------------------------------
@@ -138,17 +244,109 @@ protected:
   bool return_register_ = false;
   bool return_snapshots_ = true;
   bool return_additional_data_ = true;
+  bool return_numpy_ = false;
 };
 
 //============================================================================
 // Implementations
 //============================================================================
 
+void ArrayData::add_additional_data(const std::string &key,
+                                    ComplexArray &&data) {
+  additional_data_[key] = std::move(data);
+}
+
+
+void ArrayData::add_singleshot_snapshot(const std::string &type,
+                                        const std::string &label,
+                                        ComplexArray &&datum) {
+  singleshot_snapshots_[type][label].push_back(std::move(datum));
+}
+
+
+void ArrayData::clear_singleshot_snapshot(const std::string &type) {
+  singleshot_snapshots_.erase(type);
+}
+
+
+void ArrayData::clear_singleshot_snapshot(const std::string &type,
+                                          const std::string &label) {
+  if (singleshot_snapshots_.find(type) != singleshot_snapshots_.end()) {
+    singleshot_snapshots_[type].erase(label);
+  }
+}
+
+
+void ArrayData::clear_additional_data(const std::string &key) {
+  additional_data_.erase(key);
+}
+
+
+void ArrayData::clear() {
+  additional_data_.clear();
+  singleshot_snapshots_.clear();
+}
+
+
+bool ArrayData::empty() const {
+  return additional_data_.empty() && singleshot_snapshots_.empty();
+}
+
+
+size_t ArrayData::memory_bytes() const {
+  size_t bytes = 0;
+  for (const auto &pair : additional_data_)
+    bytes += pair.second.size() * sizeof(ComplexArray::complex_t);
+  for (const auto &type : singleshot_snapshots_) {
+    for (const auto &label : type.second) {
+      for (const auto &arr : label.second)
+        bytes += arr.size() * sizeof(ComplexArray::complex_t);
+    }
+  }
+  return bytes;
+}
+
+
+ArrayData& ArrayData::combine(ArrayData &data) {
+  // Combine additional data
+  // Note that this will override any fields that have the same value
+  for (auto &pair : data.additional_data_) {
+    additional_data_[pair.first] = std::move(pair.second);
+  }
+  // Combine snapshots
+  for (auto &type : data.singleshot_snapshots_) {
+    for (auto &label : type.second) {
+      auto &slot = singleshot_snapshots_[type.first][label.first];
+      slot.insert(slot.end(), std::make_move_iterator(label.second.begin()),
+                              std::make_move_iterator(label.second.end()));
+    }
+  }
+  data.clear();
+  return *this;
+}
+
+
+void ArrayData::add_to_json(json_t &js) const {
+  for (const auto &pair : additional_data_) {
+    js[pair.first] = pair.second;
+  }
+  for (const auto &type : singleshot_snapshots_) {
+    for (const auto &label : type.second) {
+      json_t &slot = js["snapshots"][type.first][label.first];
+      for (const auto &datum : label.second)
+        slot.push_back(datum);
+    }
+  }
+}
+
+//------------------------------------------------------------------------------
+
 void OutputData::set_config(const json_t &config) {
   JSON::get_value(return_counts_, "counts", config);
   JSON::get_value(return_memory_, "memory", config);
   JSON::get_value(return_register_, "register", config);
   JSON::get_value(return_snapshots_, "snapshots", config);
+  JSON::get_value(return_numpy_, "return_numpy", config);
 }
 
 
@@ -197,8 +395,18 @@ void OutputData::add_average_snapshot(const std::string &type,
 }
 
 
+void OutputData::add_singleshot_snapshot(const std::string &type,
+                                         const std::string &label,
+                                         ComplexArray &&datum) {
+  if (return_snapshots_) {
+    array_data_.add_singleshot_snapshot(type, label, std::move(datum));
+  }
+}
+
+
 void OutputData::clear_singleshot_snapshot(const std::string &type) {
   singleshot_snapshots_.erase(type);
+  array_data_.clear_singleshot_snapshot(type);
 }
 
 
@@ -207,6 +415,7 @@ void OutputData::clear_singleshot_snapshot(const std::string &type,
   if (singleshot_snapshots_.find(type) != singleshot_snapshots_.end()) {
     singleshot_snapshots_[type].erase(label);
   }
+  array_data_.clear_singleshot_snapshot(type, label);
 }
 
 
@@ -232,8 +441,17 @@ void OutputData::add_additional_data(const std::string &key, const T &data) {
 }
 
 
+void OutputData::add_additional_data(const std::string &key,
+                                     ComplexArray &&data) {
+  if (return_additional_data_) {
+    array_data_.add_additional_data(key, std::move(data));
+  }
+}
+
+
 void OutputData::clear_additional_data(const std::string &key) {
   additional_data_.erase(key);
+  array_data_.clear_additional_data(key);
 }
 
 
@@ -247,6 +465,8 @@ void OutputData::clear() {
   average_snapshots_.clear();
   // Clear additional data
   additional_data_.clear();
+  // Clear array data
+  array_data_.clear();
 }
 
 
@@ -273,6 +493,8 @@ OutputData& OutputData::combine(OutputData &data) {
        it != data.additional_data_.end(); ++it) {
     additional_data_[it.key()] = it.value();
   }
+  // Combine array data
+  array_data_.combine(data.array_data_);
 
   // Clear any remaining data from other container
   data.clear();
@@ -281,6 +503,60 @@ OutputData& OutputData::combine(OutputData &data) {
 }
 
 
+OutputData& OutputData::combine(OutputData &data,
+                                const std::vector<uint_t> &positions) {
+  insert_singleshots(memory_, data.memory_, positions);
+  insert_singleshots(register_, data.register_, positions);
+  return combine(data);
+}
+
+
+void OutputData::insert_singleshots(std::vector<std::string> &values,
+                                    std::vector<std::string> &other,
+                                    const std::vector<uint_t> &positions) {
+  // Values that are not stored for every shot are appended by combine
+  if (other.size() != positions.size())
+    return;
+  const size_t size = values.size() + other.size();
+  std::vector<std::string> combined(size);
+  std::vector<bool> inserted(size, false);
+  for (size_t j = 0; j < other.size(); ++j) {
+    if (positions[j] >= size || inserted[positions[j]])
+      throw std::invalid_argument("OutputData::combine: invalid shot positions.");
+    combined[positions[j]] = std::move(other[j]);
+    inserted[positions[j]] = true;
+  }
+  size_t pos = 0;
+  for (auto &value : values) {
+    while (inserted[pos])
+      ++pos;
+    combined[pos++] = std::move(value);
+  }
+  values = std::move(combined);
+  other.clear();
+}
+
+
+size_t OutputData::memory_bytes() const {
+  // Strings are counted by their capacity, and map entries by their key
+  // and value as the tree node overhead depends on the implementation
+  size_t bytes = 0;
+  for (const auto &pair : counts_)
+    bytes += sizeof(pair) + pair.first.capacity();
+  for (const auto &str : memory_)
+    bytes += sizeof(str) + str.capacity();
+  for (const auto &str : register_)
+    bytes += sizeof(str) + str.capacity();
+  for (const auto &pair : singleshot_snapshots_)
+    bytes += pair.second.memory_bytes();
+  for (const auto &pair : average_snapshots_)
+    bytes += pair.second.memory_bytes();
+  bytes += JSON::memory_bytes(additional_data_);
+  bytes += array_data_.memory_bytes();
+  return bytes;
+}
+
+
 json_t OutputData::json() const {
 
   // Initialize output as additional data JSON
@@ -60,6 +60,13 @@ bool check_keys(std::vector<std::string> keys, const json_t &js);
  */
 template <typename T> bool get_value(T &var, std::string key, const json_t &js);
 
+/**
+ * Return the approximate memory used by a json_t object and its contents.
+ * @param js: the json_t object.
+ * @returns: the memory in bytes.
+ */
+size_t memory_bytes(const json_t &js);
+
 } // end namespace JSON
 
 //============================================================================
@@ -185,6 +192,25 @@ bool JSON::get_value(T &var, std::string key, const json_t &js) {
   }
 }
 
+size_t JSON::memory_bytes(const json_t &js) {
+  size_t bytes = sizeof(json_t);
+  if (js.is_string()) {
+    bytes += js.get_ref<const std::string&>().capacity();
+  } else if (js.is_array()) {
+    const auto &arr = js.get_ref<const json_t::array_t&>();
+    bytes += sizeof(json_t::array_t) + (arr.capacity() - arr.size()) * sizeof(json_t);
+    for (const auto &elt : arr)
+      bytes += memory_bytes(elt);
+  } else if (js.is_object()) {
+    // Each object item is a tree node holding the key and value
+    bytes += sizeof(json_t::object_t);
+    for (auto it = js.cbegin(); it != js.cend(); ++it)
+      bytes += 4 * sizeof(void*) + sizeof(std::string) + it.key().capacity()
+               + memory_bytes(it.value());
+  }
+  return bytes;
+}
+
 //------------------------------------------------------------------------------
 // JSON Conversion
 //------------------------------------------------------------------------------
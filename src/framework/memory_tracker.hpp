@@ -0,0 +1,181 @@
+/**
+ * Copyright 2019, IBM.
+ *
+ * This source code is licensed under the Apache License, Version 2.0 found in
+ * the LICENSE.txt file in the root directory of this source tree.
+ */
+
+#ifndef _aer_framework_memory_tracker_hpp_
+#define _aer_framework_memory_tracker_hpp_
+
+#include <algorithm>
+#include <map>
+#include <mutex>
+#include <string>
+
+#include "framework/json.hpp"
+
+namespace AER {
+
+//============================================================================
+// MemoryTracker class
+//============================================================================
+
+// This class accounts the memory held by the large data structures of a
+// simulation, such as statevector and unitary buffers, Clifford tables,
+// CH decompositions, output data and the parsed qobj, by category.
+//
+// The current and peak bytes are kept for each category and in total. A
+// tracker may have a parent tracker, such as the tracker of the job of an
+// experiment, which is updated by all changes to the tracker so that the
+// parent peak is the peak of memory held concurrently by its children.
+//
+// All methods may be called concurrently from different threads.
+
+class MemoryTracker {
+public:
+
+  // Memory held by an object of a category. The allocation updates its
+  // tracker when it is resized and releases its bytes when it is
+  // destroyed. An allocation without a tracker does nothing, so
+  // allocations may be used unconditionally.
+  class Allocation {
+  public:
+    Allocation() = default;
+    Allocation(const Allocation &other) = delete;
+    Allocation &operator=(const Allocation &other) = delete;
+    ~Allocation() {resize(0);}
+
+    // Set the tracker and category of the allocation. Any bytes held are
+    // moved from the previous tracker to the new one. The tracker must
+    // outlive the allocation, or its use until it is set to nullptr.
+    void set_tracker(MemoryTracker *tracker, const std::string &category);
+
+    // Set the number of bytes held
+    void resize(size_t bytes);
+
+    // Return the number of bytes held
+    size_t size() const {return bytes_;}
+
+  private:
+    MemoryTracker *tracker_ = nullptr;
+    std::string category_;
+    size_t bytes_ = 0;
+  };
+
+  explicit MemoryTracker(MemoryTracker *parent = nullptr) : parent_(parent) {}
+  MemoryTracker(const MemoryTracker &obj) = delete;
+  MemoryTracker &operator=(const MemoryTracker &obj) = delete;
+
+  // Release all bytes still held from the parent tracker
+  ~MemoryTracker();
+
+  // Add bytes to the memory held for a category
+  void allocate(const std::string &category, size_t bytes);
+
+  // Remove bytes from the memory held for a category
+  void release(const std::string &category, size_t bytes);
+
+  // Return the peak total bytes held
+  size_t peak() const;
+
+  // Return the peak memory as a JSON object {"peak_memory_mb",
+  // "peak_memory_bytes": {category: bytes, "total": bytes}}. The peak of
+  // each category is its own peak, which need not coincide with the peak
+  // of the total.
+  json_t json() const;
+
+protected:
+
+  struct Usage {
+    size_t current = 0;
+    size_t peak = 0;
+  };
+
+  MemoryTracker *parent_;
+  mutable std::mutex mutex_;
+  std::map<std::string, Usage> categories_;
+  Usage total_;
+};
+
+/*******************************************************************************
+ *
+ * Implementations
+ *
+ ******************************************************************************/
+
+void MemoryTracker::Allocation::set_tracker(MemoryTracker *tracker,
+                                            const std::string &category) {
+  if (tracker_ && bytes_ > 0)
+    tracker_->release(category_, bytes_);
+  tracker_ = tracker;
+  category_ = category;
+  if (tracker_ && bytes_ > 0)
+    tracker_->allocate(category_, bytes_);
+}
+
+void MemoryTracker::Allocation::resize(size_t bytes) {
+  if (tracker_ && bytes > bytes_)
+    tracker_->allocate(category_, bytes - bytes_);
+  else if (tracker_ && bytes < bytes_)
+    tracker_->release(category_, bytes_ - bytes);
+  bytes_ = bytes;
+}
+
+MemoryTracker::~MemoryTracker() {
+  if (parent_ == nullptr)
+    return;
+  for (const auto &pair : categories_)
+    parent_->release(pair.first, pair.second.current);
+}
+
+void MemoryTracker::allocate(const std::string &category, size_t bytes) {
+  if (bytes == 0)
+    return;
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    Usage &usage = categories_[category];
+    usage.current += bytes;
+    usage.peak = std::max(usage.peak, usage.current);
+    total_.current += bytes;
+    total_.peak = std::max(total_.peak, total_.current);
+  }
+  if (parent_)
+    parent_->allocate(category, bytes);
+}
+
+void MemoryTracker::release(const std::string &category, size_t bytes) {
+  if (bytes == 0)
+    return;
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    Usage &usage = categories_[category];
+    bytes = std::min(bytes, usage.current);
+    usage.current -= bytes;
+    total_.current -= bytes;
+  }
+  if (parent_)
+    parent_->release(category, bytes);
+}
+
+size_t MemoryTracker::peak() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return total_.peak;
+}
+
+json_t MemoryTracker::json() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  json_t js;
+  js["peak_memory_mb"] = static_cast<double>(total_.peak) / (1 << 20);
+  json_t &bytes = js["peak_memory_bytes"];
+  bytes = json_t::object();
+  for (const auto &pair : categories_)
+    bytes[pair.first] = pair.second.peak;
+  bytes["total"] = total_.peak;
+  return js;
+}
+
+//------------------------------------------------------------------------------
+} // end namespace AER
+//------------------------------------------------------------------------------
+#endif
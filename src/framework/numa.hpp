@@ -0,0 +1,254 @@
+/**
+ * Copyright 2018, IBM.
+ *
+ * This source code is licensed under the Apache License, Version 2.0 found in
+ * the LICENSE.txt file in the root directory of this source tree.
+ */
+
+#ifndef _aer_framework_numa_hpp_
+#define _aer_framework_numa_hpp_
+
+#include <algorithm>
+#include <cstdint>
+#include <fstream>
+#include <sstream>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+#if defined(__linux__)
+  #include <sched.h>
+  #include <sys/syscall.h>
+  #include <unistd.h>
+#endif
+
+namespace AER {
+namespace Numa {
+
+//============================================================================
+// NUMA memory placement
+//============================================================================
+
+// Placement of large state buffers across the NUMA nodes of a system.
+// Memory policies are only supported on Linux, where they are set with the
+// mbind system call. On other systems, or if the system has a single NUMA
+// node, the functions do nothing and return false.
+
+enum class Policy {
+  local,      // Pages are allocated on the node of the thread that first
+              // touches them
+  interleave, // Pages are interleaved across all nodes
+  partition   // The buffer is divided into one contiguous block per node
+};
+
+// Return the Policy with the input name. Throws std::invalid_argument if
+// the name is not a valid policy.
+Policy policy_from_string(const std::string &name);
+
+// An online NUMA node and its CPUs
+struct Node {
+  int id;
+  std::vector<int> cpus;
+};
+
+// Return the online NUMA nodes of the system, or an empty vector if they
+// cannot be found
+const std::vector<Node>& nodes();
+
+// Set the memory policy of a buffer. Pages of the buffer that are already
+// allocated are moved to follow the policy. Returns true if the policy was
+// set.
+bool set_policy(void* buffer, size_t bytes, Policy policy);
+
+// The CPUs a thread may run on
+using CpuSet = std::vector<int>;
+
+// Return the CPUs the calling thread may run on, or an empty set if they
+// cannot be found
+CpuSet thread_cpus();
+
+// Restrict the calling thread to the input CPUs. Returns true if the CPUs
+// were set.
+bool set_thread_cpus(const CpuSet &cpus);
+
+// Pin the calling thread to the CPUs of the node holding its block of a
+// partitioned buffer when the buffer is divided into equal blocks between
+// num_threads threads, as in an OpenMP static schedule. Only CPUs the thread
+// may already run on are kept, so that the affinity mask of the process is
+// respected. Returns the CPUs of the thread before it was pinned, to restore
+// them with set_thread_cpus, or an empty set if the thread was not pinned.
+CpuSet pin_thread(int thread, int num_threads);
+
+/*******************************************************************************
+ *
+ * Implementations
+ *
+ ******************************************************************************/
+
+Policy policy_from_string(const std::string &name) {
+  if (name == "local")
+    return Policy::local;
+  if (name == "interleave")
+    return Policy::interleave;
+  if (name == "partition")
+    return Policy::partition;
+  throw std::invalid_argument("Invalid NUMA policy (" + name + ").");
+}
+
+// Parse a Linux CPU or node list such as "0-3,8-11"
+std::vector<int> parse_list(const std::string &list) {
+  std::vector<int> ret;
+  std::stringstream ss(list);
+  std::string range;
+  while (std::getline(ss, range, ',')) {
+    if (range.empty() || range == "\n")
+      continue;
+    const auto dash = range.find('-');
+    const int first = std::stoi(range.substr(0, dash));
+    const int last = (dash == std::string::npos) ? first
+                                                 : std::stoi(range.substr(dash + 1));
+    for (int j = first; j <= last; ++j)
+      ret.push_back(j);
+  }
+  return ret;
+}
+
+std::vector<Node> load_nodes() {
+  std::vector<Node> ret;
+#if defined(__linux__)
+  const std::string path = "/sys/devices/system/node/";
+  try {
+    std::ifstream online(path + "online");
+    std::string list;
+    if (!std::getline(online, list))
+      return ret;
+    for (const int id : parse_list(list)) {
+      std::ifstream cpulist(path + "node" + std::to_string(id) + "/cpulist");
+      std::string cpus;
+      std::getline(cpulist, cpus);
+      ret.push_back(Node({id, parse_list(cpus)}));
+    }
+  } catch (std::exception &) {
+    ret.clear();
+  }
+#endif
+  return ret;
+}
+
+const std::vector<Node>& nodes() {
+  static const std::vector<Node> system_nodes = load_nodes();
+  return system_nodes;
+}
+
+#if defined(__linux__) && defined(SYS_mbind)
+// Set the memory policy of the whole pages of a buffer to the input nodes
+bool mbind_nodes(void* buffer, size_t bytes, int mode,
+                 const std::vector<int> &node_ids) {
+  // Constants from the Linux numaif.h header
+  const unsigned MPOL_MF_MOVE_ = 1 << 1;
+  const uintptr_t page = sysconf(_SC_PAGESIZE);
+  const uintptr_t begin = reinterpret_cast<uintptr_t>(buffer);
+  const uintptr_t start = (begin + page - 1) / page * page;
+  const uintptr_t stop = (begin + bytes) / page * page;
+  if (stop <= start || node_ids.empty())
+    return false;
+  const size_t bits = 8 * sizeof(unsigned long);
+  int max_id = 0;
+  for (const int id : node_ids)
+    max_id = std::max(max_id, id);
+  std::vector<unsigned long> mask(max_id / bits + 1, 0);
+  for (const int id : node_ids)
+    mask[id / bits] |= 1UL << (id % bits);
+  return syscall(SYS_mbind, start, stop - start, mode, mask.data(),
+                 mask.size() * bits + 1, MPOL_MF_MOVE_) == 0;
+}
+#endif
+
+bool set_policy(void* buffer, size_t bytes, Policy policy) {
+#if defined(__linux__) && defined(SYS_mbind)
+  // Constants from the Linux numaif.h header
+  const int MPOL_PREFERRED_ = 1;
+  const int MPOL_INTERLEAVE_ = 3;
+  const auto &system_nodes = nodes();
+  const size_t num_nodes = system_nodes.size();
+  if (buffer == nullptr || num_nodes < 2)
+    return false;
+  switch (policy) {
+    case Policy::local:
+      return false;
+    case Policy::interleave: {
+      std::vector<int> node_ids;
+      for (const auto &node : system_nodes)
+        node_ids.push_back(node.id);
+      return mbind_nodes(buffer, bytes, MPOL_INTERLEAVE_, node_ids);
+    }
+    case Policy::partition: {
+      // Prefer rather than bind to each node so that allocation falls back
+      // to other nodes if a node is out of memory
+      bool success = true;
+      char* begin = reinterpret_cast<char*>(buffer);
+      for (size_t j = 0; j < num_nodes; ++j) {
+        const size_t start = bytes * j / num_nodes;
+        const size_t stop = bytes * (j + 1) / num_nodes;
+        success &= mbind_nodes(begin + start, stop - start, MPOL_PREFERRED_,
+                               {system_nodes[j].id});
+      }
+      return success;
+    }
+  }
+#endif
+  return false;
+}
+
+CpuSet thread_cpus() {
+  CpuSet ret;
+#if defined(__linux__)
+  cpu_set_t cpus;
+  CPU_ZERO(&cpus);
+  if (sched_getaffinity(0, sizeof(cpus), &cpus) != 0)
+    return ret;
+  for (int cpu = 0; cpu < CPU_SETSIZE; ++cpu) {
+    if (CPU_ISSET(cpu, &cpus))
+      ret.push_back(cpu);
+  }
+#endif
+  return ret;
+}
+
+bool set_thread_cpus(const CpuSet &cpus) {
+#if defined(__linux__)
+  cpu_set_t mask;
+  CPU_ZERO(&mask);
+  for (const int cpu : cpus) {
+    if (cpu >= 0 && cpu < CPU_SETSIZE)
+      CPU_SET(cpu, &mask);
+  }
+  return CPU_COUNT(&mask) > 0 && sched_setaffinity(0, sizeof(mask), &mask) == 0;
+#else
+  return false;
+#endif
+}
+
+CpuSet pin_thread(int thread, int num_threads) {
+  const auto &system_nodes = nodes();
+  const size_t num_nodes = system_nodes.size();
+  if (num_nodes < 2 || num_threads < 1 || thread < 0 || thread >= num_threads)
+    return CpuSet();
+  const CpuSet allowed = thread_cpus();
+  const Node &node = system_nodes[thread * num_nodes / num_threads];
+  CpuSet cpus;
+  for (const int cpu : node.cpus) {
+    if (std::find(allowed.begin(), allowed.end(), cpu) != allowed.end())
+      cpus.push_back(cpu);
+  }
+  // Leave the thread unpinned if it may not run on any CPU of the node
+  if (cpus.empty() || !set_thread_cpus(cpus))
+    return CpuSet();
+  return allowed;
+}
+
+//------------------------------------------------------------------------------
+} // end namespace Numa
+} // end namespace AER
+//------------------------------------------------------------------------------
+#endif
@@ -0,0 +1,276 @@
+/**
+ * Copyright 2019, IBM.
+ *
+ * This source code is licensed under the Apache License, Version 2.0 found in
+ * the LICENSE.txt file in the root directory of this source tree.
+ */
+
+#ifndef _aer_framework_profiler_hpp_
+#define _aer_framework_profiler_hpp_
+
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <cstdint>
+#include <cstdlib>
+#include <fstream>
+#include <map>
+#include <mutex>
+#include <stdexcept>
+#include <string>
+#include <thread>
+#include <utility>
+#include <vector>
+
+#include "framework/json.hpp"
+#include "framework/operations.hpp"
+
+namespace AER {
+
+//============================================================================
+// Profiler class
+//============================================================================
+
+// This class records the time taken by sections of a simulation, such as
+// the ops applied to a State, noise sampling, circuit optimization passes,
+// measurement sampling and result serialization, when profiling is enabled.
+//
+// Times are aggregated by category and name into a count, total, minimum,
+// maximum and a histogram with power of 2 bins. If tracing is enabled each
+// timed section is also kept as a trace event, and the events may be saved
+// as a Chrome trace-event JSON file that can be viewed with chrome://tracing
+// or Perfetto.
+//
+// All methods may be called concurrently from different threads.
+
+class Profiler {
+public:
+  using clock_t = std::chrono::steady_clock;
+
+  // Timer for a section of code, which records the time from its
+  // construction to its destruction. A timer of a null profiler does
+  // nothing, so timers may be used unconditionally.
+  class Timer {
+  public:
+    Timer(Profiler *profiler, const char *category, std::string name)
+      : profiler_(profiler), category_(category), name_(std::move(name)) {
+      if (profiler_)
+        start_ = clock_t::now();
+    }
+
+    // Timer for an op, named by the op name and its number of qubits
+    Timer(Profiler *profiler, const char *category, const Operations::Op &op)
+      : profiler_(profiler), category_(category), op_(&op) {
+      if (profiler_)
+        start_ = clock_t::now();
+    }
+
+    Timer(Timer &&other) noexcept
+      : profiler_(other.profiler_), category_(other.category_),
+        name_(std::move(other.name_)), op_(other.op_), start_(other.start_) {
+      other.profiler_ = nullptr;
+    }
+    Timer(const Timer &other) = delete;
+    Timer &operator=(const Timer &other) = delete;
+
+    ~Timer() {
+      if (profiler_ == nullptr)
+        return;
+      const auto stop = clock_t::now();
+      if (op_ != nullptr)
+        name_ = op_->name + "_" + std::to_string(op_->qubits.size()) + "q";
+      profiler_->record(category_, name_, start_, stop);
+    }
+
+  private:
+    Profiler *profiler_;
+    const char *category_;
+    std::string name_;
+    const Operations::Op *op_ = nullptr;
+    clock_t::time_point start_;
+  };
+
+  // Create a profiler. If trace is true the events of at most max_events
+  // timed sections are kept for a trace file.
+  explicit Profiler(bool trace = false, size_t max_events = 1000000)
+    : trace_(trace), max_events_(max_events), start_(clock_t::now()) {}
+
+  Profiler(const Profiler &obj) = delete;
+  Profiler &operator=(const Profiler &obj) = delete;
+
+  // Record the time of a section
+  void record(const std::string &category, const std::string &name,
+              clock_t::time_point start, clock_t::time_point stop);
+
+  // Return the aggregated times as a JSON object
+  // {category: {name: {"count", "total_time", "min_time", "max_time",
+  // "histogram"}}}. Times are in seconds, and the histogram is a list of
+  // [upper bound, count] pairs for its non-empty bins.
+  json_t summary() const;
+
+  // Write the trace events to a Chrome trace-event JSON file. Throws a
+  // std::runtime_error if the file cannot be written.
+  void write_trace(const std::string &path) const;
+
+  // Return true if profiling is enabled by the QISKIT_AER_PROFILING
+  // environment variable, which enables profiling if it is set to a value
+  // other than "0" or "false"
+  static bool env_enable();
+
+  // Return the trace file set by the QISKIT_AER_PROFILING_TRACE
+  // environment variable, or an empty string if it is not set
+  static std::string env_trace_file();
+
+protected:
+
+  struct Stats {
+    uint_t count = 0;
+    double total = 0.;
+    double min = 0.;
+    double max = 0.;
+    std::vector<uint_t> bins;
+  };
+
+  struct Event {
+    std::string category;
+    std::string name;
+    double start; // microseconds since the profiler was created
+    double duration; // microseconds
+    int thread;
+  };
+
+  // Histogram bins have upper bounds 2^(min_exponent + j) seconds
+  static constexpr int min_exponent = -24;
+  static constexpr int num_bins = 32;
+
+  // Return a small integer id of the calling thread for trace events
+  int thread_id();
+
+  bool trace_;
+  size_t max_events_;
+  clock_t::time_point start_;
+
+  mutable std::mutex mutex_;
+  std::map<std::string, std::map<std::string, Stats>> stats_;
+  std::vector<Event> events_;
+  uint_t dropped_events_ = 0;
+  std::map<std::thread::id, int> threads_;
+};
+
+/*******************************************************************************
+ *
+ * Implementations
+ *
+ ******************************************************************************/
+
+void Profiler::record(const std::string &category, const std::string &name,
+                      clock_t::time_point start, clock_t::time_point stop) {
+  const double seconds = std::chrono::duration<double>(stop - start).count();
+  int bin = 0;
+  if (seconds > 0) {
+    const int exponent = static_cast<int>(std::ceil(std::log2(seconds)));
+    bin = std::min(num_bins - 1, std::max(0, exponent - min_exponent));
+  }
+  std::lock_guard<std::mutex> lock(mutex_);
+  Stats &stats = stats_[category][name];
+  if (stats.count == 0) {
+    stats.min = seconds;
+    stats.max = seconds;
+    stats.bins.assign(num_bins, 0);
+  } else {
+    stats.min = std::min(stats.min, seconds);
+    stats.max = std::max(stats.max, seconds);
+  }
+  stats.count++;
+  stats.total += seconds;
+  stats.bins[bin]++;
+  if (trace_) {
+    if (events_.size() < max_events_) {
+      using micros = std::chrono::duration<double, std::micro>;
+      events_.push_back(Event({category, name,
+                               micros(start - start_).count(),
+                               micros(stop - start).count(),
+                               thread_id()}));
+    } else {
+      dropped_events_++;
+    }
+  }
+}
+
+int Profiler::thread_id() {
+  // Called with the mutex held
+  const auto id = std::this_thread::get_id();
+  auto it = threads_.find(id);
+  if (it != threads_.end())
+    return it->second;
+  const int ret = threads_.size();
+  threads_[id] = ret;
+  return ret;
+}
+
+json_t Profiler::summary() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  json_t ret = json_t::object();
+  for (const auto &category : stats_) {
+    for (const auto &pair : category.second) {
+      const Stats &stats = pair.second;
+      json_t hist = json_t::array();
+      for (int j = 0; j < num_bins; ++j) {
+        if (stats.bins[j] > 0)
+          hist.push_back({std::ldexp(1., min_exponent + j), stats.bins[j]});
+      }
+      json_t &js = ret[category.first][pair.first];
+      js["count"] = stats.count;
+      js["total_time"] = stats.total;
+      js["min_time"] = stats.min;
+      js["max_time"] = stats.max;
+      js["histogram"] = hist;
+    }
+  }
+  if (dropped_events_ > 0)
+    ret["dropped_trace_events"] = dropped_events_;
+  return ret;
+}
+
+void Profiler::write_trace(const std::string &path) const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  std::ofstream file(path);
+  if (!file)
+    throw std::runtime_error("Profiler: unable to open trace file \"" + path + "\"");
+  // Events are written one per line so that large traces are not built
+  // as a single JSON object in memory
+  file << "{\"displayTimeUnit\": \"ms\", \"traceEvents\": [\n";
+  for (size_t j = 0; j < events_.size(); ++j) {
+    const Event &event = events_[j];
+    json_t js;
+    js["name"] = event.name;
+    js["cat"] = event.category;
+    js["ph"] = "X";
+    js["ts"] = event.start;
+    js["dur"] = event.duration;
+    js["pid"] = 0;
+    js["tid"] = event.thread;
+    file << js.dump() << ((j + 1 < events_.size()) ? ",\n" : "\n");
+  }
+  file << "]}\n";
+  if (!file)
+    throw std::runtime_error("Profiler: unable to write trace file \"" + path + "\"");
+}
+
+bool Profiler::env_enable() {
+  const char *value = std::getenv("QISKIT_AER_PROFILING");
+  if (value == nullptr)
+    return false;
+  const std::string str(value);
+  return !(str.empty() || str == "0" || str == "false" || str == "False");
+}
+
+std::string Profiler::env_trace_file() {
+  const char *value = std::getenv("QISKIT_AER_PROFILING_TRACE");
+  return (value == nullptr) ? std::string() : std::string(value);
+}
+
+//------------------------------------------------------------------------------
+} // end namespace AER
+//------------------------------------------------------------------------------
+#endif
@@ -0,0 +1,412 @@
+/**
+ * Copyright 2018, IBM.
+ *
+ * This source code is licensed under the Apache License, Version 2.0 found in
+ * the LICENSE.txt file in the root directory of this source tree.
+ */
+
+#ifndef _aer_framework_python_json_hpp_
+#define _aer_framework_python_json_hpp_
+
+#include <Python.h>
+
+#include <complex>
+#include <cstdint>
+#include <cstring>
+#include <stdexcept>
+#include <string>
+
+#include "framework/json.hpp"
+
+//============================================================================
+// Python object to JSON conversion
+//============================================================================
+
+// These functions are only used by the Python wrappers of the controllers.
+// They convert a Python qobj dictionary directly into a json_t, and a json_t
+// result directly into Python objects, without serializing to a JSON string
+// and parsing it back. The Python GIL must be held when calling them.
+
+namespace JSON {
+
+/**
+ * Convert a Python object to a json_t. Supported types are:
+ * - None, bool, int, float, str and bytes
+ * - complex numbers, which are converted to a list [real(z), imag(z)]
+ * - dict, list and tuple (recursively converted)
+ * - objects supporting the buffer protocol, such as NumPy arrays of bool,
+ *   integer, float or complex types, which are read directly from the
+ *   underlying buffer and converted to (nested) lists
+ * - objects with an as_dict() method, such as Qobj and NoiseModel
+ * - objects with a tolist() method, such as NumPy scalars
+ * @param obj: the Python object to convert.
+ * @returns: the converted json.
+ */
+json_t from_python(PyObject *obj);
+
+/**
+ * Convert a Python object to a json_t.
+ * @param obj: the Python object to convert.
+ * @param js: the json_t to contain the converted object.
+ */
+void from_python(PyObject *obj, json_t &js);
+
+/**
+ * Convert a json_t to a new Python object. JSON objects are converted to
+ * dict, arrays to list, and numbers, strings, booleans and null to the
+ * corresponding Python types.
+ * @param js: the json_t to convert.
+ * @returns: a new reference to the converted Python object.
+ */
+PyObject *to_python(const json_t &js);
+
+} // end namespace JSON
+
+/*******************************************************************************
+ *
+ * Implementations
+ *
+ ******************************************************************************/
+
+namespace JSON {
+namespace Python {
+
+// Raise a C++ exception containing the current Python error message
+inline void throw_error(const std::string &msg,
+                        const std::string &prefix = "Python to JSON") {
+  std::string error = msg;
+  if (PyErr_Occurred()) {
+    PyObject *type, *value, *traceback;
+    PyErr_Fetch(&type, &value, &traceback);
+    if (value != nullptr) {
+      PyObject *str = PyObject_Str(value);
+      if (str != nullptr) {
+        const char *cstr = PyUnicode_AsUTF8(str);
+        if (cstr != nullptr)
+          error += std::string(" (") + cstr + ")";
+        Py_DECREF(str);
+      }
+    }
+    Py_XDECREF(type);
+    Py_XDECREF(value);
+    Py_XDECREF(traceback);
+    PyErr_Clear();
+  }
+  throw std::invalid_argument(prefix + ": " + error);
+}
+
+// Return the type name of a Python object for error messages
+inline std::string type_name(PyObject *obj) {
+  return std::string(Py_TYPE(obj)->tp_name);
+}
+
+// Convert a Python string object to a std::string
+inline std::string to_string(PyObject *obj) {
+  Py_ssize_t size;
+  const char *cstr = PyUnicode_AsUTF8AndSize(obj, &size);
+  if (cstr == nullptr)
+    throw_error("invalid unicode string");
+  return std::string(cstr, size);
+}
+
+// Call a method with no arguments and convert the returned object
+inline void call_and_convert(PyObject *obj, const char *method, json_t &js) {
+  PyObject *ret = PyObject_CallMethod(obj, method, nullptr);
+  if (ret == nullptr)
+    throw_error(type_name(obj) + "." + method + "() failed");
+  try {
+    from_python(ret, js);
+  } catch (...) {
+    Py_DECREF(ret);
+    throw;
+  }
+  Py_DECREF(ret);
+}
+
+// Read a single buffer element of the given struct format code
+template <typename T>
+inline T buffer_value(const char *ptr) {
+  T val;
+  std::memcpy(&val, ptr, sizeof(T));
+  return val;
+}
+
+inline bool buffer_element(const char *ptr, const std::string &fmt,
+                           json_t &js) {
+  if (fmt == "d")
+    js = buffer_value<double>(ptr);
+  else if (fmt == "Zd")
+    js = buffer_value<std::complex<double>>(ptr);
+  else if (fmt == "f")
+    js = buffer_value<float>(ptr);
+  else if (fmt == "Zf")
+    js = buffer_value<std::complex<float>>(ptr);
+  else if (fmt == "?")
+    js = buffer_value<bool>(ptr);
+  else if (fmt == "b")
+    js = buffer_value<signed char>(ptr);
+  else if (fmt == "B")
+    js = buffer_value<unsigned char>(ptr);
+  else if (fmt == "h")
+    js = buffer_value<short>(ptr);
+  else if (fmt == "H")
+    js = buffer_value<unsigned short>(ptr);
+  else if (fmt == "i")
+    js = buffer_value<int>(ptr);
+  else if (fmt == "I")
+    js = buffer_value<unsigned int>(ptr);
+  else if (fmt == "l")
+    js = buffer_value<long>(ptr);
+  else if (fmt == "L")
+    js = buffer_value<unsigned long>(ptr);
+  else if (fmt == "q")
+    js = buffer_value<long long>(ptr);
+  else if (fmt == "Q")
+    js = buffer_value<unsigned long long>(ptr);
+  else if (fmt == "n")
+    js = buffer_value<Py_ssize_t>(ptr);
+  else if (fmt == "N")
+    js = buffer_value<size_t>(ptr);
+  else
+    return false;
+  return true;
+}
+
+// Recursively convert a strided buffer to nested json lists
+inline bool buffer_to_json(const char *ptr, const Py_buffer &view,
+                           const std::string &fmt, int dim, json_t &js) {
+  if (dim == view.ndim)
+    return buffer_element(ptr, fmt, js);
+  const Py_ssize_t size = view.shape[dim];
+  const Py_ssize_t stride = view.strides[dim];
+  js = json_t::array();
+  for (Py_ssize_t j = 0; j < size; ++j) {
+    json_t elt;
+    if (!buffer_to_json(ptr + j * stride, view, fmt, dim + 1, elt))
+      return false;
+    js.push_back(std::move(elt));
+  }
+  return true;
+}
+
+// Convert an object supporting the buffer protocol. Returns false if the
+// buffer element type is not supported.
+inline bool from_buffer(PyObject *obj, json_t &js) {
+  Py_buffer view;
+  if (PyObject_GetBuffer(obj, &view, PyBUF_RECORDS_RO) != 0) {
+    PyErr_Clear();
+    return false;
+  }
+  // Strip native byte-order prefix from the struct format string
+  std::string fmt = (view.format != nullptr) ? view.format : "B";
+  if (!fmt.empty() && (fmt[0] == '@' || fmt[0] == '=' ||
+                       (fmt[0] == '<' && PY_LITTLE_ENDIAN) ||
+                       (fmt[0] == '>' && !PY_LITTLE_ENDIAN)))
+    fmt = fmt.substr(1);
+  bool success = buffer_to_json(static_cast<const char *>(view.buf), view,
+                                fmt, 0, js);
+  PyBuffer_Release(&view);
+  return success;
+}
+
+} // end namespace Python
+} // end namespace JSON
+
+json_t JSON::from_python(PyObject *obj) {
+  json_t js;
+  from_python(obj, js);
+  return js;
+}
+
+void JSON::from_python(PyObject *obj, json_t &js) {
+  // None
+  if (obj == nullptr || obj == Py_None) {
+    js = nullptr;
+    return;
+  }
+  // Bool (must be checked before int)
+  if (PyBool_Check(obj)) {
+    js = (obj == Py_True);
+    return;
+  }
+  // Integer
+  if (PyLong_Check(obj)) {
+    int overflow;
+    long long val = PyLong_AsLongLongAndOverflow(obj, &overflow);
+    if (overflow == 0) {
+      if (val == -1 && PyErr_Occurred())
+        Python::throw_error("invalid integer");
+      js = static_cast<int64_t>(val);
+      return;
+    }
+    unsigned long long uval = PyLong_AsUnsignedLongLong(obj);
+    if (PyErr_Occurred())
+      Python::throw_error("integer too large");
+    js = static_cast<uint64_t>(uval);
+    return;
+  }
+  // Float
+  if (PyFloat_Check(obj)) {
+    js = PyFloat_AS_DOUBLE(obj);
+    return;
+  }
+  // Complex
+  if (PyComplex_Check(obj)) {
+    js = std::complex<double>(PyComplex_RealAsDouble(obj),
+                              PyComplex_ImagAsDouble(obj));
+    return;
+  }
+  // String
+  if (PyUnicode_Check(obj)) {
+    js = Python::to_string(obj);
+    return;
+  }
+  // Bytes
+  if (PyBytes_Check(obj)) {
+    js = std::string(PyBytes_AS_STRING(obj), PyBytes_GET_SIZE(obj));
+    return;
+  }
+  // Dictionary
+  if (PyDict_Check(obj)) {
+    js = json_t::object();
+    PyObject *key, *value;
+    Py_ssize_t pos = 0;
+    while (PyDict_Next(obj, &pos, &key, &value)) {
+      std::string key_str;
+      if (PyUnicode_Check(key)) {
+        key_str = Python::to_string(key);
+      } else {
+        // Non-string keys are converted to strings as in json.dumps
+        PyObject *str = PyObject_Str(key);
+        if (str == nullptr)
+          Python::throw_error("invalid dictionary key");
+        key_str = Python::to_string(str);
+        Py_DECREF(str);
+      }
+      from_python(value, js[key_str]);
+    }
+    return;
+  }
+  // List
+  if (PyList_Check(obj)) {
+    const Py_ssize_t size = PyList_GET_SIZE(obj);
+    js = json_t::array();
+    for (Py_ssize_t j = 0; j < size; ++j) {
+      json_t elt;
+      from_python(PyList_GET_ITEM(obj, j), elt);
+      js.push_back(std::move(elt));
+    }
+    return;
+  }
+  // Tuple
+  if (PyTuple_Check(obj)) {
+    const Py_ssize_t size = PyTuple_GET_SIZE(obj);
+    js = json_t::array();
+    for (Py_ssize_t j = 0; j < size; ++j) {
+      json_t elt;
+      from_python(PyTuple_GET_ITEM(obj, j), elt);
+      js.push_back(std::move(elt));
+    }
+    return;
+  }
+  // Buffers (NumPy arrays)
+  if (PyObject_CheckBuffer(obj) && Python::from_buffer(obj, js))
+    return;
+  // Qiskit models
+  if (PyObject_HasAttrString(obj, "as_dict")) {
+    Python::call_and_convert(obj, "as_dict", js);
+    return;
+  }
+  // NumPy scalars and arrays with unsupported buffer types
+  if (PyObject_HasAttrString(obj, "tolist")) {
+    Python::call_and_convert(obj, "tolist", js);
+    return;
+  }
+  // Other integer-like objects
+  if (PyIndex_Check(obj)) {
+    PyObject *val = PyNumber_Index(obj);
+    if (val == nullptr)
+      Python::throw_error("invalid integer");
+    try {
+      from_python(val, js);
+    } catch (...) {
+      Py_DECREF(val);
+      throw;
+    }
+    Py_DECREF(val);
+    return;
+  }
+  throw std::invalid_argument("Python to JSON: unable to convert object of "
+                              "type \"" + Python::type_name(obj) + "\".");
+}
+
+PyObject *JSON::to_python(const json_t &js) {
+  PyObject *ret = nullptr;
+  switch (js.type()) {
+    case json_t::value_t::null:
+      Py_INCREF(Py_None);
+      return Py_None;
+    case json_t::value_t::boolean:
+      ret = PyBool_FromLong(js.get<bool>());
+      break;
+    case json_t::value_t::number_integer:
+      ret = PyLong_FromLongLong(js.get<int64_t>());
+      break;
+    case json_t::value_t::number_unsigned:
+      ret = PyLong_FromUnsignedLongLong(js.get<uint64_t>());
+      break;
+    case json_t::value_t::number_float:
+      ret = PyFloat_FromDouble(js.get<double>());
+      break;
+    case json_t::value_t::string: {
+      const auto &str = js.get_ref<const std::string&>();
+      ret = PyUnicode_FromStringAndSize(str.data(), str.size());
+    } break;
+    case json_t::value_t::array: {
+      ret = PyList_New(js.size());
+      if (ret == nullptr)
+        break;
+      Py_ssize_t pos = 0;
+      for (const auto &elt : js) {
+        PyObject *item;
+        try {
+          item = to_python(elt);
+        } catch (...) {
+          Py_DECREF(ret);
+          throw;
+        }
+        PyList_SET_ITEM(ret, pos++, item); // steals reference
+      }
+    } break;
+    case json_t::value_t::object: {
+      ret = PyDict_New();
+      if (ret == nullptr)
+        break;
+      for (auto it = js.begin(); it != js.end(); ++it) {
+        PyObject *item;
+        try {
+          item = to_python(it.value());
+        } catch (...) {
+          Py_DECREF(ret);
+          throw;
+        }
+        int status = PyDict_SetItemString(ret, it.key().c_str(), item);
+        Py_DECREF(item);
+        if (status != 0) {
+          Py_DECREF(ret);
+          Python::throw_error("failed to set dictionary item", "JSON to Python");
+        }
+      }
+    } break;
+    default:
+      throw std::invalid_argument("JSON to Python: unable to convert JSON "
+                                  "value of type \"" +
+                                  std::string(js.type_name()) + "\".");
+  }
+  if (ret == nullptr)
+    Python::throw_error("failed to create Python object", "JSON to Python");
+  return ret;
+}
+
+//------------------------------------------------------------------------------
+#endif
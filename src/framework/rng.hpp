@@ -24,6 +24,12 @@ namespace AER {
   * are used to decide outcomes of measurements and resets, and for implementing
   * noise.
   *
+  * Random numbers are generated by the counter-based Philox4x32-10 generator.
+  * The seed is the key of the generator, and each key has 2^64 independent
+  * streams of random numbers selected by `set_stream`. Shots of a circuit
+  * each use their own stream so that their outcomes do not depend on how
+  * the shots are divided between threads.
+  *
   ******************************************************************************/
 
 class RngEngine {
@@ -50,7 +56,15 @@ public:
    * interval [0,1)
    * @return the generated double
    */
-  inline double rand() { return rand(0, 1); };
+  inline double rand() { return to_double(next()); };
+
+  /**
+   * Fill a vector with uniformly distributed pseudo random reals in the
+   * half-open interval [0,1). This generates the same values as calling
+   * rand() for each entry.
+   * @param values the vector to fill
+   */
+  void rand(std::vector<double> &values);
 
   /**
    * Generate a uniformly distributed pseudo random integer in the closed
@@ -66,7 +80,7 @@ public:
    * Generate a pseudo random integer from a a discrete distribution
    * constructed from an input vector of probabilities for [0,..,n-1]
    * where n is the lenght of the vector. If this vector is not normalized
-   * it will be scaled when it is converted to a discrete_distribution
+   * it will be scaled as a discrete distribution
    * @param probs the vector of probabilities
    * @return the generated integer
    */
@@ -77,21 +91,53 @@ public:
    */
   RngEngine() {
     std::random_device rd;
-    rng.seed(rd());
+    set_seed(rd());
   };
 
   /**
    * Seeded constructor initialize RNG engine with a fixed seed
-   * @param seed integer to use as seed for mt19937 engine
+   * @param seed integer to use as seed for the Philox engine
    */
-  explicit RngEngine(uint_t seed) { rng.seed(seed); };
+  explicit RngEngine(uint_t seed) { set_seed(seed); };
 
 
-  // Set a fixed seed for the RNG engine
-  void set_seed(uint_t seed) { rng.seed(seed); };
+  // Set a fixed seed for the RNG engine and select stream 0
+  void set_seed(uint_t seed) {
+    key_ = seed;
+    set_stream(0);
+  };
+
+  // Restart the RNG engine at the beginning of one of the independent
+  // streams of random numbers of its seed
+  void set_stream(uint_t stream) {
+    stream_ = stream;
+    block_ = 0;
+    buffered_ = 0;
+  };
 
 private:
-  std::mt19937 rng; // Mersenne twister rng engine
+  // Return the next 64 random bits of the current stream
+  inline uint64_t next() {
+    if (buffered_ == 0) {
+      generate_block(block_++, buffer_);
+      buffered_ = 2;
+    }
+    return buffer_[--buffered_];
+  }
+
+  // Convert 64 random bits to a double in the half-open interval [0,1)
+  static inline double to_double(uint64_t bits) {
+    return (bits >> 11) * (1. / 9007199254740992.);
+  }
+
+  // Generate the two 64-bit outputs of a block of the current stream
+  void generate_block(uint64_t block, uint64_t *out) const;
+
+  uint64_t key_ = 0;     // Philox key (seed)
+  uint64_t stream_ = 0;  // Stream selected by the high counter words
+  uint64_t block_ = 0;   // Next block of the stream
+  uint64_t buffer_[2];   // Unused outputs of the last block
+  unsigned buffered_ = 0;
 };
 
 /*******************************************************************************
@@ -100,26 +146,80 @@ private:
  *
  ******************************************************************************/
 
+void RngEngine::generate_block(uint64_t block, uint64_t *out) const {
+  // Philox4x32-10 (Salmon et al., "Parallel random numbers: as easy as
+  // 1, 2, 3", SC11) with a 128-bit counter of (block, stream)
+  const uint32_t M0 = 0xD2511F53, M1 = 0xCD9E8D57;
+  const uint32_t W0 = 0x9E3779B9, W1 = 0xBB67AE85;
+  uint32_t c0 = static_cast<uint32_t>(block);
+  uint32_t c1 = static_cast<uint32_t>(block >> 32);
+  uint32_t c2 = static_cast<uint32_t>(stream_);
+  uint32_t c3 = static_cast<uint32_t>(stream_ >> 32);
+  uint32_t k0 = static_cast<uint32_t>(key_);
+  uint32_t k1 = static_cast<uint32_t>(key_ >> 32);
+  for (int round = 0; round < 10; ++round) {
+    const uint64_t p0 = static_cast<uint64_t>(M0) * c0;
+    const uint64_t p1 = static_cast<uint64_t>(M1) * c2;
+    const uint32_t hi0 = static_cast<uint32_t>(p0 >> 32);
+    const uint32_t lo0 = static_cast<uint32_t>(p0);
+    const uint32_t hi1 = static_cast<uint32_t>(p1 >> 32);
+    const uint32_t lo1 = static_cast<uint32_t>(p1);
+    c0 = hi1 ^ c1 ^ k0;
+    c1 = lo1;
+    c2 = hi0 ^ c3 ^ k1;
+    c3 = lo0;
+    k0 += W0;
+    k1 += W1;
+  }
+  out[0] = (static_cast<uint64_t>(c1) << 32) | c0;
+  out[1] = (static_cast<uint64_t>(c3) << 32) | c2;
+}
+
 double RngEngine::rand(double a, double b) {
-  double p = std::uniform_real_distribution<double>(a, b)(rng);
-  return p;
+  return a + (b - a) * rand();
+}
+
+void RngEngine::rand(std::vector<double> &values) {
+  for (auto &val : values)
+    val = rand();
 }
 
 // randomly distributed integers in [a,b]
 int_t RngEngine::rand_int(int_t a, int_t b) {
-  int_t n = std::uniform_int_distribution<int_t>(a, b)(rng);
-  return n;
+  return a + static_cast<int_t>(rand_int(uint_t(0), static_cast<uint_t>(b - a)));
 }
 
 uint_t RngEngine::rand_int(uint_t a, uint_t b) {
-  int_t n = std::uniform_int_distribution<uint_t>(a, b)(rng);
-  return n;
+  const uint64_t range = static_cast<uint64_t>(b - a) + 1;
+  // The full 64-bit range
+  if (range == 0)
+    return a + next();
+  // Reject the values above the largest multiple of the range to avoid bias
+  const uint64_t limit = UINT64_MAX - UINT64_MAX % range;
+  uint64_t bits = next();
+  while (bits >= limit)
+    bits = next();
+  return a + bits % range;
 }
 
 // randomly distributed integers from vector
 uint_t RngEngine::rand_int(const std::vector<double> &probs) {
-  uint_t n = std::discrete_distribution<uint_t>(probs.begin(), probs.end())(rng);
-  return n;
+  double total = 0.;
+  for (const auto &p : probs)
+    total += p;
+  const double r = rand(0., total);
+  double accum = 0.;
+  uint_t last = 0;
+  for (uint_t n = 0; n < probs.size(); ++n) {
+    if (probs[n] <= 0.)
+      continue;
+    accum += probs[n];
+    if (r < accum)
+      return n;
+    last = n;
+  }
+  // Rounding may leave r at the total, which belongs to the last outcome
+  return last;
 }
 
 //------------------------------------------------------------------------------
@@ -46,6 +46,9 @@ public:
   // Return true if snapshot container is empty
   inline bool empty() const {return data_.empty();}
 
+  // Return the approximate memory used by the snapshot data in bytes
+  size_t memory_bytes() const;
+
 private:
 
   // Internal Storage
@@ -83,6 +86,11 @@ public:
   // This clears the values of the combined rhs argument
   void combine(AverageData &rhs);
 
+  // Return the approximate memory used by the accumulated data in bytes
+  size_t memory_bytes() const {
+    return JSON::memory_bytes(accum_) + JSON::memory_bytes(accum_squared_);
+  }
+
 protected:
 
   json_t accum_; // stores the accumulated data for multiple datum
@@ -140,6 +148,9 @@ public:
   // Return true if snapshot container is empty
   inline bool empty() const {return data_.empty();}
 
+  // Return the approximate memory used by the snapshot data in bytes
+  size_t memory_bytes() const;
+
 protected:
 
   // Internal Storage
@@ -165,6 +176,17 @@ void SingleShotSnapshot::combine(SingleShotSnapshot &snapshot) {
 }
 
 
+size_t SingleShotSnapshot::memory_bytes() const {
+  size_t bytes = 0;
+  for (const auto &pair : data_) {
+    bytes += pair.first.capacity();
+    for (const auto &datum : pair.second)
+      bytes += JSON::memory_bytes(datum);
+  }
+  return bytes;
+}
+
+
 json_t SingleShotSnapshot::json() const {
   json_t result;
   for (const auto &pair : data_) {
@@ -188,6 +210,17 @@ void AverageSnapshot::combine(AverageSnapshot &snapshot) {
 }
 
 
+size_t AverageSnapshot::memory_bytes() const {
+  size_t bytes = 0;
+  for (const auto &outer_pair : data_) {
+    bytes += outer_pair.first.capacity();
+    for (const auto &inner_pair : outer_pair.second)
+      bytes += inner_pair.first.capacity() + inner_pair.second.memory_bytes();
+  }
+  return bytes;
+}
+
+
 json_t AverageSnapshot::json() const {
   json_t result;
   for (const auto &outer_pair : data_) {
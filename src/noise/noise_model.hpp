@@ -33,20 +33,89 @@ namespace Noise {
 // in the operation) or nonlocal (applied to different qubits). The errors
 // may each also be applied either before or after the operation as per
 // the specification of the AbstractError subclass.
+//
+// The errors of the operations of a circuit are resolved once from the
+// noise model tables by `compile`, which maps gate names to integer ids
+// and looks up the qubits of each operation. Noise samples of the
+// compiled circuit then do no table lookups or string operations. The
+// random numbers of a noise sample are drawn in one batch, and each error
+// outcome is found from one of them in the cumulative probability table
+// of the error.
 
 class NoiseModel {
+private:
+
+  // Lookup table for gate strings to enum
+  enum class WaltzGate {id, x, y, z, h, s, sdg, t, tdg, u0, u1, u2, u3};
+
 public:
 
   using NoiseOps = std::vector<Operations::Op>;
 
+  // Positions of quantum errors in the noise model and the qubits they are
+  // applied to, in the order they are sampled
+  using ErrorList = std::vector<std::pair<size_t, reg_t>>;
+
+  // Errors of an operation of a circuit
+  struct OpNoise {
+    bool noisy = false;             // Noise is sampled for the op
+    bool waltz = false;             // The op is an X90 based Waltz gate
+    WaltzGate waltz_gate = WaltzGate::id;
+    ErrorList quantum_errors;       // Quantum errors of the op
+    Operations::Op x90;             // X90 pulse of a Waltz gate
+    ErrorList x90_errors;           // Quantum errors of the X90 pulse
+    NoiseOps readout_ops;           // Readout error ops of a measure op
+    double ideal_probability = 1.;  // Probability of ideal quantum noise
+    size_t draws = 0;               // Random numbers used by a noise sample
+  };
+
+  // Errors of the operations of a circuit, resolved by compile.
+  // The ideal probability is the probability that a noise sample has no
+  // quantum errors, or only identity errors, so that it is the circuit with
+  // only the readout errors of its measurements. It is 0 if the circuit
+  // contains noise switches, since noise samples are then never ideal.
+  struct CircuitNoise {
+    std::vector<OpNoise> ops;
+    double ideal_probability = 1.;  // Probability of ideal quantum noise
+    bool readout_errors = false;    // Some measure ops have readout errors
+    size_t draws = 0;               // Random numbers used by a noise sample
+  };
+
   NoiseModel() = default;
   NoiseModel(const json_t &js) {load_from_json(js);}
 
+  // Resolve the errors of each operation of a circuit
+  CircuitNoise compile(const Circuit &circ) const;
+
   // Sample a noisy implementation of a full circuit
   // An RngEngine is passed in as a reference so that sampling
   // can be done in a thread-safe manner
   Circuit sample_noise(const Circuit &circ, RngEngine &rng) const;
 
+  // Sample a noisy implementation of a full circuit, and set ideal_ops to
+  // the number of leading ops of the circuit that were sampled without
+  // errors, or only with identity errors. The noisy circuit starts with
+  // these ops unchanged.
+  Circuit sample_noise(const Circuit &circ, RngEngine &rng,
+                       size_t &ideal_ops) const;
+
+  // Sample a noisy implementation of a compiled circuit
+  Circuit sample_noise(const Circuit &circ, const CircuitNoise &noise,
+                       RngEngine &rng, size_t &ideal_ops) const;
+
+  // Sample a noisy implementation of a compiled circuit conditioned on its
+  // quantum errors not being ideal. The ideal probability of the circuit
+  // must be less than 1, and the circuit must not have noisy Waltz gates
+  // (whose ideal probability of 0 makes that of the circuit 0).
+  Circuit sample_noise_with_error(const Circuit &circ,
+                                  const CircuitNoise &noise,
+                                  RngEngine &rng,
+                                  size_t &ideal_ops) const;
+
+  // Return the noisy implementation of a compiled circuit when its quantum
+  // errors are ideal, which adds the readout errors of its measurements
+  Circuit readout_noise(const Circuit &circ, const CircuitNoise &noise) const;
+
   // Load a noise model from JSON
   void load_from_json(const json_t &js);
 
@@ -55,11 +124,11 @@ public:
                          const stringset_t &op_labels,
                          const std::vector<reg_t> &op_qubits = {},
                          const std::vector<reg_t> &noise_qubits = {});
-  
+
   // Add a ReadoutError to the noise model
   void add_readout_error(const ReadoutError &error,
                          const std::vector<reg_t> &op_qubits = {});
-  
+
   // Return true if the noise model is ideal
   inline bool ideal() const {
     return !(local_quantum_errors_ || nonlocal_quantum_errors_) && readout_errors_.empty();
@@ -81,36 +150,64 @@ public:
 
 private:
 
-  // Sample noise for the current operation
-  NoiseOps sample_noise(const Operations::Op &op, RngEngine &rng) const;
-
-  // Sample noise for the current operation
-  void sample_readout_noise(const Operations::Op &op,
-                            NoiseOps &noise_after,
-                            RngEngine &rng)  const;
-
-  void sample_local_quantum_noise(const Operations::Op &op,
-                                  NoiseOps &noise_before,
-                                  NoiseOps &noise_after,
-                                  RngEngine &rng)  const;
-
-  void sample_nonlocal_quantum_noise(const Operations::Op &op,
-                                     NoiseOps &noise_before,
-                                     NoiseOps &noise_after,
-                                     RngEngine &rng)  const;
-
-  // Sample noise for the current operation
-  NoiseOps sample_noise_helper(const Operations::Op &op,
-                               RngEngine &rng) const;
-
-  // Sample a noisy implementation of a two-X90 pulse u3 gate
-  NoiseOps sample_noise_x90_u3(uint_t qubit, complex_t theta,
-                               complex_t phi, complex_t lamba,
-                               RngEngine &rng) const;
-  
-  // Sample a noisy implementation of a single-X90 pulse u2 gate
-  NoiseOps sample_noise_x90_u2(uint_t qubit, complex_t phi, complex_t lambda,
-                               RngEngine &rng) const;
+  // Resolve the errors of an operation
+  OpNoise compile(const Operations::Op &op) const;
+
+  // Append the quantum errors of an operation
+  void quantum_errors(const Operations::Op &op, ErrorList &errors) const;
+
+  // Append the readout error ops of a measure operation
+  void readout_noise(const Operations::Op &op, NoiseOps &noise_ops) const;
+
+  // Append a noisy implementation of an operation sampled with the
+  // random numbers rnds
+  void sample_noise(const Operations::Op &op, const OpNoise &noise,
+                    const double *rnds, NoiseOps &ops) const;
+
+  // Append an operation with the noise of its quantum errors sampled with
+  // the random numbers rnds
+  void sample_quantum_noise(const Operations::Op &op,
+                            const ErrorList &errors,
+                            const double *rnds, NoiseOps &ops) const;
+
+  // Append a noisy implementation of an operation conditioned on it not
+  // being ideal
+  void sample_noise_with_error(const Operations::Op &op,
+                               const OpNoise &noise,
+                               RngEngine &rng, NoiseOps &ops) const;
+
+  // Add the ops of an outcome of a quantum error before or after the
+  // operation at position op_pos of ops, and update op_pos
+  static void add_error_ops(const QuantumError &error, uint_t outcome,
+                            const reg_t &qubits,
+                            NoiseOps &ops, size_t &op_pos);
+
+  // Return the index of the first of a sequence of independent events that
+  // is not ideal, conditioned on some event not being ideal, given the
+  // probability ideal_prob that all events are ideal. prob(item) returns
+  // the probability that an event is ideal.
+  template <class T, class Prob>
+  static size_t sample_first_error(const std::vector<T> &items, Prob prob,
+                                   double ideal_prob, RngEngine &rng);
+
+  // Return true if noise is sampled for an operation type
+  static bool has_noise(Operations::OpType type);
+
+  // Return true if the ops from position pos are the operation itself with
+  // only identity errors
+  bool ideal_sample(const NoiseOps &ops, size_t pos,
+                    const Operations::Op &op) const;
+
+  // Append a noisy implementation of a two-X90 pulse u3 gate
+  void sample_noise_x90_u3(uint_t qubit, complex_t theta,
+                           complex_t phi, complex_t lamba,
+                           const OpNoise &noise,
+                           const double *rnds, NoiseOps &ops) const;
+
+  // Append a noisy implementation of a single-X90 pulse u2 gate
+  void sample_noise_x90_u2(uint_t qubit, complex_t phi, complex_t lambda,
+                           const OpNoise &noise,
+                           const double *rnds, NoiseOps &ops) const;
 
   // Add a local quantum error to the noise model for specific qubits
   void add_local_quantum_error(const QuantumError &error,
@@ -123,6 +220,10 @@ private:
                                   const std::vector<reg_t> &op_qubits,
                                   const std::vector<reg_t> &noise_qubits);
 
+  // Return the id of a gate name in the error tables, adding it to the
+  // tables if it is not present
+  size_t gate_id(const std::string &name);
+
   // Flags which say whether the local or nonlocal error tables are used
   bool local_quantum_errors_ = false;
   bool nonlocal_quantum_errors_ = false;
@@ -133,28 +234,27 @@ private:
   // List of readout errors
   std::vector<ReadoutError> readout_errors_;
 
-  using inner_table_t = stringmap_t<std::vector<size_t>>;
-  using outer_table_t = stringmap_t<inner_table_t>;
+  // Table from qubits to the positions of their errors. Default errors for
+  // all qubits are stored under the empty qubits key.
+  using qubit_table_t = std::map<reg_t, std::vector<size_t>>;
+
+  // Ids of the gate names of the quantum error tables
+  stringmap_t<size_t> gate_ids_;
 
-  // Table indexes a name with a vector of the position of noise operations
-  inner_table_t readout_error_table_;
-  outer_table_t local_quantum_error_table_;
+  // Readout error table
+  qubit_table_t readout_error_table_;
 
-  // Nonlocal noise lookup table. Things get messy here...
-  // the outer map is a table from gate strings to gate qubit maps
-  // the gate qubit map is a map from qubits to another map of target qubits
-  // which is then the final qubit map from target qubits to error_ptr positions
-  stringmap_t<outer_table_t> nonlocal_quantum_error_table_;
+  // Local quantum error tables indexed by gate id
+  std::vector<qubit_table_t> local_quantum_error_table_;
 
-  // Helper function to convert reg to string for key of unordered maps/sets
-  std::string reg2string(const reg_t &reg) const;
-  reg_t string2reg(std::string s) const;
+  // Nonlocal quantum error tables indexed by gate id. Each table maps the
+  // gate qubits to a table from the noise qubits to error positions.
+  std::vector<std::map<reg_t, qubit_table_t>> nonlocal_quantum_error_table_;
 
   // Table of single-qubit gates to use a Waltz X90 based error model
   stringset_t x90_gates_;
 
   // Lookup table for gate strings to enum
-  enum class WaltzGate {id, x, y, z, h, s, sdg, t, tdg, u0, u1, u2, u3};
   const static stringmap_t<WaltzGate> waltz_gate_table_;
 
   // waltz threshold for applying u1 rotations if |theta - 2n*pi | > threshold
@@ -169,80 +269,466 @@ private:
 // Noise Model class
 //=========================================================================
 
-NoiseModel::NoiseOps NoiseModel::sample_noise(const Operations::Op &op,
-                                              RngEngine &rng) const {
-  // Look to see if gate is a waltz gate for this error model
-  auto it = x90_gates_.find(op.name);
-  if (it == x90_gates_.end()) {
-    // Non-X90 based gate, run according to base model
-    return sample_noise_helper(op, rng);
+NoiseModel::CircuitNoise NoiseModel::compile(const Circuit &circ) const {
+  CircuitNoise noise;
+  noise.ops.reserve(circ.ops.size());
+  for (const auto &op : circ.ops) {
+    noise.ops.push_back(compile(op));
+    noise.ideal_probability *= noise.ops.back().ideal_probability;
+    noise.readout_errors |= !noise.ops.back().readout_ops.empty();
+    noise.draws += noise.ops.back().draws;
+  }
+  return noise;
+}
+
+
+NoiseModel::OpNoise NoiseModel::compile(const Operations::Op &op) const {
+  OpNoise noise;
+  if (!has_noise(op.type)) {
+    // Noise samples of circuits with noise switches are not ideal
+    if (op.type == Operations::OpType::noise_switch)
+      noise.ideal_probability = 0.;
+    return noise;
   }
-  // Decompose ops in terms of their waltz implementation
-  auto gate = waltz_gate_table_.find(op.name);
-  if (gate != waltz_gate_table_.end()) {
-    switch (gate->second) {
+  // Look to see if gate is a waltz gate for this error model
+  if (x90_gates_.find(op.name) != x90_gates_.end()) {
+    // Decompose ops in terms of their waltz implementation
+    auto gate = waltz_gate_table_.find(op.name);
+    if (gate == waltz_gate_table_.end()) {
+      // something went wrong if we end up here
+      throw std::invalid_argument("Invalid waltz gate.");
+    }
+    noise.noisy = true;
+    noise.waltz = true;
+    noise.waltz_gate = gate->second;
+    noise.x90 = Operations::make_mat({op.qubits[0]}, Utils::Matrix::X90, "x90");
+    quantum_errors(noise.x90, noise.x90_errors);
+    switch (noise.waltz_gate) {
       case WaltzGate::u3:
-        return sample_noise_x90_u3(op.qubits[0], op.params[0], op.params[1], op.params[2], rng);
-      case WaltzGate::u2:
-        return sample_noise_x90_u2(op.qubits[0], op.params[0], op.params[1], rng);
       case WaltzGate::x:
-        return sample_noise_x90_u3(op.qubits[0], M_PI, 0., M_PI, rng);
       case WaltzGate::y:
-        return sample_noise_x90_u3(op.qubits[0],  M_PI, 0.5 * M_PI, 0.5 * M_PI, rng);
+        // Sampled as a sequence of u1 and two X90 ops
+        noise.ideal_probability = 0.;
+        noise.draws = 2 * noise.x90_errors.size();
+        break;
+      case WaltzGate::u2:
       case WaltzGate::h:
-        return sample_noise_x90_u2(op.qubits[0], 0., M_PI, rng);
+        // Sampled as a sequence of u1 and one X90 op
+        noise.ideal_probability = 0.;
+        noise.draws = noise.x90_errors.size();
+        break;
       default:
         // The rest of the Waltz operations are noise free (u1 only)
-        return {op};
+        break;
+    }
+    return noise;
+  }
+  quantum_errors(op, noise.quantum_errors);
+  if (op.type == Operations::OpType::measure)
+    readout_noise(op, noise.readout_ops);
+  noise.noisy = !(noise.quantum_errors.empty() && noise.readout_ops.empty());
+  noise.draws = noise.quantum_errors.size();
+  for (const auto &error : noise.quantum_errors)
+    noise.ideal_probability *= quantum_errors_[error.first].ideal_probability();
+  return noise;
+}
+
+
+void NoiseModel::quantum_errors(const Operations::Op &op,
+                                ErrorList &errors) const {
+  // Get op name, or label if it is a matrix
+  const std::string &name = (op.type == Operations::OpType::matrix)
+    ? op.string_params[0]
+    : op.name;
+  auto iter = gate_ids_.find(name);
+  if (iter == gate_ids_.end())
+    return;
+  const size_t id = iter->second;
+
+  // Check if op is a measure or reset
+  bool is_measure_or_reset = (op.type == Operations::OpType::measure ||
+                              op.type == Operations::OpType::reset);
+
+  // Apply local errors first
+  if (local_quantum_errors_) {
+    const auto &qubit_map = local_quantum_error_table_[id];
+    // Get the default qubit model in case a specific qubit model is not found
+    // The default model is stored under the empty qubits key
+    auto iter_default = qubit_map.find(reg_t());
+    // Format qubit sets
+    std::vector<reg_t> qubit_keys;
+    if (is_measure_or_reset && qubit_map.find(op.qubits) == qubit_map.end()) {
+      // Since measure and reset ops can be defined on multiple qubits
+      // but error model may be specified only on single qubits we add
+      // each one separately. If a multi-qubit model is found for specified
+      // qubits however, that will be used instead.
+      for (const auto &q : op.qubits)
+        qubit_keys.push_back({q});
+    } else {
+      // for gate operations we use the qubits as specified
+      qubit_keys.push_back(op.qubits);
+    }
+    for (const auto &qubits : qubit_keys) {
+      auto iter_qubits = qubit_map.find(qubits);
+      if (iter_qubits != qubit_map.end() ||
+          iter_default != qubit_map.end()) {
+        auto &error_positions = (iter_qubits != qubit_map.end())
+          ? iter_qubits->second
+          : iter_default->second;
+        for (auto &pos : error_positions)
+          errors.push_back(std::make_pair(pos, qubits));
+      }
+    }
+  }
+
+  // Apply nonlocal errors second
+  if (nonlocal_quantum_errors_) {
+    const auto &qubit_map = nonlocal_quantum_error_table_[id];
+    // Format qubit sets
+    std::vector<reg_t> qubit_keys;
+    if (is_measure_or_reset && qubit_map.find(op.qubits) == qubit_map.end()) {
+      for (const auto &q : op.qubits)
+        qubit_keys.push_back({q});
+    } else {
+      qubit_keys.push_back(op.qubits);
+    }
+    for (const auto &qubits : qubit_keys) {
+      // Check if the qubits are listed in the inner model
+      auto iter_qubits = qubit_map.find(qubits);
+      if (iter_qubits != qubit_map.end()) {
+        for (auto &target_pair : iter_qubits->second) {
+          for (auto &pos : target_pair.second)
+            errors.push_back(std::make_pair(pos, target_pair.first));
+        }
+      }
+    }
+  }
+}
+
+
+void NoiseModel::readout_noise(const Operations::Op &op,
+                               NoiseOps &noise_ops) const {
+  // If no readout errors are defined pass
+  if (readout_errors_.empty()) {
+    return;
+  }
+  // Check if measure op writes only to memory, or also to registers
+  // We will use the same error model for both memory and registers
+  bool has_registers = !op.registers.empty();
+
+  // Check if the qubits are listed in the readout error model
+  auto iter_default = readout_error_table_.find(reg_t());
+
+  // Format qubit sets
+  std::vector<reg_t> qubit_keys;
+  std::vector<reg_t> memory_sets, registers_sets;
+  if (readout_error_table_.find(op.qubits) == readout_error_table_.end()) {
+    // Since measure can be defined on multiple qubits
+    // but error model may be specified only on single qubits we add
+    // each one separately. If a multi-qubit model is found for specified
+    // qubits however, that will be used instead.
+    for (const auto &q : op.qubits) {
+      qubit_keys.push_back({q});
+    }
+    // Add the classical register sets for measure ops
+    for (const auto &q : op.memory) {
+      memory_sets.push_back({q});
+    }
+    if (has_registers) {
+      for (const auto &q : op.registers) {
+        registers_sets.push_back({q});
+      }
     }
   } else {
-    // something went wrong if we end up here
-    throw std::invalid_argument("Invalid waltz gate.");
+    // for gate operations we use the qubits as specified
+    qubit_keys.push_back(op.qubits);
+    memory_sets.push_back(op.memory);
+    if (has_registers)
+      registers_sets.push_back(op.registers);
+  }
+  // Iterate over qubits
+  for (size_t qs=0; qs < qubit_keys.size(); ++qs) {
+    auto iter_qubits = readout_error_table_.find(qubit_keys[qs]);
+    if (iter_qubits != readout_error_table_.end() ||
+        iter_default != readout_error_table_.end()) {
+      auto &error_positions = (iter_qubits != readout_error_table_.end())
+        ? iter_qubits->second
+        : iter_default->second;
+      for (auto &pos : error_positions) {
+        // Readout errors are applied by the State with its rng, so the
+        // op does not depend on an rng
+        auto noise_op = readout_errors_[pos].readout_op(memory_sets[qs]);
+        if (has_registers)
+          noise_op.registers = registers_sets[qs];
+        // Add noise after the error
+        noise_ops.push_back(std::move(noise_op));
+      }
+    }
+  }
+}
+
+
+bool NoiseModel::has_noise(Operations::OpType type) {
+  switch (type) {
+    // Operations that cannot have noise
+    case Operations::OpType::barrier:
+    case Operations::OpType::snapshot:
+    case Operations::OpType::kraus:
+    case Operations::OpType::roerror:
+    case Operations::OpType::bfunc:
+    case Operations::OpType::noise_switch:
+      return false;
+    default:
+      return true;
   }
 }
 
 
 Circuit NoiseModel::sample_noise(const Circuit &circ, RngEngine &rng) const {
+  size_t ideal_ops;
+  return sample_noise(circ, compile(circ), rng, ideal_ops);
+}
+
+
+Circuit NoiseModel::sample_noise(const Circuit &circ, RngEngine &rng,
+                                 size_t &ideal_ops) const {
+  return sample_noise(circ, compile(circ), rng, ideal_ops);
+}
+
+
+Circuit NoiseModel::sample_noise(const Circuit &circ,
+                                 const CircuitNoise &noise,
+                                 RngEngine &rng,
+                                 size_t &ideal_ops) const {
     bool noise_active = true; // set noise active to on-state
+    bool ideal = true; // the ops sampled so far are ideal
+    ideal_ops = 0;
     Circuit noisy_circ = circ; // copy input circuit
     noisy_circ.measure_sampling_flag = false; // disable measurement opt flag
     noisy_circ.ops.clear(); // delete ops
     noisy_circ.ops.reserve(2 * circ.ops.size()); // just to be safe?
+    // Draw the random numbers of all ops
+    std::vector<double> rnds(noise.draws);
+    rng.rand(rnds);
+    const double *rnd = rnds.data();
     // Sample a noisy realization of the circuit
-    for (const auto &op: circ.ops) {
-      switch (op.type) {
+    for (size_t j = 0; j < circ.ops.size(); ++j) {
+      const auto &op = circ.ops[j];
+      if (op.type == Operations::OpType::noise_switch) {
+        // Switch noise on or off during current circuit sample
+        noise_active = static_cast<int>(std::real(op.params[0]));
+        ideal = false;
+      } else if (!has_noise(op.type)) {
         // Operations that cannot have noise
-        case Operations::OpType::barrier:
-          noisy_circ.ops.push_back(op);
-          break;
-        case Operations::OpType::snapshot:
-          noisy_circ.ops.push_back(op);
-          break;
-        case Operations::OpType::kraus:
-          noisy_circ.ops.push_back(op);
-          break;
-        case Operations::OpType::roerror:
-          noisy_circ.ops.push_back(op);
-          break;
-        case Operations::OpType::bfunc:
+        noisy_circ.ops.push_back(op);
+      } else if (noise_active) {
+        const size_t pos = noisy_circ.ops.size();
+        sample_noise(op, noise.ops[j], rnd, noisy_circ.ops);
+        // Identity errors are dropped from the ideal ops so that the
+        // noisy circuit starts with the same ops as the circuit
+        ideal = ideal && ideal_sample(noisy_circ.ops, pos, op);
+        if (ideal) {
+          noisy_circ.ops.resize(pos);
           noisy_circ.ops.push_back(op);
-          break;
-        // Switch noise on or off during current circuit sample
-        case Operations::OpType::noise_switch:
-          noise_active = static_cast<int>(std::real(op.params[0]));
-          break;
-        default:
-          if (noise_active) {
-            NoiseOps noisy_op = sample_noise(op, rng);
-            noisy_circ.ops.insert(noisy_circ.ops.end(), noisy_op.begin(), noisy_op.end());
-          }
-          break;
+        }
       }
+      if (ideal)
+        ideal_ops++;
+      rnd += noise.ops[j].draws;
     }
     return noisy_circ;
 }
 
 
+void NoiseModel::sample_noise(const Operations::Op &op,
+                              const OpNoise &noise,
+                              const double *rnds,
+                              NoiseOps &ops) const {
+  if (!noise.noisy) {
+    ops.push_back(op);
+    return;
+  }
+  if (!noise.waltz) {
+    // Non-X90 based gate, run according to base model
+    sample_quantum_noise(op, noise.quantum_errors, rnds, ops);
+    ops.insert(ops.end(), noise.readout_ops.begin(), noise.readout_ops.end());
+    return;
+  }
+  switch (noise.waltz_gate) {
+    case WaltzGate::u3:
+      sample_noise_x90_u3(op.qubits[0], op.params[0], op.params[1], op.params[2], noise, rnds, ops);
+      break;
+    case WaltzGate::u2:
+      sample_noise_x90_u2(op.qubits[0], op.params[0], op.params[1], noise, rnds, ops);
+      break;
+    case WaltzGate::x:
+      sample_noise_x90_u3(op.qubits[0], M_PI, 0., M_PI, noise, rnds, ops);
+      break;
+    case WaltzGate::y:
+      sample_noise_x90_u3(op.qubits[0],  M_PI, 0.5 * M_PI, 0.5 * M_PI, noise, rnds, ops);
+      break;
+    case WaltzGate::h:
+      sample_noise_x90_u2(op.qubits[0], 0., M_PI, noise, rnds, ops);
+      break;
+    default:
+      // The rest of the Waltz operations are noise free (u1 only)
+      ops.push_back(op);
+      break;
+  }
+}
+
+
+void NoiseModel::sample_quantum_noise(const Operations::Op &op,
+                                      const ErrorList &errors,
+                                      const double *rnds,
+                                      NoiseOps &ops) const {
+  size_t op_pos = ops.size();
+  ops.push_back(op);
+  for (size_t j = 0; j < errors.size(); ++j) {
+    const QuantumError &error = quantum_errors_[errors[j].first];
+    add_error_ops(error, error.sample_outcome(rnds[j]), errors[j].second,
+                  ops, op_pos);
+  }
+}
+
+
+void NoiseModel::add_error_ops(const QuantumError &error, uint_t outcome,
+                               const reg_t &qubits,
+                               NoiseOps &ops, size_t &op_pos) {
+  const size_t size = ops.size();
+  error.append_circuit_ops(outcome, qubits, ops);
+  if (!error.errors_after()) {
+    // Move the appended ops before the operation
+    std::rotate(ops.begin() + op_pos, ops.begin() + size, ops.end());
+    op_pos += ops.size() - size;
+  }
+}
+
+
+Circuit NoiseModel::sample_noise_with_error(const Circuit &circ,
+                                            const CircuitNoise &noise,
+                                            RngEngine &rng,
+                                            size_t &ideal_ops) const {
+  // The quantum noise of the ops before the first error is ideal, and the
+  // noise of the ops after it is sampled without conditions
+  const size_t first = sample_first_error(noise.ops,
+    [](const OpNoise &op) {return op.ideal_probability;},
+    noise.ideal_probability, rng);
+  Circuit noisy_circ = circ; // copy input circuit
+  noisy_circ.measure_sampling_flag = false; // disable measurement opt flag
+  noisy_circ.ops.clear(); // delete ops
+  noisy_circ.ops.reserve(2 * circ.ops.size());
+  ideal_ops = first;
+  for (size_t pos = 0; pos < first; ++pos) {
+    const auto &readout_ops = noise.ops[pos].readout_ops;
+    noisy_circ.ops.push_back(circ.ops[pos]);
+    noisy_circ.ops.insert(noisy_circ.ops.end(), readout_ops.begin(), readout_ops.end());
+    if (!readout_ops.empty())
+      ideal_ops = std::min(ideal_ops, pos);
+  }
+  sample_noise_with_error(circ.ops[first], noise.ops[first], rng,
+                          noisy_circ.ops);
+  // Draw the random numbers of the ops after the first error
+  size_t draws = 0;
+  for (size_t pos = first + 1; pos < circ.ops.size(); ++pos)
+    draws += noise.ops[pos].draws;
+  std::vector<double> rnds(draws);
+  rng.rand(rnds);
+  const double *rnd = rnds.data();
+  for (size_t pos = first + 1; pos < circ.ops.size(); ++pos) {
+    const auto &op = circ.ops[pos];
+    if (!has_noise(op.type))
+      noisy_circ.ops.push_back(op);
+    else
+      sample_noise(op, noise.ops[pos], rnd, noisy_circ.ops);
+    rnd += noise.ops[pos].draws;
+  }
+  return noisy_circ;
+}
+
+
+void NoiseModel::sample_noise_with_error(const Operations::Op &op,
+                                         const OpNoise &noise,
+                                         RngEngine &rng,
+                                         NoiseOps &ops) const {
+  // The op has an ideal probability less than 1, so it is not a noise free
+  // Waltz gate, and noisy Waltz gates are excluded by the precondition of
+  // the circuit overload. The noise of the op is its quantum errors.
+  const auto &errors = noise.quantum_errors;
+  const size_t first = sample_first_error(errors,
+    [this](const std::pair<size_t, reg_t> &error) {
+      return quantum_errors_[error.first].ideal_probability();
+    }, noise.ideal_probability, rng);
+  // Errors before the first error are identities and are omitted
+  size_t op_pos = ops.size();
+  ops.push_back(op);
+  for (size_t j = first; j < errors.size(); ++j) {
+    const QuantumError &error = quantum_errors_[errors[j].first];
+    const uint_t outcome = (j == first)
+      ? error.sample_error_outcome(rng.rand())
+      : error.sample_outcome(rng.rand());
+    add_error_ops(error, outcome, errors[j].second, ops, op_pos);
+  }
+  ops.insert(ops.end(), noise.readout_ops.begin(), noise.readout_ops.end());
+}
+
+
+Circuit NoiseModel::readout_noise(const Circuit &circ,
+                                  const CircuitNoise &noise) const {
+  Circuit noisy_circ = circ; // copy input circuit
+  if (!noise.readout_errors)
+    return noisy_circ;
+  noisy_circ.ops.clear(); // delete ops
+  for (size_t pos = 0; pos < circ.ops.size(); ++pos) {
+    const auto &readout_ops = noise.ops[pos].readout_ops;
+    noisy_circ.ops.push_back(circ.ops[pos]);
+    noisy_circ.ops.insert(noisy_circ.ops.end(), readout_ops.begin(), readout_ops.end());
+  }
+  return noisy_circ;
+}
+
+
+template <class T, class Prob>
+size_t NoiseModel::sample_first_error(const std::vector<T> &items, Prob prob,
+                                      double ideal_prob, RngEngine &rng) {
+  // The first error is at position k with probability
+  // (S_k - S_{k+1}) / (1 - ideal_prob), where S_k is the product of the
+  // ideal probabilities before position k. Sample a value in
+  // [ideal_prob, 1) and find the interval [S_{k+1}, S_k) containing it.
+  const double r = ideal_prob + (1. - ideal_prob) * rng.rand();
+  double prod = 1.;
+  size_t last = 0;
+  for (size_t k = 0; k < items.size(); ++k) {
+    const double p = prob(items[k]);
+    if (p < 1.) {
+      prod *= p;
+      if (r >= prod)
+        return k;
+      last = k;
+    }
+  }
+  // Only reached by rounding errors
+  return last;
+}
+
+
+bool NoiseModel::ideal_sample(const NoiseOps &ops, size_t pos,
+                              const Operations::Op &op) const {
+  bool has_op = false;
+  for (size_t j = pos; j < ops.size(); ++j) {
+    const auto &noise_op = ops[j];
+    if (noise_op.type == Operations::OpType::gate && noise_op.name == "id")
+      continue;
+    if (has_op || noise_op.type != op.type || noise_op.name != op.name ||
+        noise_op.qubits != op.qubits)
+      return false;
+    has_op = true;
+  }
+  // An identity op is not distinguished from its identity errors
+  return has_op || (op.type == Operations::OpType::gate && op.name == "id");
+}
+
+
 void NoiseModel::add_readout_error(const ReadoutError &error,
                                          const std::vector<reg_t> &op_qubits) {
   // Add roerror to noise model ops
@@ -254,10 +740,10 @@ void NoiseModel::add_readout_error(const ReadoutError &error,
 
   // Add error index to the error table
   if (op_qubits.empty()) {
-    readout_error_table_[""].push_back(error_pos);
+    readout_error_table_[reg_t()].push_back(error_pos);
   } else {
     for (const auto &qubits : op_qubits)
-      readout_error_table_[reg2string(qubits)].push_back(error_pos);
+      readout_error_table_[qubits].push_back(error_pos);
   }
 }
 
@@ -283,6 +769,18 @@ void NoiseModel::add_quantum_error(const QuantumError &error,
 }
 
 
+size_t NoiseModel::gate_id(const std::string &name) {
+  auto iter = gate_ids_.find(name);
+  if (iter != gate_ids_.end())
+    return iter->second;
+  const size_t id = gate_ids_.size();
+  gate_ids_[name] = id;
+  local_quantum_error_table_.resize(id + 1);
+  nonlocal_quantum_error_table_.resize(id + 1);
+  return id;
+}
+
+
 void NoiseModel::add_local_quantum_error(const QuantumError &error,
                                          const stringset_t &op_labels,
                                          const std::vector<reg_t> &op_qubits) {
@@ -295,9 +793,11 @@ void NoiseModel::add_local_quantum_error(const QuantumError &error,
   // Get position of error in error vector
   const auto error_pos = quantum_errors_.size() - 1;
   // Add error index to the error table
-  for (const auto &gate: op_labels)
+  for (const auto &gate: op_labels) {
+    auto &table = local_quantum_error_table_[gate_id(gate)];
     for (const auto &qubits : op_qubits)
-      local_quantum_error_table_[gate][reg2string(qubits)].push_back(error_pos);
+      table[qubits].push_back(error_pos);
+  }
 }
 
 
@@ -315,219 +815,11 @@ void NoiseModel::add_nonlocal_quantum_error(const QuantumError &error,
   // Get position of error in error vector
   const auto error_pos = quantum_errors_.size() - 1;
   // Add error index to the error table
-  for (const auto &gate: op_labels)
+  for (const auto &gate: op_labels) {
+    auto &table = nonlocal_quantum_error_table_[gate_id(gate)];
     for (const auto &qubits_gate : op_qubits)
       for (const auto &qubits_noise : noise_qubits)
-        nonlocal_quantum_error_table_[gate][reg2string(qubits_gate)][reg2string(qubits_noise)].push_back(error_pos);
-}
-
-
-NoiseModel::NoiseOps NoiseModel::sample_noise_helper(const Operations::Op &op,
-                                                     RngEngine &rng) const {                                                
-  // Return operator set
-  NoiseOps noise_before;
-  NoiseOps noise_after;
-  // Apply local errors first
-  sample_local_quantum_noise(op, noise_before, noise_after, rng);
-  // Apply nonlocal errors second
-  sample_nonlocal_quantum_noise(op, noise_before, noise_after, rng);
-  // Apply readout error to measure ops
-  if (op.type == Operations::OpType::measure) {
-    sample_readout_noise(op, noise_after, rng);
-  }
-
-  // combine the original op with the noise ops before and after
-  noise_before.reserve(noise_before.size() + noise_after.size() + 1);
-  noise_before.push_back(op);
-  noise_before.insert(noise_before.end(), noise_after.begin(), noise_after.end());
-  return noise_before;
-}
-
-
-void NoiseModel::sample_readout_noise(const Operations::Op &op,
-                                      NoiseOps &noise_after,
-                                      RngEngine &rng) const {
-  // If no readout errors are defined pass
-  if (readout_errors_.empty()) {
-    return;
-  }
-  // Check if measure op writes only to memory, or also to registers
-  // We will use the same error model for both memory and registers
-  bool has_registers = !op.registers.empty();
-  
-  //
-  std::string op_qubits = reg2string(op.qubits);
-
-  // Check if the qubits are listed in the readout error model
-  auto iter_default = readout_error_table_.find(std::string());
-
-  // Format qubit sets
-  std::vector<std::string> qubit_keys;
-  std::vector<reg_t> memory_sets, registers_sets;
-  if (readout_error_table_.find(op_qubits) == readout_error_table_.end()) {
-    // Since measure can be defined on multiple qubits
-    // but error model may be specified only on single qubits we add
-    // each one separately. If a multi-qubit model is found for specified
-    // qubits however, that will be used instead.
-    for (const auto &q : op.qubits) {
-      qubit_keys.push_back(std::to_string(q));
-    }
-    // Add the classical register sets for measure ops
-    for (const auto &q : op.memory) {
-      memory_sets.push_back({q});
-    }
-    if (has_registers) {
-      for (const auto &q : op.registers) {
-        registers_sets.push_back({q});
-      }
-    }
-  } else {
-    // for gate operations we use the qubits as specified
-    qubit_keys.push_back(op_qubits);
-    memory_sets.push_back(op.memory);
-    if (has_registers)
-      registers_sets.push_back(op.registers);
-  }
-  // Iterate over qubits
-  for (size_t qs=0; qs < qubit_keys.size(); ++qs) {
-    auto iter_qubits = readout_error_table_.find(qubit_keys[qs]);
-    if (iter_qubits != readout_error_table_.end() ||
-        iter_default != readout_error_table_.end()) {
-      auto &error_positions = (iter_qubits != readout_error_table_.end())
-        ? iter_qubits->second
-        : iter_default->second;
-      for (auto &pos : error_positions) {
-        // Sample Readout error
-        auto noise_ops = readout_errors_[pos].sample_noise(memory_sets[qs], rng);
-        if (has_registers) {
-          for (auto& noise_op: noise_ops) {
-            noise_op.registers = registers_sets[qs];
-          }
-        }
-        // Add noise after the error 
-        noise_after.insert(noise_after.end(), noise_ops.begin(), noise_ops.end());
-      }
-    }
-  }
-}
-
-
-void NoiseModel::sample_local_quantum_noise(const Operations::Op &op,
-                                            NoiseOps &noise_before,
-                                            NoiseOps &noise_after,
-                                            RngEngine &rng) const {
-  
-  // If no errors are defined pass
-  if (local_quantum_errors_ == false)
-    return;
-
-  // Get op name, or label if it is a matrix
-  std::string name = (op.type == Operations::OpType::matrix)
-    ? op.string_params[0]
-    : op.name;
-
-  // Check if op is a measure or reset
-  bool is_measure_or_reset = (op.type == Operations::OpType::measure ||
-                              op.type == Operations::OpType::reset);
-
-  // Convert qubits to string for table lookup
-  std::string op_qubits = reg2string(op.qubits);
-
-  // Get the qubit error map for gate name
-  auto iter = local_quantum_error_table_.find(name);
-  if (iter != local_quantum_error_table_.end()) {
-    // Check if the qubits are listed in the inner model
-    const auto qubit_map = iter->second;
-    // Get the default qubit model in case a specific qubit model is not found
-    // The default model is stored under the empty key string ""
-    auto iter_default = qubit_map.find(std::string());
-    // Format qubit sets
-    std::vector<std::string> qubit_keys;
-    if (is_measure_or_reset && qubit_map.find(op_qubits) == qubit_map.end()) {
-      // Since measure and reset ops can be defined on multiple qubits
-      // but error model may be specified only on single qubits we add
-      // each one separately. If a multi-qubit model is found for specified
-      // qubits however, that will be used instead.
-      for (const auto &q : op.qubits) {
-        qubit_keys.push_back(std::to_string(q) + std::string(","));
-      }
-    } else {
-      // for gate operations we use the qubits as specified
-      qubit_keys.push_back(op_qubits);
-    }
-    for (size_t qs=0; qs < qubit_keys.size(); ++qs) {
-      auto iter_qubits = qubit_map.find(qubit_keys[qs]);
-      if (iter_qubits != qubit_map.end() ||
-          iter_default != qubit_map.end()) {
-        auto &error_positions = (iter_qubits != qubit_map.end())
-          ? iter_qubits->second
-          : iter_default->second;
-        for (auto &pos : error_positions) {
-          auto noise_ops = quantum_errors_[pos].sample_noise(string2reg(qubit_keys[qs]), rng);
-          // Duplicate same sampled error operations
-          if (quantum_errors_[pos].errors_after())
-            noise_after.insert(noise_after.end(), noise_ops.begin(), noise_ops.end());
-          else
-            noise_before.insert(noise_before.end(), noise_ops.begin(), noise_ops.end());
-        }
-      }
-    }
-  }
-}
-
-
-void NoiseModel::sample_nonlocal_quantum_noise(const Operations::Op &op,
-                                               NoiseOps &noise_before,
-                                               NoiseOps &noise_after,
-                                               RngEngine &rng) const {
-  
-  // If no errors are defined pass
-  if (nonlocal_quantum_errors_ == false)
-    return;
-  
-  // Get op name, or label if it is a matrix
-  std::string name = (op.type == Operations::OpType::matrix)
-    ? op.string_params[0]
-    : op.name;
-
-  // Convert qubits to string for table lookup
-  std::string qubits_str = reg2string(op.qubits);
-  // Get the inner error map for  gate name
-  auto iter = nonlocal_quantum_error_table_.find(name);
-  if (iter != nonlocal_quantum_error_table_.end()) {
-    const auto qubit_map = iter->second;
-    // Format qubit sets
-    std::vector<std::string> qubit_keys;
-
-    if ((op.type == Operations::OpType::measure || op.type == Operations::OpType::reset)
-        && qubit_map.find(qubits_str) == qubit_map.end()) {
-      // Since measure and reset ops can be defined on multiple qubits
-      // but error model may be specified only on single qubits we add
-      // each one separately. If a multi-qubit model is found for specified
-      // qubits however, that will be used instead.
-      for (const auto &q : op.qubits)
-        qubit_keys.push_back(std::to_string(q));
-    } else {
-      // for gate operations we use the qubits as specified
-      qubit_keys.push_back(reg2string(op.qubits));
-    }
-    for (const auto &qubits: qubit_keys) {
-      // Check if the qubits are listed in the inner model
-      auto iter_qubits = qubit_map.find(qubits);
-      if (iter_qubits != qubit_map.end()) {
-        for (auto &target_pair : iter_qubits->second) {
-          auto &target_qubits = target_pair.first;
-          auto &error_positions = target_pair.second;
-          for (auto &pos : error_positions) {
-            auto ops = quantum_errors_[pos].sample_noise(string2reg(target_qubits), rng);
-            if (quantum_errors_[pos].errors_after())
-              noise_after.insert(noise_after.end(), ops.begin(), ops.end());
-            else
-              noise_before.insert(noise_before.end(), ops.begin(), ops.end());
-          }
-        }
-      }
-    }
+        table[qubits_gate][qubits_noise].push_back(error_pos);
   }
 }
 
@@ -541,62 +833,40 @@ NoiseModel::waltz_gate_table_ = {
 };
 
 
-NoiseModel::NoiseOps NoiseModel::sample_noise_x90_u3(uint_t qubit,
-                                                       complex_t theta,
-                                                       complex_t phi,
-                                                       complex_t lambda,
-                                                       RngEngine &rng) const {
-  NoiseOps ret;
-  const auto x90 = Operations::make_mat({qubit}, Utils::Matrix::X90, "x90");
+void NoiseModel::sample_noise_x90_u3(uint_t qubit,
+                                     complex_t theta,
+                                     complex_t phi,
+                                     complex_t lambda,
+                                     const OpNoise &noise,
+                                     const double *rnds,
+                                     NoiseOps &ops) const {
   if (std::abs(lambda) > u1_threshold_
       && std::abs(lambda - 2 * M_PI) > u1_threshold_
       && std::abs(lambda + 2 * M_PI) > u1_threshold_)
-    ret.push_back(Operations::make_u1(qubit, lambda)); // add 1st U1
-  auto sample = sample_noise_helper(x90, rng); // sample noise for 1st X90
-  ret.insert(ret.end(), sample.begin(), sample.end()); // add 1st noisy X90
+    ops.push_back(Operations::make_u1(qubit, lambda)); // add 1st U1
+  sample_quantum_noise(noise.x90, noise.x90_errors, rnds, ops); // add 1st noisy X90
   if (std::abs(theta + M_PI) > u1_threshold_
       && std::abs(theta - M_PI) > u1_threshold_)
-    ret.push_back(Operations::make_u1(qubit, theta + M_PI)); // add 2nd U1
-  sample = sample_noise_helper(x90, rng); // sample noise for 2nd X90
-  ret.insert(ret.end(), sample.begin(), sample.end()); // add 2nd noisy X90
+    ops.push_back(Operations::make_u1(qubit, theta + M_PI)); // add 2nd U1
+  sample_quantum_noise(noise.x90, noise.x90_errors,
+                       rnds + noise.x90_errors.size(), ops); // add 2nd noisy X90
   if (std::abs(phi + M_PI) > u1_threshold_
       && std::abs(phi - M_PI) > u1_threshold_)
-    ret.push_back(Operations::make_u1(qubit, phi + M_PI)); // add 3rd U1
-  return ret;
+    ops.push_back(Operations::make_u1(qubit, phi + M_PI)); // add 3rd U1
 }
 
 
-NoiseModel::NoiseOps NoiseModel::sample_noise_x90_u2(uint_t qubit,
-                                                       complex_t phi,
-                                                       complex_t lambda,
-                                                       RngEngine &rng) const {
-  NoiseOps ret;
-  const auto x90 = Operations::make_mat({qubit}, Utils::Matrix::X90, "x90");
+void NoiseModel::sample_noise_x90_u2(uint_t qubit,
+                                     complex_t phi,
+                                     complex_t lambda,
+                                     const OpNoise &noise,
+                                     const double *rnds,
+                                     NoiseOps &ops) const {
   if (std::abs(lambda - 0.5 * M_PI) > u1_threshold_)
-    ret.push_back(Operations::make_u1(qubit, lambda - 0.5 * M_PI)); // add 1st U1
-  auto sample = sample_noise_helper(x90, rng); // sample noise for 1st X90
-  ret.insert(ret.end(), sample.begin(), sample.end()); // add 1st noisy X90
+    ops.push_back(Operations::make_u1(qubit, lambda - 0.5 * M_PI)); // add 1st U1
+  sample_quantum_noise(noise.x90, noise.x90_errors, rnds, ops); // add 1st noisy X90
   if (std::abs(phi + 0.5 * M_PI) > u1_threshold_)
-    ret.push_back(Operations::make_u1(qubit, phi + 0.5 * M_PI)); // add 2nd U1
-  return ret;
-}
-
-
-std::string NoiseModel::reg2string(const reg_t &reg) const {
-  std::stringstream result;
-  std::copy(reg.begin(), reg.end(), std::ostream_iterator<reg_t::value_type>(result, ","));
-  return result.str();
-}
-
-
-reg_t NoiseModel::string2reg(std::string s) const {
-  reg_t result;
-  size_t pos = 0;
-  while ((pos = s.find(",")) != std::string::npos) {
-    result.push_back(std::stoi(s.substr(0, pos)));
-    s.erase(0, pos + 1);
-  }
-  return result;
+    ops.push_back(Operations::make_u1(qubit, phi + 0.5 * M_PI)); // add 2nd U1
 }
 
 //=========================================================================
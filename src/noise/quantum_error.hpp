@@ -8,6 +8,9 @@
 #ifndef _aer_noise_quantum_error_hpp_
 #define _aer_noise_quantum_error_hpp_
 
+#include <algorithm>
+#include <numeric>
+
 #include "noise/abstract_error.hpp"
 
 namespace AER {
@@ -54,6 +57,24 @@ public:
   // Set threshold for checking probabilities and matrices
   void set_threshold(double);
 
+  // Return the probability of sampling a circuit that only contains
+  // identity gates
+  double ideal_probability() const {return ideal_probability_;}
+
+  // Return the outcome sampled by a uniform random number r in [0, 1)
+  uint_t sample_outcome(double r) const {
+    return sample_outcome(cumulative_probabilities_, r);
+  }
+
+  // Return the outcome sampled by a uniform random number r in [0, 1)
+  // conditioned on the sampled circuit not only containing identity gates
+  uint_t sample_error_outcome(double r) const {
+    return sample_outcome(cumulative_error_probabilities_, r);
+  }
+
+  // Append the circuit ops of an outcome applied to qubits
+  void append_circuit_ops(uint_t r, const reg_t &qubits, NoiseOps &ops) const;
+
   const Operations::OpSet& opset() const {return opset_;}
 
 protected:
@@ -64,6 +85,22 @@ protected:
   // List of unitary error matrices
   std::vector<NoiseOps> circuits_;
 
+  // Probability of sampling an identity circuit, and the probabilities
+  // with the entries of identity circuits set to zero
+  double ideal_probability_ = 1.;
+  rvector_t error_probabilities_;
+
+  // Cumulative sums of the probabilities and error probabilities
+  rvector_t cumulative_probabilities_;
+  rvector_t cumulative_error_probabilities_;
+
+  // Return the outcome of a cumulative probability table sampled by a
+  // uniform random number r in [0, 1)
+  static uint_t sample_outcome(const rvector_t &cumulative, double r);
+
+  // Throw an exception if there are fewer qubits than the error qubits
+  void check_qubits(const reg_t &qubits) const;
+
   // List of OpTypes contained in error circuits
   Operations::OpSet opset_;
 
@@ -77,13 +114,36 @@ protected:
 
 QuantumError::NoiseOps QuantumError::sample_noise(const reg_t &qubits,
                                                   RngEngine &rng) const {
+  NoiseOps noise_ops;
+  append_circuit_ops(sample_outcome(rng.rand()), qubits, noise_ops);
+  return noise_ops;
+}
+
+uint_t QuantumError::sample_outcome(const rvector_t &cumulative, double r) {
+  // The table is only normalized up to the threshold, so r is scaled by
+  // the total probability. Outcomes with zero probability are never
+  // sampled since their cumulative sums equal those of the outcome before.
+  const double total = cumulative.back();
+  auto iter = std::upper_bound(cumulative.begin(), cumulative.end(), r * total);
+  if (iter == cumulative.end()) {
+    // Only reached by rounding errors, return the last non-zero outcome
+    iter = std::lower_bound(cumulative.begin(), cumulative.end(), total);
+  }
+  return std::distance(cumulative.begin(), iter);
+}
+
+void QuantumError::check_qubits(const reg_t &qubits) const {
   if (qubits.size() < get_num_qubits()) {
     std::stringstream msg;
     msg << "QuantumError: qubits size (" << qubits.size() << ")";
     msg << " < error qubits (" << get_num_qubits() << ").";
     throw std::invalid_argument(msg.str());
   }
-  auto r = rng.rand_int(probabilities_);
+}
+
+void QuantumError::append_circuit_ops(uint_t r, const reg_t &qubits,
+                                      NoiseOps &ops) const {
+  check_qubits(qubits);
   // Check for invalid arguments
   if (r + 1 > circuits_.size()) {
     std::stringstream msg;
@@ -91,15 +151,15 @@ QuantumError::NoiseOps QuantumError::sample_noise(const reg_t &qubits,
     msg << " is greater than number of circuits (" << circuits_.size() << ").";
     throw std::invalid_argument(msg.str());
   }
-  NoiseOps noise_ops = circuits_[r];
+  const size_t pos = ops.size();
+  ops.insert(ops.end(), circuits_[r].begin(), circuits_[r].end());
   // Add qubits to noise op commands;
-  for (auto &op : noise_ops) {
+  for (size_t j = pos; j < ops.size(); ++j) {
     // Update qubits based on position in qubits list
-    for (size_t q=0; q < op.qubits.size(); q++) {
-      op.qubits[q] = qubits[op.qubits[q]];
+    for (auto &qubit : ops[j].qubits) {
+      qubit = qubits[qubit];
     }
   }
-  return noise_ops;
 }
 
 void QuantumError::set_threshold(double threshold) {
@@ -145,6 +205,30 @@ void QuantumError::set_circuits(const std::vector<NoiseOps> &circuits,
     }
   }
   set_num_qubits(num_qubits);
+  // Split the probabilities of identity and error circuits
+  ideal_probability_ = 0.;
+  error_probabilities_ = probabilities_;
+  bool all_ideal = true;
+  for (size_t j=0; j < circuits_.size(); j++) {
+    bool ideal = true;
+    for (const auto &op : circuits_[j])
+      ideal &= (op.type == Operations::OpType::gate && op.name == "id");
+    if (ideal) {
+      ideal_probability_ += probabilities_[j];
+      error_probabilities_[j] = 0.;
+    }
+    all_ideal &= ideal;
+  }
+  // The probabilities are only normalized up to the threshold
+  if (all_ideal)
+    ideal_probability_ = 1.;
+  // Cumulative probability tables for sampling outcomes
+  cumulative_probabilities_.resize(probabilities_.size());
+  std::partial_sum(probabilities_.begin(), probabilities_.end(),
+                   cumulative_probabilities_.begin());
+  cumulative_error_probabilities_.resize(error_probabilities_.size());
+  std::partial_sum(error_probabilities_.begin(), error_probabilities_.end(),
+                   cumulative_error_probabilities_.begin());
 }
 
 
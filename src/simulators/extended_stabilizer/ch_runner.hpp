@@ -71,6 +71,8 @@ public:
   }
 
   uint_t get_num_states() const;
+  // Return the approximate memory in bytes of the decomposition
+  size_t memory_bytes() const;
   uint_t get_n_qubits() const;
   bool check_omp_threshold();
 
@@ -173,6 +175,13 @@ uint_t Runner::get_num_states() const
   return num_states_;
 }
 
+size_t Runner::memory_bytes() const
+{
+  // Each stabilizer state stores the F, G and M matrices as n words
+  return states_.size() * (sizeof(chstabilizer_t) + 3 * n_qubits_ * sizeof(uint_fast64_t))
+         + coefficients_.size() * sizeof(complex_t);
+}
+
 uint_t Runner::get_n_qubits() const
 {
   return n_qubits_;
@@ -77,9 +77,18 @@ public:
 
   virtual void set_config(const json_t &config) override;
 
+  // Return the number of states in the stabilizer rank decomposition used
+  // to simulate a circuit
+  uint_t decomposition_rank(const std::vector<Operations::Op> &ops) const;
+
+  // Return the number of steps of the metropolis sampler used to measure
+  // the state
+  uint_t mixing_steps() const {return metropolis_mixing_steps_;}
+
   virtual std::vector<reg_t> sample_measure(const reg_t& qubits,
                                             uint_t shots,
                                             RngEngine &rng) override;
+  using BaseState::sample_measure;
 
 protected:
 
@@ -208,6 +217,7 @@ void State::initialize_qreg(uint_t num_qubits)
 {
   BaseState::qreg_.initialize(num_qubits);
   BaseState::qreg_.initialize_omp(BaseState::threads_, omp_threshold_rank_);
+  BaseState::memory_.resize(BaseState::qreg_.memory_bytes());
 }
 
 void State::initialize_qreg(uint_t num_qubits, const chstate_t &state)
@@ -218,6 +228,7 @@ void State::initialize_qreg(uint_t num_qubits, const chstate_t &state)
   }
   BaseState::qreg_ = state;
   BaseState::qreg_.initialize_omp(BaseState::threads_, omp_threshold_rank_);
+  BaseState::memory_.resize(BaseState::qreg_.memory_bytes());
 }
 
 void State::set_config(const json_t &config)
@@ -332,16 +343,22 @@ void State::apply_ops(const std::vector<Operations::Op> &ops, OutputData &data,
     std::vector<Operations::Op> non_stabilizer_circuit(ops.cbegin()+first_non_clifford, ops.cend());
     uint_t chi = compute_chi(non_stabilizer_circuit);
     BaseState::qreg_.initialize_decomposition(chi);
+    BaseState::memory_.resize(BaseState::qreg_.memory_bytes());
     //Check for measurement optimisaitons
     bool measurement_opt = check_measurement_opt(ops);
     if(measurement_opt)
     {
+      BaseState::check_cancelled();
+      // The ops are applied to each state of the decomposition in parallel
+      Profiler::Timer timer(BaseState::profiler_, "ops", "decomposition");
       apply_ops_parallel(non_stabilizer_circuit, rng);
     }
     else
     {
       for (const auto op: non_stabilizer_circuit)
       {
+        BaseState::check_cancelled();
+        const auto timer = BaseState::profile_op(op);
         switch (op.type)
         {
           case Operations::OpType::gate:
@@ -447,6 +464,8 @@ void State::apply_stabilizer_circuit(const std::vector<Operations::Op> &ops,
 {
   for (const auto op: ops)
   {
+    BaseState::check_cancelled();
+    const auto timer = BaseState::profile_op(op);
     switch (op.type)
     {
       case Operations::OpType::gate:
@@ -743,6 +762,20 @@ uint_t State::compute_chi(const std::vector<Operations::Op> &ops) const
   return std::llrint(std::ceil(xi*err_scaling));
 }
 
+uint_t State::decomposition_rank(const std::vector<Operations::Op> &ops) const
+{
+  double xi = 1;
+  for (const auto &op: ops)
+  {
+    compute_extent(op, xi);
+  }
+  if (xi > 1)
+  {
+    return std::llrint(std::ceil(xi*std::pow(approximation_error_, -2)));
+  }
+  return 1;
+}
+
 void State::compute_extent(const Operations::Op &op, double &xi) const
 {
   if(op.type == Operations::OpType::gate)
@@ -23,6 +23,12 @@ public:
   void optimize_circuit(Circuit& circ,
                         const Operations::OpSet &opset,
                         OutputData &data) const override;
+
+  std::shared_ptr<CircuitOptimization> clone() const override {
+    return std::make_shared<ReduceNop>(*this);
+  }
+
+  std::string name() const override {return "reduce_nop";}
 };
 
 void ReduceNop::optimize_circuit(Circuit& circ,
@@ -43,6 +49,12 @@ public:
   void optimize_circuit(Circuit& circ,
                         const Operations::OpSet &opset,
                         OutputData &data) const override;
+
+  std::shared_ptr<CircuitOptimization> clone() const override {
+    return std::make_shared<Debug>(*this);
+  }
+
+  std::string name() const override {return "debug";}
 };
 
 void Debug::optimize_circuit(Circuit& circ,
@@ -66,6 +78,12 @@ public:
                         const Operations::OpSet &opset,
                         OutputData &data) const override;
 
+  std::shared_ptr<CircuitOptimization> clone() const override {
+    return std::make_shared<Fusion>(*this);
+  }
+
+  std::string name() const override {return "fusion";}
+
   bool can_ignore(const op_t& op) const;
 
   bool can_apply_fusion(const op_t& op) const;
@@ -98,7 +116,7 @@ public:
 private:
   uint_t max_qubit_;
   uint_t threshold_;
-  const double cost_factor_;
+  double cost_factor_;
   bool verbose_;
   bool active_;
 };
@@ -149,6 +167,9 @@ void Fusion::set_config(const json_t &config) {
   if (JSON::check_key("fusion_threshold", config_))
     JSON::get_value(threshold_, "fusion_threshold", config_);
 
+  if (JSON::check_key("fusion_cost_factor", config_))
+    JSON::get_value(cost_factor_, "fusion_cost_factor", config_);
+
 }
 
 
@@ -8,6 +8,8 @@
 #ifndef _aer_qasm_controller_hpp_
 #define _aer_qasm_controller_hpp_
 
+#include <numeric>
+
 #include "base/controller.hpp"
 #include "simulators/extended_stabilizer/extended_stabilizer_state.hpp"
 #include "simulators/statevector/statevector_state.hpp"
@@ -39,6 +41,8 @@ namespace Simulator {
  *      measure sampling [Default: 10]
  * - "statevector_hpc_gate_opt" (bool): Enable large qubit gate optimizations.
  *      [Default: False]
+ * - "statevector_numa_policy" (str): NUMA memory placement of the
+ *      statevector: "local", "interleave" or "partition" [Default: "local"]
  *
  * From ExtendedStabilizer::State class
  * - "extended_stabilizer_approximation_error" (double): Set the error in the 
@@ -66,6 +70,23 @@ namespace Simulator {
  *      parallel circuit or shot execution is enabled this will only
  *      use unallocated CPU cores up to max_parallel_threads. [Default: 100]
  *
+ * From QasmController class
+ *
+ * - "noise_prefix_enable" (bool): For noisy circuits with the statevector
+ *      or stabilizer simulation methods, sample the noise of batches of
+ *      shots first and simulate the ideal gates before the first sampled
+ *      error of each shot once, branching each shot from the state at its
+ *      first error. This requires memory for a second State. [Default: True]
+ * - "error_free_sampling_enable" (bool): For noisy circuits with the
+ *      statevector or stabilizer simulation methods that support measure
+ *      sampling without noise, decide for each shot whether it samples no
+ *      errors with the probability of all errors being identities. These
+ *      shots are measure sampled from a single simulation of the ideal
+ *      circuit, and the other shots sample noise until it has an error.
+ *      Readout errors are applied to the sampled outcomes. All shots of a
+ *      noise model with only readout errors are sampled from a single
+ *      simulation regardless of this option. [Default: True]
+ *
  * From BaseController Class
  *
  * - "noise_model" (json): A noise model to use for simulation [Default: null]
@@ -125,8 +146,13 @@ protected:
   // This method must initialize a state and return output data for
   // the required number of shots.
   virtual OutputData run_circuit(const Circuit &circ,
+                                 const ExecutionPlan &plan,
                                  uint_t shots,
-                                 uint_t rng_seed) const override;
+                                 uint_t first_shot) const override;
+
+  // Plan the simulation method, measurement sampling and memory of a
+  // circuit, validating the circuit for the State of the method
+  virtual ExecutionPlan plan_circuit(const Circuit &circ) const override;
 
   //----------------------------------------------------------------
   // Utility functions
@@ -138,24 +164,76 @@ protected:
   // the appropriate method based on the input circuit.
   Method simulation_method(const Circuit &circ) const;
 
+  // Validate a circuit for a State subclass, raising an exception if it is
+  // invalid, and set the required memory of the execution plan
+  template <class State_t>
+  void validate_plan_state(const Circuit &circ, ExecutionPlan &plan) const;
+
   // Initialize a State subclass to a given initial state
   template <class State_t, class Initstate_t>
   void initialize_state(const Circuit &circ,
                         State_t &state,
                         const Initstate_t &initial_state) const;
 
-  // Set parallelization for qasm simulator
-  virtual void set_parallelization(const Circuit& circ) override;
+  // Allocate threads for qasm simulator. Circuits that use the
+  // measurement sampling optimization use all threads for State updates.
+  virtual ThreadAllocation allocate_threads(const Circuit& circ,
+                                            const ExecutionPlan& plan,
+                                            int threads,
+                                            size_t memory_mb) const override;
+
+  // Estimate the cost of a circuit for its simulation method
+  virtual double circuit_cost(const Circuit& circ,
+                              const ExecutionPlan& plan) const override;
+
+  // Return the name of the simulation method of a plan
+  virtual std::string method_name(const ExecutionPlan &plan) const override;
+
+  //----------------------------------------------------------------
+  // Shared prefix optimization
+  //----------------------------------------------------------------
+
+  // Simulate the shared prefix of a circuit and store the resulting state.
+  // This is supported for ideal circuits with the statevector and
+  // stabilizer simulation methods. While the shared prefix state is set it
+  // is used as the initial state, and its simulation method is used, for
+  // all executed circuits.
+  virtual bool set_shared_prefix(const Circuit &circ,
+                                 const ExecutionPlan &plan,
+                                 size_t prefix_size) override;
+
+  // Clear the stored shared prefix state
+  virtual void clear_shared_prefix() override;
+
+  //----------------------------------------------------------------
+  // Duplicate experiment pooling
+  //----------------------------------------------------------------
+
+  // Shots of identical circuits may be pooled for ideal circuits without
+  // snapshots that can use the measurement sampling optimization, since
+  // all shots are then sampled from the same final state.
+  virtual bool pool_shots(const Circuit &circ,
+                          const ExecutionPlan &plan) const override;
+
+  // Apply the ops of a prefix circuit to a state initialized to the
+  // input initial state
+  template <class State_t, class Initstate_t>
+  void run_shared_prefix_helper(const Circuit &prefix_circ,
+                                State_t &state,
+                                const Initstate_t &initial_state,
+                                int state_threads) const;
 
   //----------------------------------------------------------------
   // Run circuit helpers
   //----------------------------------------------------------------
 
-  // Execute n-shots of a circuit on the input state
+  // Execute n-shots of a circuit on the input state, starting from the
+  // shot with index first_shot
   template <class State_t, class Initstate_t>
   OutputData run_circuit_helper(const Circuit &circ,
+                                const ExecutionPlan &plan,
                                 uint_t shots,
-                                uint_t rng_seed,
+                                uint_t first_shot,
                                 const Initstate_t &initial_state) const;
 
   // Execute a single shot a circuit by initializing the state vector
@@ -169,22 +247,37 @@ protected:
                        RngEngine &rng) const;
 
   // Execute a n-shots of a circuit without noise.
-  // If possible this is done using measure sampling to only simulate
-  // a single shot up to the first measurement, then sampling measure
-  // outcomes for each shot.
+  // If the plan allows it this is done using measure sampling to only
+  // simulate a single shot up to the first measurement, then sampling
+  // measure outcomes for each shot. Otherwise each shot is simulated
+  // with the rng stream of its index.
   template <class State_t, class Initstate_t>
   void run_circuit_without_noise(const Circuit &circ,
+                                 const ExecutionPlan &plan,
                                  uint_t shots,
+                                 uint_t first_shot,
                                  State_t &state,
                                  const Initstate_t &initial_state,
                                  OutputData &data,
                                  RngEngine &rng) const;
 
+  // Set the config, parallelization, cancellation, profiler and memory
+  // tracker of a State for executing a circuit
+  template <class State_t>
+  void configure_state(State_t &state, const ExecutionPlan &plan) const;
+
   // Execute n-shots of a circuit with noise by sampling a new noisy
-  // instance of the circuit for each shot.
+  // instance of the circuit for each shot with the rng stream of its index.
+  // If the plan has a noise prefix, the shots are executed from a branch
+  // State that applies the ideal prefix ops of the circuit once for each
+  // chunk of shots, in the order of their first sampled error. If the plan
+  // has an error free probability, error free shots are measure sampled
+  // from the ideal circuit after the other shots.
   template <class State_t, class Initstate_t>
   void run_circuit_with_noise(const Circuit &circ,
+                              const ExecutionPlan &plan,
                               uint_t shots,
+                              uint_t first_shot,
                               State_t &state,
                               const Initstate_t &initial_state,
                               OutputData &data,
@@ -194,8 +287,8 @@ protected:
   // Measure sampling optimization
   //----------------------------------------------------------------
 
-  // Sample measurement outcomes for the input measure ops from the
-  // current state of the input State_t
+  // Sample measurement outcomes for the input measure and readout error
+  // ops from the current state of the input State_t
   template <class State_t>
   void measure_sampler(const std::vector<Operations::Op> &meas_ops,
                        uint_t shots,
@@ -203,10 +296,50 @@ protected:
                        OutputData &data,
                        RngEngine &rng) const;
 
+  // Sample a measurement outcome for the input measure and readout error
+  // ops for each rng
+  template <class State_t>
+  void measure_sampler(const std::vector<Operations::Op> &meas_ops,
+                       std::vector<RngEngine> &rngs,
+                       State_t &state,
+                       OutputData &data) const;
+
+  // Return the sorted qubits measured by measure ops
+  reg_t measured_qubits(const std::vector<Operations::Op> &meas_ops) const;
+
+  // Add the memory and registers of measurement samples of the sorted
+  // measured qubits to the output data. Readout error ops are applied to
+  // each sample with the rng of the sample, or with the first rng if there
+  // is only one.
+  void store_measure_samples(const std::vector<Operations::Op> &meas_ops,
+                             const reg_t &meas_qubits,
+                             std::vector<reg_t> &all_samples,
+                             OutputData &data,
+                             std::vector<RngEngine> &rngs) const;
+
   // Check if measure sampling optimization if valid for the input circuit
-  // if so return a pair {true, pos} where pos is the position of the
-  // first measurement operation in the input circuit
-  std::pair<bool, size_t> check_measure_sampling_opt(const Circuit &circ) const;
+  // and simulation method, if so return a pair {true, pos} where pos is
+  // the position of the first measurement operation in the input circuit.
+  // The measurements may be followed by readout error ops.
+  std::pair<bool, size_t> check_measure_sampling_opt(const Circuit &circ,
+                                                     Method method) const;
+
+  // Return the position of the final measure and readout error ops of a
+  // circuit that supports measure sampling
+  size_t sampled_ops_pos(const Circuit &circ) const;
+
+  //----------------------------------------------------------------
+  // Noise prefix optimization
+  //----------------------------------------------------------------
+
+  // Return the number of leading ops of a circuit that are unconditional
+  // gates, matrices and barriers, which are applied to a State without
+  // using the rng or output data.
+  size_t noise_prefix_size(const Circuit &circ) const;
+
+  // Number of shots whose noise is sampled and stored at once when
+  // branching shots from a noise prefix
+  static const uint_t noise_prefix_chunk_ = 256;
 
   //-----------------------------------------------------------------------
   // Config
@@ -219,11 +352,24 @@ protected:
   // Initial statevector for Statevector simulation method
   cvector_t initial_statevector_;
 
+  // Shared prefix state
+  bool shared_prefix_ = false;
+  Method shared_prefix_method_ = Method::automatic;
+  cvector_t shared_prefix_statevector_;
+  Clifford::Clifford shared_prefix_clifford_;
+  size_t shared_prefix_bytes_ = 0; // Tracked memory of the prefix state
+
   // TODO: initial stabilizer state
 
   // Controller-level parameter for CH method
 
   bool extended_stabilizer_disable_measurement_opt_ = true;
+
+  // Noise prefix optimization
+  bool noise_prefix_enable_ = true;
+
+  // Error free shot sampling optimization
+  bool error_free_sampling_enable_ = true;
 };
 
 //=========================================================================
@@ -291,12 +437,16 @@ void QasmController::set_config(const json_t &config) {
     }
   }
   JSON::get_value(extended_stabilizer_disable_measurement_opt_, "disable_measurement_opt", config);
+  JSON::get_value(noise_prefix_enable_, "noise_prefix_enable", config);
+  JSON::get_value(error_free_sampling_enable_, "error_free_sampling_enable", config);
 }
 
 void QasmController::clear_config() {
   Base::Controller::clear_config();
   simulation_method_ = Method::automatic;
   initial_statevector_ = cvector_t();
+  noise_prefix_enable_ = true;
+  error_free_sampling_enable_ = true;
 }
 
 //-------------------------------------------------------------------------
@@ -304,28 +454,34 @@ void QasmController::clear_config() {
 //-------------------------------------------------------------------------
 
 OutputData QasmController::run_circuit(const Circuit &circ,
+                                       const ExecutionPlan &plan,
                                        uint_t shots,
-                                       uint_t rng_seed) const {
+                                       uint_t first_shot) const {
   // Execute according to simulation method
-  switch (simulation_method(circ)) {
+  switch (static_cast<Method>(plan.method)) {
     case Method::statevector:
       // Statevector simulation
       return run_circuit_helper<Statevector::State<>>(
                                                       circ,
+                                                      plan,
                                                       shots,
-                                                      rng_seed,
-                                                      initial_statevector_); // allow custom initial state
+                                                      first_shot,
+                                                      shared_prefix_ ? shared_prefix_statevector_
+                                                                     : initial_statevector_); // allow custom initial state
     case Method::stabilizer:
       // Stabilizer simulation
       // TODO: Stabilizer doesn't yet support custom state initialization
       return run_circuit_helper<Stabilizer::State>(circ,
+                                                   plan,
                                                    shots,
-                                                   rng_seed,
-                                                   Clifford::Clifford()); // no custom initial state
+                                                   first_shot,
+                                                   shared_prefix_ ? shared_prefix_clifford_
+                                                                  : Clifford::Clifford()); // no custom initial state
     case Method::extended_stabilizer:
       return run_circuit_helper<ExtendedStabilizer::State>(circ,
+                                                           plan,
                                                            shots,
-                                                           rng_seed,
+                                                           first_shot,
                                                            CHSimulator::Runner());
     default:
       // We shouldn't get here, so throw an exception if we do
@@ -338,17 +494,20 @@ OutputData QasmController::run_circuit(const Circuit &circ,
 //-------------------------------------------------------------------------
 
 QasmController::Method QasmController::simulation_method(const Circuit &circ) const {
+  // Circuits executed from a shared prefix state use the prefix method
+  if (shared_prefix_)
+    return shared_prefix_method_;
   // Check conditions for automatic simulation types
   auto method = simulation_method_;
   if (method == Method::automatic) {
     // Check if Clifford circuit and noise model
-    if (validate_state(Stabilizer::State(), circ, noise_model_, false)) {
+    if (validate_state(Stabilizer::State(), circ, *noise_model_, false)) {
       method = Method::stabilizer;
     } else {
     // Default method is statevector, unless the memory requirements are too large
       Statevector::State<> sv_state;
       if(!(validate_memory_requirements(sv_state, circ, false))) {
-        if(validate_state(ExtendedStabilizer::State(), circ, noise_model_, false)) {
+        if(validate_state(ExtendedStabilizer::State(), circ, *noise_model_, false)) {
           method = Method::extended_stabilizer;
         } else {
           std::stringstream msg;
@@ -364,6 +523,65 @@ QasmController::Method QasmController::simulation_method(const Circuit &circ) co
   return method;
 }
 
+Base::Controller::ExecutionPlan
+QasmController::plan_circuit(const Circuit &circ) const {
+  ExecutionPlan plan;
+  const Method method = simulation_method(circ);
+  plan.method = static_cast<int>(method);
+  plan.noise = !noise_model_->ideal();
+  if (plan.noise) {
+    // Resolve the errors of the circuit ops once for all shots
+    plan.circuit_noise = std::make_shared<const Noise::NoiseModel::CircuitNoise>(
+      noise_model_->compile(circ));
+  }
+  switch (method) {
+    case Method::statevector:
+      validate_plan_state<Statevector::State<>>(circ, plan);
+      break;
+    case Method::stabilizer:
+      validate_plan_state<Stabilizer::State>(circ, plan);
+      break;
+    case Method::extended_stabilizer:
+      validate_plan_state<ExtendedStabilizer::State>(circ, plan);
+      break;
+    default:
+      // We shouldn't get here, so throw an exception if we do
+      throw std::runtime_error("QasmController: Invalid simulation method");
+  }
+  const auto check = check_measure_sampling_opt(circ, method);
+  plan.measure_sampling = check.first;
+  plan.measure_pos = check.second;
+  // Shots without errors are sampled from the final state of the ideal
+  // circuit if it supports measure sampling
+  if (plan.noise && error_free_sampling_enable_ && plan.measure_sampling &&
+      (method == Method::statevector || method == Method::stabilizer) &&
+      circ.opset().optypes.count(Operations::OpType::snapshot) == 0) {
+    plan.error_free_probability = plan.circuit_noise->ideal_probability;
+  }
+  // Noisy shots are branched from a second State holding the noise prefix
+  // if there is memory for both States
+  if (plan.noise && !plan.sampled() && noise_prefix_enable_ &&
+      (method == Method::statevector || method == Method::stabilizer) &&
+      (max_memory_mb_ == 0 || 2 * plan.memory_mb <= max_memory_mb_)) {
+    plan.noise_prefix = noise_prefix_size(circ);
+    if (plan.noise_prefix > 0)
+      plan.memory_mb *= 2;
+  }
+  plan.cost = circuit_cost(circ, plan);
+  return plan;
+}
+
+template <class State_t>
+void QasmController::validate_plan_state(const Circuit &circ,
+                                         ExecutionPlan &plan) const {
+  State_t state;
+  // Raise an exception if the circuit has invalid ops or the State
+  // requires more memory than is available
+  validate_state(state, circ, *noise_model_, true);
+  validate_memory_requirements(state, circ, true);
+  plan.memory_mb = state.required_memory_mb(circ.num_qubits, circ.ops);
+}
+
 template <class State_t, class Initstate_t>
 void QasmController::initialize_state(const Circuit &circ,
                                       State_t &state,
@@ -396,23 +614,166 @@ size_t QasmController::required_memory_mb(const Circuit& circ) const {
   }
 }
 
-void QasmController::set_parallelization(const Circuit& circ) {
+Base::Controller::ThreadAllocation
+QasmController::allocate_threads(const Circuit& circ, const ExecutionPlan& plan,
+                                 int threads, size_t memory_mb) const {
+  // All shots of an ideal circuit that uses measure sampling are sampled
+  // in a single batch, which keeps the sampled outcomes independent of
+  // the number of threads
+  if (plan.sampled()) {
+    if (memory_mb < plan.memory_mb)
+      throw std::runtime_error("a circuit requires more memory than max_memory_mb.");
+    ThreadAllocation alloc;
+    alloc.threads = std::max(1, threads);
+    alloc.shots = 1;
+    alloc.state_update = alloc.threads;
+    return alloc;
+  }
+  return Base::Controller::allocate_threads(circ, plan, threads, memory_mb);
+}
 
-  if (max_parallel_threads_ < max_parallel_shots_)
-    max_parallel_shots_ = max_parallel_threads_;
+double QasmController::circuit_cost(const Circuit& circ,
+                                    const ExecutionPlan& plan) const {
+  // Shots of circuits that use the measurement sampling optimization are
+  // sampled from a single simulation, and noisy circuits execute every
+  // shot that is not sampled from the ideal circuit
+  double shots = circ.shots;
+  if (plan.sampled())
+    shots = 1.;
+  else if (plan.noise && plan.error_free_probability > 0.)
+    shots = 1. + circ.shots * (1. - plan.error_free_probability);
+  const double ops = circ.ops.size() + 1;
+  switch (static_cast<Method>(plan.method)) {
+    case Method::stabilizer:
+      // Clifford gates on an n-qubit tableau cost O(n)
+      return shots * ops * circ.num_qubits;
+    case Method::extended_stabilizer: {
+      // Gates and metropolis sampler steps on each state of the
+      // decomposition cost O(n^2)
+      ExtendedStabilizer::State state;
+      state.set_config(config_);
+      const double rank = state.decomposition_rank(circ.ops);
+      double steps = ops;
+      for (const auto &op : circ.ops) {
+        if (op.type == Operations::OpType::measure)
+          steps += state.mixing_steps();
+      }
+      return shots * steps * rank * circ.num_qubits * circ.num_qubits;
+    }
+    default:
+      return shots * ops * std::pow(2., circ.num_qubits);
+  }
+}
 
-  switch (simulation_method(circ)) {
+std::string QasmController::method_name(const ExecutionPlan &plan) const {
+  switch (static_cast<Method>(plan.method)) {
+    case Method::stabilizer:
+      return "stabilizer";
+    case Method::extended_stabilizer:
+      return "extended_stabilizer";
+    default:
+      return "statevector";
+  }
+}
+
+//-------------------------------------------------------------------------
+// Shared prefix optimization
+//-------------------------------------------------------------------------
+
+bool QasmController::set_shared_prefix(const Circuit &circ,
+                                       const ExecutionPlan &plan,
+                                       size_t prefix_size) {
+  clear_shared_prefix();
+  // Noisy circuits sample a different prefix for each shot
+  if (plan.noise)
+    return false;
+
+  // The prefix is simulated with all threads
+  const auto alloc = allocate_threads(circ, plan, max_parallel_threads_,
+                                      max_memory_mb_);
+  const auto method = static_cast<Method>(plan.method);
+
+  // Prefix circuit
+  Circuit prefix_circ(std::vector<Operations::Op>(circ.ops.begin(),
+                                                  circ.ops.begin() + prefix_size));
+  prefix_circ.num_qubits = circ.num_qubits;
+  prefix_circ.num_memory = circ.num_memory;
+  prefix_circ.num_registers = circ.num_registers;
+  prefix_circ.seed = circ.seed;
+
+  switch (method) {
     case Method::statevector: {
-      if (noise_model_.ideal() && check_measure_sampling_opt(circ).first) {
-        parallel_shots_ = 1;
-        parallel_state_update_ = max_parallel_threads_;
-        return;
-      }
+      Statevector::State<> state;
+      run_shared_prefix_helper(prefix_circ, state, initial_statevector_,
+                               alloc.threads);
+      shared_prefix_statevector_ = state.qreg().vector();
+      shared_prefix_bytes_ = sizeof(complex_t) * shared_prefix_statevector_.size();
+      break;
     }
-    default: {
-      Base::Controller::set_parallelization(circ);
+    case Method::stabilizer: {
+      Stabilizer::State state;
+      run_shared_prefix_helper(prefix_circ, state, Clifford::Clifford(),
+                               alloc.threads);
+      shared_prefix_clifford_ = state.qreg();
+      shared_prefix_bytes_ = shared_prefix_clifford_.memory_bytes();
+      break;
     }
+    default:
+      return false;
   }
+  if (memory_tracker())
+    memory_tracker()->allocate("shared_prefix", shared_prefix_bytes_);
+  shared_prefix_method_ = method;
+  shared_prefix_ = true;
+  return true;
+}
+
+void QasmController::clear_shared_prefix() {
+  shared_prefix_ = false;
+  shared_prefix_method_ = Method::automatic;
+  shared_prefix_statevector_ = cvector_t();
+  shared_prefix_clifford_ = Clifford::Clifford();
+  if (memory_tracker())
+    memory_tracker()->release("shared_prefix", shared_prefix_bytes_);
+  shared_prefix_bytes_ = 0;
+}
+
+//-------------------------------------------------------------------------
+// Duplicate experiment pooling
+//-------------------------------------------------------------------------
+
+bool QasmController::pool_shots(const Circuit &circ,
+                                const ExecutionPlan &plan) const {
+  if (plan.noise ||
+      circ.opset().optypes.count(Operations::OpType::snapshot) > 0)
+    return false;
+  return plan.measure_sampling;
+}
+
+template <class State_t, class Initstate_t>
+void QasmController::run_shared_prefix_helper(const Circuit &prefix_circ,
+                                              State_t &state,
+                                              const Initstate_t &initial_state,
+                                              int state_threads) const {
+  // Validate state and raise exception if invalid ops
+  validate_state(state, prefix_circ, *noise_model_, true);
+  validate_memory_requirements(state, prefix_circ, true);
+  // Set state config
+  state.set_config(Base::Controller::config_);
+  state.set_parallalization(state_threads);
+  state.set_cancellation(cancellation_.get());
+  state.set_profiler(profiler());
+  state.set_memory_tracker(memory_tracker());
+
+  // Prefix ops are deterministic so the rng and output data are unused
+  RngEngine rng;
+  rng.set_seed(prefix_circ.seed);
+  OutputData data;
+  data.set_config(Base::Controller::config_);
+
+  Circuit opt_circ = optimize_circuit(prefix_circ, state, data);
+  initialize_state(opt_circ, state, initial_state);
+  state.apply_ops(opt_circ.ops, data, rng);
 }
 
 //-------------------------------------------------------------------------
@@ -421,40 +782,49 @@ void QasmController::set_parallelization(const Circuit& circ) {
 
 template <class State_t, class Initstate_t>
 OutputData QasmController::run_circuit_helper(const Circuit &circ,
+                                              const ExecutionPlan &plan,
                                               uint_t shots,
-                                              uint_t rng_seed,
-                                              const Initstate_t &initial_state) const {  
-  // Initialize new state object
+                                              uint_t first_shot,
+                                              const Initstate_t &initial_state) const {
+  // Initialize new state object. The circuit has been validated for the
+  // state when it was planned.
   State_t state;
-
-  // Validate state again and raise exeption if invalid ops
-  validate_state(state, circ, noise_model_, true);
-  // Check memory requirements, raise exception if they're exceeded
-  validate_memory_requirements(state, circ, true);
-  // Set state config
-  state.set_config(Base::Controller::config_);
-  state.set_parallalization(parallel_state_update_);
+  configure_state(state, plan);
 
   // Rng engine
   RngEngine rng;
-  rng.set_seed(rng_seed);
+  rng.set_seed(circ.seed);
 
   // Output data container
   OutputData data;
   data.set_config(Base::Controller::config_);
   data.add_additional_data("metadata",
-                           json_t::object({{"method", state.name()}}));
+                           json_t::object({{"method", state.name()},
+                                           {"measure_sampling", plan.sampled()}}));
 
   // Check if there is noise for the implementation
-  if (noise_model_.ideal()) {
-    run_circuit_without_noise(circ, shots, state, initial_state, data, rng);
+  if (!plan.noise) {
+    run_circuit_without_noise(circ, plan, shots, first_shot, state,
+                              initial_state, data, rng);
   } else {
-    run_circuit_with_noise(circ, shots, state, initial_state, data, rng);
+    run_circuit_with_noise(circ, plan, shots, first_shot, state,
+                           initial_state, data, rng);
   }
   return data;
 }
 
 
+template <class State_t>
+void QasmController::configure_state(State_t &state,
+                                     const ExecutionPlan &plan) const {
+  state.set_config(Base::Controller::config_);
+  state.set_parallalization(plan.threads.state_update);
+  state.set_cancellation(cancellation_.get());
+  state.set_profiler(profiler());
+  state.set_memory_tracker(plan.memory_tracker);
+}
+
+
 template <class State_t, class Initstate_t>
 void QasmController::run_single_shot(const Circuit &circ,
                                      State_t &state,
@@ -469,23 +839,169 @@ void QasmController::run_single_shot(const Circuit &circ,
 
 template <class State_t, class Initstate_t>
 void QasmController::run_circuit_with_noise(const Circuit &circ,
+                                            const ExecutionPlan &plan,
                                             uint_t shots,
+                                            uint_t first_shot,
                                             State_t &state,
                                             const Initstate_t &initial_state,
                                             OutputData &data,
                                             RngEngine &rng) const {
-  // Sample a new noise circuit and optimize for each shot
-  while(shots-- > 0) {
-    Circuit noise_circ = noise_model_.sample_noise(circ, rng);
-    noise_circ = optimize_circuit(noise_circ, state, data);
-    run_single_shot(noise_circ, state, initial_state, data, rng);
-  }                                   
+  const auto &noise = *plan.circuit_noise;
+  if (plan.sampled()) {
+    // The quantum errors of the circuit are ideal, so all shots are
+    // sampled from the circuit with its readout errors
+    run_circuit_without_noise(noise_model_->readout_noise(circ, noise), plan,
+                              shots, first_shot, state, initial_state, data, rng);
+    return;
+  }
+  size_t ideal_ops;
+  if (plan.noise_prefix == 0 && plan.error_free_probability == 0.) {
+    // Sample a new noise circuit and optimize for each shot
+    for (uint_t shot = first_shot; shot < first_shot + shots; ++shot) {
+      check_cancelled();
+      rng.set_stream(shot);
+      Circuit noise_circ = [&]() {
+        Profiler::Timer timer(profiler(), "noise", "sample_noise");
+        return noise_model_->sample_noise(circ, noise, rng, ideal_ops);
+      }();
+      noise_circ = optimize_circuit(noise_circ, state, data);
+      run_single_shot(noise_circ, state, initial_state, data, rng);
+    }
+    return;
+  }
+
+  // The branch State holds the ideal state after the first ops of the
+  // circuit, and is advanced to the first sampled error of each shot.
+  // Ideal prefix ops do not use the rng, so each shot has the same outcome
+  // as if it was simulated from the initial state.
+  State_t branch;
+  if (plan.noise_prefix > 0)
+    configure_state(branch, plan);
+  // The rngs of the error free shots after deciding they are error free,
+  // and the positions of the shots in the output data
+  std::vector<RngEngine> error_free_rngs;
+  std::vector<uint_t> error_free_shots;
+  const uint_t end_shot = first_shot + shots;
+  for (uint_t chunk = first_shot; chunk < end_shot; chunk += noise_prefix_chunk_) {
+    const uint_t chunk_shots = std::min<uint_t>(noise_prefix_chunk_, end_shot - chunk);
+    // Sample the noise of each shot, keeping the noisy ops after the
+    // shot's ideal prefix and the rng state after sampling
+    std::vector<Circuit> noise_circs;
+    std::vector<RngEngine> shot_rngs;
+    std::vector<size_t> prefix_sizes;
+    noise_circs.reserve(chunk_shots);
+    shot_rngs.reserve(chunk_shots);
+    for (uint_t shot = chunk; shot < chunk + chunk_shots; ++shot) {
+      check_cancelled();
+      rng.set_stream(shot);
+      // A shot is error free with the probability that its noise sample is
+      // ideal. The noise of the other shots is sampled conditioned on
+      // having an error.
+      const bool error_free = plan.error_free_probability > 0.;
+      if (error_free && rng.rand() < plan.error_free_probability) {
+        error_free_rngs.push_back(rng);
+        error_free_shots.push_back(shot - first_shot);
+        continue;
+      }
+      noise_circs.push_back([&]() {
+        Profiler::Timer timer(profiler(), "noise", "sample_noise");
+        return error_free
+          ? noise_model_->sample_noise_with_error(circ, noise, rng, ideal_ops)
+          : noise_model_->sample_noise(circ, noise, rng, ideal_ops);
+      }());
+      const size_t prefix_size = std::min(ideal_ops, plan.noise_prefix);
+      auto &ops = noise_circs.back().ops;
+      ops.erase(ops.begin(), ops.begin() + prefix_size);
+      prefix_sizes.push_back(prefix_size);
+      shot_rngs.push_back(rng);
+    }
+    std::vector<uint_t> order(noise_circs.size());
+    std::iota(order.begin(), order.end(), 0);
+    std::stable_sort(order.begin(), order.end(), [&](uint_t a, uint_t b) {
+      return prefix_sizes[a] < prefix_sizes[b];
+    });
+
+    // Execute the shots in order of their prefix size. Each shot stores its
+    // output in its own OutputData so that the chunk's output is combined
+    // in shot order.
+    if (plan.noise_prefix > 0)
+      initialize_state(circ, branch, initial_state);
+    std::vector<OutputData> shot_data(noise_circs.size());
+    for (auto &datum : shot_data)
+      datum.set_config(Base::Controller::config_);
+    size_t pos = 0;
+    for (const uint_t j : order) {
+      check_cancelled();
+      if (prefix_sizes[j] > pos) {
+        const std::vector<Operations::Op> ops(circ.ops.begin() + pos,
+                                              circ.ops.begin() + prefix_sizes[j]);
+        branch.apply_ops(ops, data, shot_rngs[j]);
+        pos = prefix_sizes[j];
+      }
+      if (pos > 0)
+        state.initialize_qreg(circ.num_qubits, branch.qreg());
+      else
+        initialize_state(circ, state, initial_state);
+      state.initialize_creg(circ.num_memory, circ.num_registers);
+      Circuit noise_circ = optimize_circuit(noise_circs[j], state, data);
+      state.apply_ops(noise_circ.ops, shot_data[j], shot_rngs[j]);
+      state.add_creg_to_data(shot_data[j]);
+      // Free the ops of the noisy circuit
+      std::vector<Operations::Op>().swap(noise_circs[j].ops);
+    }
+    for (auto &datum : shot_data)
+      data.combine(datum);
+  }
+
+  // Sample the error free shots from the ideal circuit with its readout
+  // errors, and insert their output between the noisy shots
+  if (!error_free_rngs.empty()) {
+    check_cancelled();
+    Circuit opt_circ = optimize_circuit(noise_model_->readout_noise(circ, noise),
+                                        state, data);
+    const size_t pos = sampled_ops_pos(opt_circ); // Position of first measurement op
+    rng.set_stream(first_shot);
+    std::vector<Operations::Op> ops(opt_circ.ops.begin(), opt_circ.ops.begin() + pos);
+    initialize_state(opt_circ, state, initial_state);
+    state.apply_ops(ops, data, rng);
+    ops = std::vector<Operations::Op>(opt_circ.ops.begin() + pos, opt_circ.ops.end());
+    OutputData error_free_data;
+    error_free_data.set_config(Base::Controller::config_);
+    {
+      Profiler::Timer timer(profiler(), "measure_sampling", "measure_sampler");
+      measure_sampler(ops, error_free_rngs, state, error_free_data);
+    }
+    // The samples are stored starting from the last rng
+    std::reverse(error_free_shots.begin(), error_free_shots.end());
+    data.combine(error_free_data, error_free_shots);
+  }
+}
+
+
+//-------------------------------------------------------------------------
+// Noise prefix optimization
+//-------------------------------------------------------------------------
+
+size_t QasmController::noise_prefix_size(const Circuit &circ) const {
+  size_t size = 0;
+  for (const auto &op : circ.ops) {
+    const bool unitary = op.type == Operations::OpType::gate ||
+                         op.type == Operations::OpType::matrix ||
+                         op.type == Operations::OpType::matrix_sequence ||
+                         op.type == Operations::OpType::barrier;
+    if (!unitary || op.conditional || op.old_conditional)
+      break;
+    size++;
+  }
+  return size;
 }
 
 
 template <class State_t, class Initstate_t>
 void QasmController::run_circuit_without_noise(const Circuit &circ,
+                                               const ExecutionPlan &plan,
                                                uint_t shots,
+                                               uint_t first_shot,
                                                State_t &state,
                                                const Initstate_t &initial_state,
                                                OutputData &data,
@@ -495,24 +1011,31 @@ void QasmController::run_circuit_without_noise(const Circuit &circ,
   opt_circ = optimize_circuit(circ, state, data);
 
   // Check if measure sampler and optimization are valid
-  auto check = check_measure_sampling_opt(opt_circ);
-  if (check.first == false) {
+  if (plan.measure_sampling == false) {
     // Perform standard execution if we cannot apply the
     // measurement sampling optimization
-    while(shots-- > 0) {
+    for (uint_t shot = first_shot; shot < first_shot + shots; ++shot) {
+      check_cancelled();
+      rng.set_stream(shot);
       run_single_shot(opt_circ, state, initial_state, data, rng);
     }
   } else {
-    // Implement measure sampler
-    auto pos = check.second; // Position of first measurement op
-
-    // Run circuit instructions before first measure
+    // Implement measure sampler. Circuit optimizations only remove barriers
+    // and fuse gates before the measurements, so the circuit ends with the
+    // planned measurements.
+    const size_t pos = sampled_ops_pos(opt_circ); // Position of first measurement op
+
+    // Run circuit instructions before first measure. All shots are
+    // sampled in a single batch (see `allocate_threads`) from the stream
+    // of the first shot.
+    rng.set_stream(first_shot);
     std::vector<Operations::Op> ops(opt_circ.ops.begin(), opt_circ.ops.begin() + pos);
     initialize_state(opt_circ, state, initial_state);
     state.apply_ops(ops, data, rng);
 
     // Get measurement operations and set of measured qubits
     ops = std::vector<Operations::Op>(opt_circ.ops.begin() + pos, opt_circ.ops.end());
+    Profiler::Timer timer(profiler(), "measure_sampling", "measure_sampler");
     measure_sampler(ops, shots, state, data, rng);
   }                                
 }
@@ -523,10 +1046,11 @@ void QasmController::run_circuit_without_noise(const Circuit &circ,
 //-------------------------------------------------------------------------
 
 std::pair<bool, size_t>
-QasmController::check_measure_sampling_opt(const Circuit &circ) const {
+QasmController::check_measure_sampling_opt(const Circuit &circ,
+                                           Method method) const {
   // Find first instance of a measurement and check there
   // are no reset or initialize operations before the measurement
-  if(simulation_method(circ) == Method::extended_stabilizer && extended_stabilizer_disable_measurement_opt_)
+  if(method == Method::extended_stabilizer && extended_stabilizer_disable_measurement_opt_)
   {
     return std::make_pair(false, 0);
   }
@@ -545,9 +1069,13 @@ QasmController::check_measure_sampling_opt(const Circuit &circ) const {
   }
   // Record position for if optimization passes
   auto start_meas = start;
-  // Check all remaining operations are measurements
+  // Check all remaining operations are measurements or readout errors,
+  // which are applied to the sampled outcomes. Barriers are removed by the
+  // circuit optimizations before execution.
   while (start != circ.ops.end()) {
-    if (start->type != Operations::OpType::measure) {
+    if (start->type != Operations::OpType::measure &&
+        start->type != Operations::OpType::roerror &&
+        start->type != Operations::OpType::barrier) {
       return std::make_pair(false, 0);
     }
     ++start;
@@ -559,6 +1087,15 @@ QasmController::check_measure_sampling_opt(const Circuit &circ) const {
 }
 
 
+size_t QasmController::sampled_ops_pos(const Circuit &circ) const {
+  size_t pos = circ.ops.size();
+  while (pos > 0 && (circ.ops[pos - 1].type == Operations::OpType::measure ||
+                     circ.ops[pos - 1].type == Operations::OpType::roerror))
+    --pos;
+  return pos;
+}
+
+
 template <class State_t>
 void QasmController::measure_sampler(const std::vector<Operations::Op> &meas_ops,
                                      uint_t shots,
@@ -572,33 +1109,64 @@ void QasmController::measure_sampler(const std::vector<Operations::Op> &meas_ops
     }
     return;
   }
+  // Generate the samples
+  const reg_t meas_qubits = measured_qubits(meas_ops);
+  auto all_samples = state.sample_measure(meas_qubits, shots, rng);
+  std::vector<RngEngine> rngs(1, rng);
+  store_measure_samples(meas_ops, meas_qubits, all_samples, data, rngs);
+}
+
+
+template <class State_t>
+void QasmController::measure_sampler(const std::vector<Operations::Op> &meas_ops,
+                                     std::vector<RngEngine> &rngs,
+                                     State_t &state,
+                                     OutputData &data) const {
+  // Check if meas_circ is empty, and if so return initial creg
+  if (meas_ops.empty()) {
+    for (size_t j = 0; j < rngs.size(); ++j)
+      state.add_creg_to_data(data);
+    return;
+  }
+  // Generate the samples
+  const reg_t meas_qubits = measured_qubits(meas_ops);
+  auto all_samples = state.sample_measure(meas_qubits, rngs);
+  store_measure_samples(meas_ops, meas_qubits, all_samples, data, rngs);
+}
+
+
+reg_t QasmController::measured_qubits(const std::vector<Operations::Op> &meas_ops) const {
   // Get measured qubits from circuit sort and delete duplicates
   std::vector<uint_t> meas_qubits; // measured qubits
   for (const auto &op : meas_ops) {
+    if (op.type != Operations::OpType::measure)
+      continue;
     for (size_t j=0; j < op.qubits.size(); ++j)
       meas_qubits.push_back(op.qubits[j]);
   }
   sort(meas_qubits.begin(), meas_qubits.end());
   meas_qubits.erase(unique(meas_qubits.begin(), meas_qubits.end()), meas_qubits.end());
-  // Generate the samples
-  auto all_samples = state.sample_measure(meas_qubits, shots, rng);
+  return meas_qubits;
+}
 
+
+void QasmController::store_measure_samples(const std::vector<Operations::Op> &meas_ops,
+                                           const reg_t &meas_qubits,
+                                           std::vector<reg_t> &all_samples,
+                                           OutputData &data,
+                                           std::vector<RngEngine> &rngs) const {
   // Make qubit map of position in vector of measured qubits
   std::unordered_map<uint_t, uint_t> qubit_map;
   for (uint_t j=0; j < meas_qubits.size(); ++j) {
       qubit_map[meas_qubits[j]] = j;
   }
 
-  // Maps of memory and register to qubit position
-  std::unordered_map<uint_t, uint_t> memory_map;
-  std::unordered_map<uint_t, uint_t> register_map;
-  for (const auto &op : meas_ops) {
-    for (size_t j=0; j < op.qubits.size(); ++j) {
-      auto pos = qubit_map[op.qubits[j]];
-      if (!op.memory.empty())
-        memory_map[op.memory[j]] = pos;
-      if (!op.registers.empty())
-        register_map[op.registers[j]] = pos;
+  // Positions in the samples of the qubits of each measure op
+  std::vector<reg_t> sample_positions(meas_ops.size());
+  for (size_t k=0; k < meas_ops.size(); ++k) {
+    if (meas_ops[k].type == Operations::OpType::measure) {
+      for (const auto &qubit : meas_ops[k].qubits)
+        sample_positions[k].push_back(qubit_map[qubit]);
     }
   }
 
@@ -607,22 +1175,27 @@ void QasmController::measure_sampler(const std::vector<Operations::Op> &meas_ops
   // NB: this function could probably be moved somewhere else like Utils or Ops
   Circuit meas_circ(meas_ops);
   ClassicalRegister creg;
+  reg_t outcome;
   while (!all_samples.empty()) {
-    auto sample = all_samples.back();
+    const auto &sample = all_samples.back();
+    auto &rng = (rngs.size() == 1) ? rngs[0] : rngs[all_samples.size() - 1];
     creg.initialize(meas_circ.num_memory, meas_circ.num_registers);
 
-    // process memory bit measurements
-    for (const auto &pair : memory_map) {
-      creg.store_measure(reg_t({sample[pair.second]}), reg_t({pair.first}), reg_t());
+    // process the measurements and readout errors in order
+    for (size_t k=0; k < meas_ops.size(); ++k) {
+      const auto &op = meas_ops[k];
+      if (op.type == Operations::OpType::roerror) {
+        creg.apply_roerror(op, rng);
+      } else if (op.type == Operations::OpType::measure) {
+        outcome.clear();
+        for (const auto &pos : sample_positions[k])
+          outcome.push_back(sample[pos]);
+        creg.store_measure(outcome, op.memory, op.registers);
+      }
     }
     auto memory = creg.memory_hex();
     data.add_memory_count(memory);
     data.add_memory_singleshot(memory);
-
-    // process register bit measurements
-    for (const auto &pair : register_map) {
-      creg.store_measure(reg_t({sample[pair.second]}), reg_t(), reg_t({pair.first}));
-    }
     data.add_register_singleshot(creg.register_hex());
 
     // pop off processed sample
@@ -40,6 +40,10 @@ public:
   // Return true if the number of qubits is 0
   bool empty() const {return (num_qubits_ == 0);}
 
+  // Return the approximate memory in bytes of the stabilizer table and
+  // phases
+  size_t memory_bytes() const;
+
   // Return JSON serialization of QubitVector;
   json_t json() const;
 
@@ -329,6 +333,17 @@ void Clifford::rowsum_helper(const Pauli::Pauli &row, const phase_t row_phase,
   accum.Z += row.Z;
 }
 
+//------------------------------------------------------------------------------
+// Memory
+//------------------------------------------------------------------------------
+
+size_t Clifford::memory_bytes() const {
+  // Each Pauli of the table has X and Z binary vectors of 64-bit blocks
+  const size_t blocks = (num_qubits_ == 0) ? 0 : (num_qubits_ - 1) / 64 + 1;
+  return table_.size() * (sizeof(Pauli::Pauli) + 2 * blocks * sizeof(uint64_t))
+         + phases_.size() * sizeof(phase_t);
+}
+
 //------------------------------------------------------------------------------
 // JSON Serialization
 //------------------------------------------------------------------------------
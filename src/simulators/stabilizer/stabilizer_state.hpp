@@ -97,6 +97,7 @@ public:
   virtual std::vector<reg_t> sample_measure(const reg_t& qubits,
                                             uint_t shots,
                                             RngEngine &rng) override;
+  using BaseState::sample_measure;
 
 protected:
 
@@ -213,6 +214,7 @@ const stringmap_t<Snapshots> State::snapshotset_({
 
 void State::initialize_qreg(uint_t num_qubits) {
   BaseState::qreg_ = Clifford::Clifford(num_qubits);
+  BaseState::memory_.resize(BaseState::qreg_.memory_bytes());
 }
 
 void State::initialize_qreg(uint_t num_qubits,
@@ -222,6 +224,7 @@ void State::initialize_qreg(uint_t num_qubits,
     throw std::invalid_argument("Stabilizer::State::initialize: initial state does not match qubit number");
   }
   BaseState::qreg_ = state;
+  BaseState::memory_.resize(BaseState::qreg_.memory_bytes());
 }
 
 //-------------------------------------------------------------------------
@@ -260,6 +263,8 @@ void State::apply_ops(const std::vector<Operations::Op> &ops,
                       RngEngine &rng) {
   // Simple loop over vector of input operations
   for (const auto op: ops) {
+    BaseState::check_cancelled();
+    const auto timer = BaseState::profile_op(op);
     switch (op.type) {
       case Operations::OpType::barrier:
         break;
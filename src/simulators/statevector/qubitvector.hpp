@@ -21,7 +21,15 @@
 #include <sstream>
 #include <stdexcept>
 
+#include "framework/buffer_pool.hpp"
+#include "framework/complex_array.hpp"
 #include "framework/json.hpp"
+#include "framework/memory_tracker.hpp"
+#include "framework/numa.hpp"
+
+#ifdef _OPENMP
+#include <omp.h>
+#endif
 
 namespace QV {
 
@@ -137,7 +145,8 @@ public:
   // Utility functions
   //-----------------------------------------------------------------------
 
-  // Set the size of the vector in terms of qubit number
+  // Set the size of the vector in terms of qubit number. The current memory
+  // is reused if the size is unchanged.
   virtual void set_num_qubits(size_t num_qubits);
 
   // Returns the number of qubits for the current vector
@@ -152,6 +161,14 @@ public:
   // Return JSON serialization of QubitVector;
   json_t json() const;
 
+  // Returns a copy of the underlying data_t data as a complex array
+  AER::ComplexArray copy_to_array() const;
+
+  // Moves the underlying data_t data into a complex array without copying.
+  // The QubitVector is left empty and set_num_qubits must be called before
+  // it can be used again.
+  AER::ComplexArray move_to_array();
+
   // Set all entries in the vector to 0.
   void zero();
 
@@ -353,6 +370,18 @@ public:
   // Set the threshold for chopping values to 0 in JSON
   void set_json_chop_threshold(double threshold);
 
+  // Set the NUMA memory policy for the vector. The policy is applied when
+  // memory for the vector is next assigned by set_num_qubits.
+  void set_numa_policy(AER::Numa::Policy policy) {numa_policy_ = policy;}
+
+  // Set the tracker that accounts the memory of the vector and its
+  // checkpoint under the input category, or nullptr to disable tracking.
+  // The tracker must outlive its use by the vector.
+  void set_memory_tracker(AER::MemoryTracker *tracker,
+                          const std::string &category) {
+    memory_.set_tracker(tracker, category);
+  }
+
   // Set the threshold for chopping values to 0 in JSON
   double get_json_chop_threshold() {return json_chop_threshold_;}
 
@@ -392,6 +421,9 @@ protected:
   size_t data_size_;
   data_t data_;
   data_t checkpoint_;
+  AER::MemoryTracker::Allocation memory_; // Tracked memory of data and checkpoint
+  std::vector<AER::Numa::CpuSet> pinned_cpus_; // CPUs of OpenMP threads before
+                                               // they were pinned to NUMA nodes
 
   //-----------------------------------------------------------------------
   // Config settings
@@ -399,6 +431,7 @@ protected:
   uint_t omp_threads_ = 1;     // Disable multithreading by default
   uint_t omp_threshold_ = 13;  // Qubit threshold for multithreading when enabled
   int sample_measure_index_size_ = 10; // Sample measure indexing qubit size
+  AER::Numa::Policy numa_policy_ = AER::Numa::Policy::local; // NUMA memory policy
   double json_chop_threshold_ = 0;  // Threshold for choping small values
                                     // in JSON serialization
 
@@ -412,6 +445,19 @@ protected:
   void check_dimension(const QubitVector &qv) const;
   void check_checkpoint() const;
 
+  //-----------------------------------------------------------------------
+  // Memory placement
+  //-----------------------------------------------------------------------
+
+  // Apply the NUMA memory policy to a newly assigned vector buffer
+  void place_memory(complex_t* buffer);
+
+  // Restore the CPUs of OpenMP threads pinned by place_memory
+  void unpin_threads();
+
+  // Update the tracked memory of the vector and checkpoint buffers
+  void track_memory();
+
   //-----------------------------------------------------------------------
   // Statevector update with Lambda function
   //-----------------------------------------------------------------------
@@ -573,6 +619,54 @@ json_t QubitVector<data_t>::json() const {
   return js;
 }
 
+//------------------------------------------------------------------------------
+// Array Serialization
+//------------------------------------------------------------------------------
+
+template <typename data_t>
+AER::ComplexArray QubitVector<data_t>::copy_to_array() const {
+  AER::ComplexArray ret({data_size_});
+  complex_t *ret_data = ret.data();
+  const int_t END = data_size_;
+  const double chop = json_chop_threshold_;
+  #pragma omp parallel for if (num_qubits_ > omp_threshold_ && omp_threads_ > 1) num_threads(omp_threads_)
+  for (int_t j=0; j < END; j++) {
+    const auto val = data_[j];
+    ret_data[j] = (chop > 0) ? complex_t(std::abs(val.real()) > chop ? val.real() : 0.,
+                                         std::abs(val.imag()) > chop ? val.imag() : 0.)
+                             : val;
+  }
+  return ret;
+}
+
+template <typename data_t>
+AER::ComplexArray QubitVector<data_t>::move_to_array() {
+  // Truncate small values in place
+  if (json_chop_threshold_ > 0) {
+    const int_t END = data_size_;
+    const double chop = json_chop_threshold_;
+    #pragma omp parallel for if (num_qubits_ > omp_threshold_ && omp_threads_ > 1) num_threads(omp_threads_)
+    for (int_t j=0; j < END; j++) {
+      if (std::abs(data_[j].real()) <= chop)
+        data_[j].real(0.);
+      if (std::abs(data_[j].imag()) <= chop)
+        data_[j].imag(0.);
+    }
+  }
+  AER::ComplexArray ret(data_, {data_size_});
+  // Release ownership of the data buffer
+  AER::BufferPool::global().detach(sizeof(complex_t) * data_size_);
+  data_ = nullptr;
+  if (checkpoint_) {
+    AER::BufferPool::global().release(checkpoint_, sizeof(complex_t) * data_size_);
+    checkpoint_ = nullptr;
+  }
+  num_qubits_ = 0;
+  data_size_ = 0;
+  track_memory();
+  return ret;
+}
+
 //------------------------------------------------------------------------------
 // Error Handling
 //------------------------------------------------------------------------------
@@ -630,7 +724,7 @@ void QubitVector<data_t>::check_checkpoint() const {
 //------------------------------------------------------------------------------
 
 template <typename data_t>
-QubitVector<data_t>::QubitVector(size_t num_qubits) : num_qubits_(0), data_(0), checkpoint_(0){
+QubitVector<data_t>::QubitVector(size_t num_qubits) : num_qubits_(0), data_size_(0), data_(0), checkpoint_(0){
   set_num_qubits(num_qubits);
 }
 
@@ -639,11 +733,10 @@ QubitVector<data_t>::QubitVector() : QubitVector(0) {}
 
 template <typename data_t>
 QubitVector<data_t>::~QubitVector() {
-  if (data_)
-    free(data_);
-
-  if (checkpoint_)
-    free(checkpoint_);
+  unpin_threads();
+  // Return the memory to the pool for reuse by later vectors of this size
+  AER::BufferPool::global().release(data_, sizeof(complex_t) * data_size_);
+  AER::BufferPool::global().release(checkpoint_, sizeof(complex_t) * data_size_);
 }
 
 //------------------------------------------------------------------------------
@@ -772,27 +865,85 @@ void QubitVector<data_t>::zero() {
 
 template <typename data_t>
 void QubitVector<data_t>::set_num_qubits(size_t num_qubits) {
-  num_qubits_ = num_qubits;
-  data_size_ = BITS[num_qubits];
-
-  // Free any currently assigned memory
-  if (data_)
-    free(data_);
+  const size_t data_size = BITS[num_qubits];
+  auto &pool = AER::BufferPool::global();
 
   if (checkpoint_) {
-    free(checkpoint_);
+    pool.release(checkpoint_, sizeof(complex_t) * data_size_);
     checkpoint_ = nullptr;
   }
 
-  // Allocate memory for new vector
-  data_ = reinterpret_cast<complex_t*>(malloc(sizeof(complex_t) * data_size_));
+  // Keep the current memory if the size is unchanged, so that repeated
+  // shots do not allocate and page fault a new vector. Otherwise exchange
+  // it for a pooled vector of the new size.
+  const bool reuse = data_ && data_size == data_size_;
+  if (!reuse) {
+    unpin_threads();
+    pool.release(data_, sizeof(complex_t) * data_size_);
+    data_ = nullptr;
+    data_ = reinterpret_cast<complex_t*>(pool.acquire(sizeof(complex_t) * data_size));
+  }
+  num_qubits_ = num_qubits;
+  data_size_ = data_size;
+  if (!reuse)
+    place_memory(data_);
+  track_memory();
+}
+
+template <typename data_t>
+void QubitVector<data_t>::place_memory(complex_t* buffer) {
+  if (numa_policy_ == AER::Numa::Policy::local)
+    return;
+  AER::Numa::set_policy(buffer, sizeof(complex_t) * data_size_, numa_policy_);
+#ifdef _OPENMP
+  // Pin the threads of state updates to the node holding their block of the
+  // vector in the static schedule of apply_lambda, unless the OpenMP runtime
+  // already binds its threads. The threads are unpinned when the vector is
+  // released.
+  if (numa_policy_ == AER::Numa::Policy::partition && pinned_cpus_.empty() &&
+      num_qubits_ > omp_threshold_ && omp_threads_ > 1 &&
+      omp_get_proc_bind() == omp_proc_bind_false) {
+    pinned_cpus_.resize(omp_threads_);
+    #pragma omp parallel num_threads(omp_threads_)
+    {
+      const int thread = omp_get_thread_num();
+      pinned_cpus_[thread] = AER::Numa::pin_thread(thread, omp_get_num_threads());
+    }
+  }
+#endif
+}
+
+template <typename data_t>
+void QubitVector<data_t>::unpin_threads() {
+#ifdef _OPENMP
+  if (pinned_cpus_.empty())
+    return;
+  // Restore each thread of a team of the size that was pinned
+  #pragma omp parallel num_threads(pinned_cpus_.size())
+  {
+    const size_t thread = omp_get_thread_num();
+    if (thread < pinned_cpus_.size() && !pinned_cpus_[thread].empty())
+      AER::Numa::set_thread_cpus(pinned_cpus_[thread]);
+  }
+#endif
+  pinned_cpus_.clear();
+}
+
+template <typename data_t>
+void QubitVector<data_t>::track_memory() {
+  const size_t buffers = (data_ ? 1 : 0) + (checkpoint_ ? 1 : 0);
+  memory_.resize(buffers * sizeof(complex_t) * data_size_);
 }
 
 
 template <typename data_t>
 void QubitVector<data_t>::checkpoint() {
-  if (!checkpoint_)
-    checkpoint_ = reinterpret_cast<complex_t*>(malloc(sizeof(complex_t) * data_size_));
+  if (!checkpoint_) {
+    checkpoint_ = reinterpret_cast<complex_t*>(
+      AER::BufferPool::global().acquire(sizeof(complex_t) * data_size_));
+    place_memory(checkpoint_);
+    track_memory();
+  }
 
   const int_t END = data_size_;    // end for k loop
 #pragma omp parallel for if (num_qubits_ > omp_threshold_ && omp_threads_ > 1) num_threads(omp_threads_)
@@ -814,8 +965,9 @@ void QubitVector<data_t>::revert(bool keep) {
     data_[k] = checkpoint_[k];
 
   if (!keep) {
-    free(checkpoint_);
+    AER::BufferPool::global().release(checkpoint_, sizeof(complex_t) * data_size_);
     checkpoint_ = nullptr;
+    track_memory();
   }
 }
 
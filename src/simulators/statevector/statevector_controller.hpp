@@ -35,6 +35,8 @@ namespace Simulator {
  *      measure sampling [Default: 10]
  * - "statevector_hpc_gate_opt" (bool): Enable large qubit gate optimizations.
  *      [Default: False]
+ * - "statevector_numa_policy" (str): NUMA memory placement of the
+ *      statevector: "local", "interleave" or "partition" [Default: "local"]
  * 
  * From BaseController Class
  *
@@ -71,6 +73,10 @@ protected:
 
   virtual size_t required_memory_mb(const Circuit& circuit) const override;
 
+  virtual std::string method_name(const ExecutionPlan &plan) const override {
+    return "statevector";
+  }
+
 private:
 
   //-----------------------------------------------------------------------
@@ -80,8 +86,9 @@ private:
   // This simulator will only return a single shot, regardless of the
   // input shot number
   virtual OutputData run_circuit(const Circuit &circ,
+                                 const ExecutionPlan &plan,
                                  uint_t shots,
-                                 uint_t rng_seed) const override;
+                                 uint_t first_shot) const override;
 
   //-----------------------------------------------------------------------
   // Custom initial state
@@ -125,13 +132,14 @@ size_t StatevectorController::required_memory_mb(const Circuit& circ) const {
 //-------------------------------------------------------------------------
 
 OutputData StatevectorController::run_circuit(const Circuit &circ,
+                                              const ExecutionPlan &plan,
                                               uint_t shots,
-                                              uint_t rng_seed) const {
+                                              uint_t first_shot) const {
   // Initialize  state
   Statevector::State<> state;
 
   // Validate circuit and throw exception if invalid operations exist
-  validate_state(state, circ, noise_model_, true);
+  validate_state(state, circ, *noise_model_, true);
 
   // Check for custom initial state, and if so check it matches num qubits
   if (!initial_state_.empty()) {
@@ -146,11 +154,15 @@ OutputData StatevectorController::run_circuit(const Circuit &circ,
 
   // Set config
   state.set_config(Base::Controller::config_);
-  state.set_parallalization(parallel_state_update_);
+  state.set_parallalization(plan.threads.state_update);
+  state.set_cancellation(cancellation_.get());
+  state.set_profiler(profiler());
+  state.set_memory_tracker(plan.memory_tracker);
   
   // Rng engine
   RngEngine rng;
-  rng.set_seed(rng_seed);
+  rng.set_seed(circ.seed);
+  rng.set_stream(first_shot);
 
   // Output data container
   OutputData data;
@@ -166,7 +178,10 @@ OutputData StatevectorController::run_circuit(const Circuit &circ,
   state.add_creg_to_data(data);
   
   // Add final state to the data
-  data.add_additional_data("statevector", state.qreg());
+  if (data.return_numpy())
+    data.add_additional_data("statevector", state.qreg().move_to_array());
+  else
+    data.add_additional_data("statevector", state.qreg());
 
   return data;
 }
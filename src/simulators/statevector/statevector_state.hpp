@@ -106,6 +106,11 @@ public:
   virtual size_t required_memory_mb(uint_t num_qubits,
                                     const std::vector<Operations::Op> &ops) override;
 
+  // Track the memory of the statevector and its checkpoint
+  virtual void set_memory_tracker(MemoryTracker *tracker) override {
+    BaseState::qreg_.set_memory_tracker(tracker, "statevector");
+  }
+
   // Load the threshold for applying OpenMP parallelization
   // if the controller/engine allows threads for it
   virtual void set_config(const json_t &config) override;
@@ -116,6 +121,11 @@ public:
                                             uint_t shots,
                                             RngEngine &rng) override;
 
+  // Sample a measurement outcome for each rng in a single pass over the
+  // statevector
+  virtual std::vector<reg_t> sample_measure(const reg_t& qubits,
+                                            std::vector<RngEngine> &rngs) override;
+
   //-----------------------------------------------------------------------
   // Additional methods
   //-----------------------------------------------------------------------
@@ -196,6 +206,10 @@ protected:
   std::pair<uint_t, double>
   sample_measure_with_prob(const reg_t &qubits, RngEngine &rng);
 
+  // Sample measurement outcomes of qubits for a vector of random numbers
+  std::vector<reg_t> sample_measure_rnds(const reg_t &qubits,
+                                         const std::vector<double> &rnds);
+
 
   void measure_reset_update(const std::vector<uint_t> &qubits,
                             const uint_t final_state,
@@ -393,6 +407,12 @@ void State<statevec_t>::set_config(const json_t &config) {
   if (JSON::get_value(index_size, "statevector_sample_measure_opt", config)) {
     BaseState::qreg_.set_sample_measure_index_size(index_size);
   };
+
+  // Set the NUMA memory policy of the statevector
+  std::string numa_policy;
+  if (JSON::get_value(numa_policy, "statevector_numa_policy", config)) {
+    BaseState::qreg_.set_numa_policy(Numa::policy_from_string(numa_policy));
+  }
 }
 
 
@@ -406,6 +426,8 @@ void State<statevec_t>::apply_ops(const std::vector<Operations::Op> &ops,
                                  RngEngine &rng) {
   // Simple loop over vector of input operations
   for (const auto op: ops) {
+    BaseState::check_cancelled();
+    const auto timer = BaseState::profile_op(op);
     switch (op.type) {
       case Operations::OpType::barrier:
         break;
@@ -463,7 +485,11 @@ void State<statevec_t>::apply_snapshot(const Operations::Op &op,
                                 op.name + "\'.");
   switch (it -> second) {
     case Snapshots::statevector:
-      BaseState::snapshot_state(op, data, "statevector");
+      if (data.return_numpy())
+        data.add_singleshot_snapshot("statevector", op.string_params[0],
+                                     BaseState::qreg_.copy_to_array());
+      else
+        BaseState::snapshot_state(op, data, "statevector");
       break;
     case Snapshots::cmemory:
       BaseState::snapshot_creg_memory(op, data);
@@ -766,16 +792,29 @@ std::vector<reg_t> State<statevec_t>::sample_measure(const reg_t &qubits,
                                                      uint_t shots,
                                                      RngEngine &rng) {
   // Generate flat register for storing
+  std::vector<double> rnds(shots);
+  rng.rand(rnds);
+  return sample_measure_rnds(qubits, rnds);
+}
+
+template <class statevec_t>
+std::vector<reg_t> State<statevec_t>::sample_measure(const reg_t &qubits,
+                                                     std::vector<RngEngine> &rngs) {
   std::vector<double> rnds;
-  rnds.reserve(shots);
-  for (uint_t i = 0; i < shots; ++i)
-    rnds.push_back(rng.rand(0, 1));
+  rnds.reserve(rngs.size());
+  for (auto &rng : rngs)
+    rnds.push_back(rng.rand());
+  return sample_measure_rnds(qubits, rnds);
+}
 
+template <class statevec_t>
+std::vector<reg_t> State<statevec_t>::sample_measure_rnds(const reg_t &qubits,
+                                                          const std::vector<double> &rnds) {
   auto allbit_samples = BaseState::qreg_.sample_measure(rnds);
 
   // Convert to reg_t format
   std::vector<reg_t> all_samples;
-  all_samples.reserve(shots);
+  all_samples.reserve(rnds.size());
   for (int_t val : allbit_samples) {
     reg_t allbit_sample = Utils::int2reg(val, 2, BaseState::qreg_.num_qubits());
     reg_t sample;
@@ -64,6 +64,14 @@ protected:
 
   size_t required_memory_mb(const Circuit& circ) const;
 
+  // Gates on an n-qubit unitary cost O(4^n)
+  virtual double circuit_cost(const Circuit& circ,
+                              const ExecutionPlan& plan) const override;
+
+  virtual std::string method_name(const ExecutionPlan &plan) const override {
+    return "unitary";
+  }
+
 private:
 
   //-----------------------------------------------------------------------
@@ -73,8 +81,9 @@ private:
   // This simulator will only return a single shot, regardless of the
   // input shot number
   virtual OutputData run_circuit(const Circuit &circ,
+                                 const ExecutionPlan &plan,
                                  uint_t shots,
-                                 uint_t rng_seed) const override;
+                                 uint_t first_shot) const override;
   
   //-----------------------------------------------------------------------
   // Custom initial state
@@ -112,18 +121,24 @@ size_t UnitaryController::required_memory_mb(const Circuit& circ) const {
   return state.required_memory_mb(circ.num_qubits, circ.ops);
 }
 
+double UnitaryController::circuit_cost(const Circuit& circ,
+                                       const ExecutionPlan& plan) const {
+  return (circ.ops.size() + 1) * std::pow(4., circ.num_qubits);
+}
+
 //-------------------------------------------------------------------------
 // Run circuit
 //-------------------------------------------------------------------------
 
 OutputData UnitaryController::run_circuit(const Circuit &circ,
+                                          const ExecutionPlan &plan,
                                           uint_t shots,
-                                          uint_t rng_seed) const {
+                                          uint_t first_shot) const {
   // Initialize state
   QubitUnitary::State<> state;
   
   // Validate circuit and throw exception if invalid operations exist
-  validate_state(state, circ, noise_model_, true);
+  validate_state(state, circ, *noise_model_, true);
 
   // Check for custom initial state, and if so check it matches num qubits
   if (!initial_unitary_.empty()) {
@@ -144,11 +159,15 @@ OutputData UnitaryController::run_circuit(const Circuit &circ,
 
   // Set state config
   state.set_config(Base::Controller::config_);
-  state.set_parallalization(parallel_state_update_);
+  state.set_parallalization(plan.threads.state_update);
+  state.set_cancellation(cancellation_.get());
+  state.set_profiler(profiler());
+  state.set_memory_tracker(plan.memory_tracker);
 
   // Rng engine (not actually needed for unitary controller)
   RngEngine rng;
-  rng.set_seed(rng_seed);
+  rng.set_seed(circ.seed);
+  rng.set_stream(first_shot);
 
   // Output data container
   OutputData data;
@@ -164,7 +183,10 @@ OutputData UnitaryController::run_circuit(const Circuit &circ,
   state.add_creg_to_data(data);
 
   // Add final state unitary to the data
-  data.add_additional_data("unitary", state.qreg());
+  if (data.return_numpy())
+    data.add_additional_data("unitary", state.qreg().move_to_array());
+  else
+    data.add_additional_data("unitary", state.qreg());
 
   return data;
 }
@@ -89,6 +89,11 @@ public:
   virtual size_t required_memory_mb(uint_t num_qubits,
                                     const std::vector<Operations::Op> &ops) override;
 
+  // Track the memory of the unitary and its checkpoint
+  virtual void set_memory_tracker(MemoryTracker *tracker) override {
+    BaseState::qreg_.set_memory_tracker(tracker, "unitary");
+  }
+
   // Load the threshold for applying OpenMP parallelization
   // if the controller/engine allows threads for it
   // Config: {"omp_qubit_threshold": 7}
@@ -205,6 +210,8 @@ void State<data_t>::apply_ops(const std::vector<Operations::Op> &ops,
                                   RngEngine &rng) {
   // Simple loop over vector of input operations
   for (const auto op: ops) {
+    BaseState::check_cancelled();
+    const auto timer = BaseState::profile_op(op);
     switch (op.type) {
       case Operations::OpType::barrier:
         break;
@@ -407,7 +414,11 @@ void State<data_t>::apply_snapshot(const Operations::Op &op,
                                    OutputData &data) {
   // Look for snapshot type in snapshotset
   if (op.name == "unitary" || op.name == "state") {
-    BaseState::snapshot_state(op, data);
+    if (data.return_numpy())
+      data.add_singleshot_snapshot(op.name, op.string_params[0],
+                                   BaseState::qreg_.copy_to_array());
+    else
+      BaseState::snapshot_state(op, data);
   } else {
     throw std::invalid_argument("Unitary::State::invalid snapshot instruction \'" +
                                 op.name + "\'.");
@@ -59,6 +59,15 @@ public:
   // Return JSON serialization of UnitaryMatrix;
   json_t json() const;
 
+  // Returns a copy of the underlying data_t data as a column-major
+  // complex matrix array
+  AER::ComplexArray copy_to_array() const;
+
+  // Moves the underlying data_t data into a column-major complex matrix
+  // array without copying. The UnitaryMatrix is left empty and
+  // set_num_qubits must be called before it can be used again.
+  AER::ComplexArray move_to_array();
+
   // Initializes the current vector so that all qubits are in the |0> state.
   void initialize();
 
@@ -135,6 +144,21 @@ json_t UnitaryMatrix<data_t>::json() const {
 }
 
 
+template <class data_t>
+AER::ComplexArray UnitaryMatrix<data_t>::copy_to_array() const {
+  auto vec = BaseVector::copy_to_array();
+  return AER::ComplexArray(vec.release(), {rows_, rows_}, true);
+}
+
+template <class data_t>
+AER::ComplexArray UnitaryMatrix<data_t>::move_to_array() {
+  const size_t nrows = rows_;
+  auto vec = BaseVector::move_to_array();
+  num_qubits_ = 0;
+  rows_ = 0;
+  return AER::ComplexArray(vec.release(), {nrows, nrows}, true);
+}
+
 //------------------------------------------------------------------------------
 // Constructors & Destructor
 //------------------------------------------------------------------------------
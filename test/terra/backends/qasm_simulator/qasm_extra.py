@@ -8,8 +8,21 @@
 QasmSimulator Integration Tests
 """
 
+import json
+import os
+import tempfile
+
+import numpy as np
+
 from test.terra.reference import ref_unitary_gate
-from qiskit.providers.aer import QasmSimulator
+from qiskit import QuantumRegister, ClassicalRegister, QuantumCircuit
+from qiskit import compile
+from qiskit.providers import JobStatus
+from qiskit.providers.aer import QasmSimulator, AerProcessPool
+from qiskit.providers.aer.noise import NoiseModel
+from qiskit.providers.aer.noise.errors import ReadoutError
+from qiskit.providers.aer.noise.errors.standard_errors import pauli_error
+from qiskit.providers.aer.utils.qobj_utils import set_parameter_binds
 
 
 class QasmExtraTests:
@@ -46,3 +59,491 @@ class QasmExtraTests:
         result = self.SIMULATOR.run(qobj).result()
         self.is_completed(result)
         self.compare_counts(result, circuits, targets, delta=0)
+
+    # ---------------------------------------------------------------------
+    # Test parameterized experiments
+    # ---------------------------------------------------------------------
+    def test_parameter_binds(self):
+        """Test parameterized experiment with a parameter bind table."""
+        shots = 100
+        qr = QuantumRegister(1, 'qr')
+        cr = ClassicalRegister(1, 'cr')
+        circuit = QuantumCircuit(qr, cr)
+        circuit.u3(0.3, 0, 0, qr[0])
+        circuit.measure(qr, cr)
+        qobj = compile(circuit, self.SIMULATOR, shots=shots,
+                       basis_gates=['u3'])
+        # Bind the theta parameter of the u3 gate
+        set_parameter_binds(qobj, 0, [[0, 0]], [[0], [np.pi], [0]])
+        targets = [{'0x0': shots}, {'0x1': shots}, {'0x0': shots}]
+        # Parameterized u3 gates are not Clifford gates
+        backend_opts = self.BACKEND_OPTS.copy()
+        backend_opts['method'] = 'statevector'
+        result = self.SIMULATOR.run(
+            qobj, backend_options=backend_opts).result()
+        self.is_completed(result)
+        self.compare_counts(result, range(len(targets)), targets, delta=0)
+        for row, res in enumerate(result.results):
+            self.assertEqual(res.metadata['parameter_bind'], row)
+
+    # ---------------------------------------------------------------------
+    # Test shared prefix optimization
+    # ---------------------------------------------------------------------
+    def test_shared_prefix(self):
+        """Test experiments sharing a prefix of gates."""
+        shots = 100
+        qr = QuantumRegister(2, 'qr')
+        cr = ClassicalRegister(2, 'cr')
+        prefix = QuantumCircuit(qr, cr)
+        for _ in range(5):
+            prefix.h(qr[0])
+            prefix.s(qr[1])
+            prefix.cx(qr[0], qr[1])
+        circuits = []
+        for basis in ['z', 'x', 'y']:
+            circuit = QuantumCircuit(qr, cr)
+            if basis == 'x':
+                circuit.h(qr)
+            elif basis == 'y':
+                circuit.sdg(qr)
+                circuit.h(qr)
+            circuit.measure(qr, cr)
+            circuits.append(prefix + circuit)
+        qobj = compile(circuits, self.SIMULATOR, shots=shots, seed=1)
+        backend_opts = self.BACKEND_OPTS.copy()
+        backend_opts['shared_prefix_threshold'] = 5
+        backend_opts['shared_prefix_enable'] = False
+        targets = self.SIMULATOR.run(
+            qobj, backend_options=backend_opts).result()
+        backend_opts['shared_prefix_enable'] = True
+        result = self.SIMULATOR.run(
+            qobj, backend_options=backend_opts).result()
+        self.is_completed(result)
+        for pos, res in enumerate(result.results):
+            self.assertEqual(result.get_counts(pos), targets.get_counts(pos))
+            self.assertIn('shared_prefix_size', res.metadata)
+
+    def test_shared_prefix_mixed_methods(self):
+        """Test experiments sharing a prefix with different methods."""
+        shots = 100
+        qr = QuantumRegister(2, 'qr')
+        cr = ClassicalRegister(2, 'cr')
+        prefix = QuantumCircuit(qr, cr)
+        prefix.x(qr[0])
+        for _ in range(5):
+            prefix.h(qr[0])
+            prefix.h(qr[0])
+        prefix.cx(qr[0], qr[1])
+        clifford = QuantumCircuit(qr, cr)
+        clifford.s(qr[0])
+        clifford.measure(qr, cr)
+        non_clifford = QuantumCircuit(qr, cr)
+        non_clifford.t(qr[0])
+        non_clifford.measure(qr, cr)
+        circuits = [prefix + clifford, prefix + non_clifford]
+        qobj = compile(circuits, self.SIMULATOR, shots=shots, seed=1)
+        backend_opts = self.BACKEND_OPTS.copy()
+        backend_opts['method'] = 'automatic'
+        result = self.SIMULATOR.run(
+            qobj, backend_options=backend_opts).result()
+        self.is_completed(result)
+        for pos, method in enumerate(['stabilizer', 'statevector']):
+            self.assertEqual(result.get_counts(pos), {'11': shots})
+            self.assertEqual(result.results[pos].metadata['method'], method)
+
+    # ---------------------------------------------------------------------
+    # Test duplicate experiment pooling
+    # ---------------------------------------------------------------------
+    def test_duplicate_experiments(self):
+        """Test identical experiments are pooled and split."""
+        shots = 200
+        qr = QuantumRegister(2, 'qr')
+        cr = ClassicalRegister(2, 'cr')
+        bell = QuantumCircuit(qr, cr)
+        bell.h(qr[0])
+        bell.cx(qr[0], qr[1])
+        bell.measure(qr, cr)
+        other = QuantumCircuit(qr, cr)
+        other.x(qr[0])
+        other.measure(qr, cr)
+        circuits = [bell, other, bell, bell]
+        qobj = compile(circuits, self.SIMULATOR, shots=shots, seed=1,
+                       memory=True)
+        backend_opts = self.BACKEND_OPTS.copy()
+        backend_opts['deduplication_enable'] = True
+        result = self.SIMULATOR.run(
+            qobj, backend_options=backend_opts).result()
+        self.is_completed(result)
+        for pos, res in enumerate(result.results):
+            counts = result.get_counts(pos)
+            self.assertEqual(sum(counts.values()), shots)
+            self.assertEqual(len(result.get_memory(pos)), shots)
+            if pos == 1:
+                self.assertEqual(counts, {'01': shots})
+                self.assertNotIn('pooled_shots', res.metadata)
+            else:
+                self.assertEqual(set(counts.keys()) - {'00', '11'}, set())
+                self.assertEqual(res.metadata.get('pooled_shots'), 3 * shots)
+
+    # ---------------------------------------------------------------------
+    # Test streaming experiment results
+    # ---------------------------------------------------------------------
+    def test_experiment_results(self):
+        """Test experiment results are streamed from the job."""
+        shots = 100
+        qr = QuantumRegister(2, 'qr')
+        cr = ClassicalRegister(2, 'cr')
+        circuits = []
+        for num_x in range(3):
+            circuit = QuantumCircuit(qr, cr)
+            for qubit in range(num_x):
+                circuit.x(qr[qubit])
+            circuit.measure(qr, cr)
+            circuits.append(circuit)
+        qobj = compile(circuits, self.SIMULATOR, shots=shots, seed=1)
+        job = self.SIMULATOR.run(qobj, backend_options=self.BACKEND_OPTS)
+        streamed = dict(job.experiment_results(timeout=60))
+        result = job.result()
+        self.is_completed(result)
+        self.assertEqual(sorted(streamed), [0, 1, 2])
+        targets = [{'0x0': shots}, {'0x1': shots}, {'0x3': shots}]
+        for pos, target in enumerate(targets):
+            self.assertEqual(streamed[pos].data.counts.to_dict(), target)
+            self.assertEqual(streamed[pos].header.to_dict(),
+                             result.results[pos].header.to_dict())
+            self.assertEqual(result.results[pos].data.counts.to_dict(), target)
+
+    # ---------------------------------------------------------------------
+    # Test cancellation
+    # ---------------------------------------------------------------------
+    def test_execution_timeout(self):
+        """Test experiments are cancelled once the execution timeout passes."""
+        qr = QuantumRegister(2, 'qr')
+        cr = ClassicalRegister(2, 'cr')
+        circuit = QuantumCircuit(qr, cr)
+        circuit.h(qr[0])
+        circuit.cx(qr[0], qr[1])
+        circuit.measure(qr, cr)
+        qobj = compile([circuit] * 3, self.SIMULATOR, shots=100, seed=1)
+        backend_opts = self.BACKEND_OPTS.copy()
+        backend_opts['execution_timeout'] = 1e-9
+        job = self.SIMULATOR.run(qobj, backend_options=backend_opts)
+        result = job.result()
+        self.assertEqual(result.status, 'CANCELLED')
+        self.assertEqual(job.status(), JobStatus.CANCELLED)
+        for res in result.results:
+            self.assertEqual(res.status, 'CANCELLED')
+        self.assertEqual(list(job.experiment_results(timeout=60)), [])
+        # Cancelling a finished job has no effect
+        self.assertFalse(job.cancel())
+
+    # ---------------------------------------------------------------------
+    # Test process pool execution
+    # ---------------------------------------------------------------------
+    def test_process_pool(self):
+        """Test jobs executed on a process pool."""
+        shots = 100
+        qr = QuantumRegister(2, 'qr')
+        cr = ClassicalRegister(2, 'cr')
+        circuit = QuantumCircuit(qr, cr)
+        circuit.x(qr[0])
+        circuit.measure(qr, cr)
+        qobj = compile([circuit] * 2, self.SIMULATOR, shots=shots, seed=1)
+        with AerProcessPool(processes=2, cpus_per_process=1) as pool:
+            jobs = [self.SIMULATOR.run(qobj, backend_options=self.BACKEND_OPTS,
+                                       process_pool=pool)
+                    for _ in range(2)]
+            for job in jobs:
+                streamed = dict(job.experiment_results(timeout=60))
+                result = job.result()
+                self.is_completed(result)
+                self.assertEqual(sorted(streamed), [0, 1])
+                for pos in range(2):
+                    self.assertEqual(result.get_counts(pos), {'01': shots})
+
+    # ---------------------------------------------------------------------
+    # Test execution plan
+    # ---------------------------------------------------------------------
+    def test_measure_sampling_plan(self):
+        """Test the measure sampling of each experiment is planned."""
+        shots = 100
+        qr = QuantumRegister(2, 'qr')
+        cr = ClassicalRegister(2, 'cr')
+        sampled = QuantumCircuit(qr, cr)
+        sampled.x(qr[0])
+        sampled.measure(qr[0], cr[0])
+        sampled.barrier(qr)
+        sampled.measure(qr[1], cr[1])
+        reset = QuantumCircuit(qr, cr)
+        reset.x(qr)
+        reset.reset(qr[1])
+        reset.measure(qr, cr)
+        qobj = compile([sampled, reset], self.SIMULATOR, shots=shots, seed=1)
+        result = self.SIMULATOR.run(
+            qobj, backend_options=self.BACKEND_OPTS).result()
+        self.is_completed(result)
+        for pos, target in enumerate([True, False]):
+            self.assertEqual(result.get_counts(pos), {'01': shots})
+            self.assertEqual(result.results[pos].metadata['measure_sampling'],
+                             target)
+
+    def test_experiments_of_different_width(self):
+        """Test experiments of different widths reusing state memory."""
+        shots = 50
+        circuits = []
+        for num_qubits in [2, 3, 3, 2]:
+            qr = QuantumRegister(num_qubits, 'qr')
+            cr = ClassicalRegister(num_qubits, 'cr')
+            circuit = QuantumCircuit(qr, cr)
+            circuit.x(qr)
+            circuit.reset(qr[0])
+            circuit.x(qr[0])
+            circuit.measure(qr, cr)
+            circuits.append(circuit)
+        qobj = compile(circuits, self.SIMULATOR, shots=shots, seed=1)
+        result = self.SIMULATOR.run(
+            qobj, backend_options=self.BACKEND_OPTS).result()
+        self.is_completed(result)
+        for pos, circuit in enumerate(circuits):
+            target = {'1' * len(circuit.qregs[0]): shots}
+            self.assertEqual(result.get_counts(pos), target)
+
+    # ---------------------------------------------------------------------
+    # Test resource estimates
+    # ---------------------------------------------------------------------
+    def test_estimate(self):
+        """Test estimating the resources of a qobj without running it."""
+        circuits = []
+        for num_qubits in [2, 4]:
+            qr = QuantumRegister(num_qubits, 'qr')
+            cr = ClassicalRegister(num_qubits, 'cr')
+            circuit = QuantumCircuit(qr, cr)
+            circuit.h(qr)
+            circuit.cx(qr[0], qr[1])
+            circuit.measure(qr, cr)
+            circuits.append(circuit)
+        qobj = compile(circuits, self.SIMULATOR, shots=100, seed=1)
+        estimate = self.SIMULATOR.estimate(
+            qobj, backend_options=self.BACKEND_OPTS)
+        self.assertTrue(estimate['success'])
+        self.assertEqual(len(estimate['results']), len(circuits))
+        method = self.BACKEND_OPTS.get('method', 'automatic')
+        for result in estimate['results']:
+            self.assertTrue(result['success'])
+            if method != 'automatic':
+                self.assertEqual(result['method'], method)
+            self.assertFalse(result['noise'])
+            self.assertGreaterEqual(result['peak_memory_mb'],
+                                    result['memory_mb'])
+            self.assertGreater(result['time_estimate'], 0)
+            self.assertNotIn('data', result)
+        metadata = estimate['metadata']
+        self.assertGreater(metadata['time_estimate'], 0)
+        self.assertGreaterEqual(
+            metadata['peak_memory_mb'],
+            max(result['peak_memory_mb'] for result in estimate['results']))
+
+    # ---------------------------------------------------------------------
+    # Test profiling
+    # ---------------------------------------------------------------------
+    def test_profile(self):
+        """Test profiling ops and writing a trace file."""
+        qr = QuantumRegister(2, 'qr')
+        cr = ClassicalRegister(2, 'cr')
+        circuit = QuantumCircuit(qr, cr)
+        circuit.h(qr[0])
+        circuit.cx(qr[0], qr[1])
+        circuit.measure(qr, cr)
+        qobj = compile(circuit, self.SIMULATOR, shots=10, seed=1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'trace.json')
+            backend_options = self.BACKEND_OPTS.copy()
+            backend_options['profile_trace_file'] = path
+            result = self.SIMULATOR.run(
+                qobj, backend_options=backend_options).result()
+            self.is_completed(result)
+            with open(path, 'r') as file:
+                trace = json.load(file)
+        profile = result.metadata['profile']
+        self.assertEqual(profile['trace_file'], path)
+        self.assertIn('ops', profile)
+        self.assertIn('serialization', profile)
+        total = 0
+        for stats in profile['ops'].values():
+            self.assertEqual(sum(count for _, count in stats['histogram']),
+                             stats['count'])
+            total += stats['count']
+        events = [event for event in trace['traceEvents']
+                  if event['cat'] == 'ops']
+        self.assertEqual(len(events), total)
+        # Profiling is disabled by default
+        result = self.SIMULATOR.run(
+            qobj, backend_options=self.BACKEND_OPTS).result()
+        self.assertNotIn('profile', result.metadata)
+
+    def test_peak_memory(self):
+        """Test peak memory accounting in the result metadata."""
+        num_qubits = 10
+        qr = QuantumRegister(num_qubits, 'qr')
+        cr = ClassicalRegister(num_qubits, 'cr')
+        circuit = QuantumCircuit(qr, cr)
+        circuit.h(qr[0])
+        for j in range(1, num_qubits):
+            circuit.cx(qr[0], qr[j])
+        circuit.measure(qr, cr)
+        qobj = compile(circuit, self.SIMULATOR, shots=10, seed=1)
+        backend_options = self.BACKEND_OPTS.copy()
+        backend_options['method'] = 'statevector'
+        result = self.SIMULATOR.run(
+            qobj, backend_options=backend_options).result()
+        self.is_completed(result)
+        experiment = result.results[0].metadata['peak_memory_bytes']
+        self.assertEqual(experiment['statevector'], 16 * 2 ** num_qubits)
+        self.assertGreater(experiment['output_data'], 0)
+        self.assertGreaterEqual(experiment['total'], experiment['statevector'])
+        job = result.metadata['peak_memory_bytes']
+        self.assertGreater(job['qobj'], 0)
+        self.assertGreaterEqual(job['total'], experiment['total'])
+        self.assertAlmostEqual(result.metadata['peak_memory_mb'],
+                               job['total'] / 2 ** 20)
+
+    def test_noise_prefix(self):
+        """Test noisy shots branched from the ideal prefix of a circuit."""
+        num_qubits = 4
+        qr = QuantumRegister(num_qubits, 'qr')
+        cr = ClassicalRegister(num_qubits, 'cr')
+        circuit = QuantumCircuit(qr, cr)
+        for _ in range(10):
+            circuit.h(qr[0])
+            for j in range(1, num_qubits):
+                circuit.cx(qr[j - 1], qr[j])
+        circuit.measure(qr, cr)
+        noise_model = NoiseModel()
+        noise_model.add_all_qubit_quantum_error(
+            pauli_error([('X', 0.01), ('I', 0.99)]), ['u2'])
+        noise_model.add_all_qubit_quantum_error(
+            pauli_error([('XX', 0.02), ('II', 0.98)]), ['cx'])
+        qobj = compile(circuit, self.SIMULATOR, shots=1000, seed=1)
+        counts = []
+        for enable in [True, False]:
+            backend_options = self.BACKEND_OPTS.copy()
+            backend_options['method'] = 'statevector'
+            backend_options['noise_prefix_enable'] = enable
+            result = self.SIMULATOR.run(
+                qobj, backend_options=backend_options,
+                noise_model=noise_model).result()
+            self.is_completed(result)
+            counts.append(result.get_counts(circuit))
+        # Each shot samples the same noise and measurement outcomes
+        self.assertEqual(counts[0], counts[1])
+
+    def test_noisy_memory_order(self):
+        """Test the memory of noisy shots is returned in shot order."""
+        qr = QuantumRegister(1, 'qr')
+        cr = ClassicalRegister(1, 'cr')
+        circuit = QuantumCircuit(qr, cr)
+        for _ in range(10):
+            circuit.x(qr[0])
+            circuit.barrier(qr)
+        circuit.measure(qr, cr)
+        noise_model = NoiseModel()
+        noise_model.add_all_qubit_quantum_error(
+            pauli_error([('X', 0.02), ('I', 0.98)]), ['x'])
+        shots = 2000
+        window = 200
+        qobj = compile(circuit, self.SIMULATOR, shots=shots, seed=1,
+                       memory=True)
+        for enable in [True, False]:
+            backend_options = self.BACKEND_OPTS.copy()
+            backend_options['noise_prefix_enable'] = True
+            backend_options['error_free_sampling_enable'] = enable
+            result = self.SIMULATOR.run(
+                qobj, backend_options=backend_options,
+                noise_model=noise_model).result()
+            self.is_completed(result)
+            memory = result.get_memory(circuit)
+            self.assertEqual(len(memory), shots)
+            # Shots with an error are not grouped at either end of the memory
+            fraction = memory.count('1') / shots
+            self.assertGreater(fraction, 0)
+            for outcomes in [memory[:window], memory[-window:]]:
+                self.assertAlmostEqual(outcomes.count('1') / window,
+                                       fraction, delta=0.1)
+
+    def test_error_free_sampling(self):
+        """Test sampling error free shots of noisy circuits."""
+        qr = QuantumRegister(2, 'qr')
+        cr = ClassicalRegister(2, 'cr')
+        circuit = QuantumCircuit(qr, cr)
+        circuit.x(qr[0])
+        circuit.cx(qr[0], qr[1])
+        circuit.measure(qr, cr)
+        noise_model = NoiseModel()
+        noise_model.add_all_qubit_quantum_error(
+            pauli_error([('IX', 0.1), ('II', 0.9)]), ['cx'])
+        shots = 2000
+        qobj = compile(circuit, self.SIMULATOR, shots=shots, seed=1)
+        targets = {'0x3': 0.9 * shots, '0x2': 0.1 * shots}
+        backend_options = self.BACKEND_OPTS.copy()
+        backend_options['method'] = 'statevector'
+        for enable in [False, True]:
+            backend_options['error_free_sampling_enable'] = enable
+            estimate = self.SIMULATOR.estimate(
+                qobj, backend_options=backend_options,
+                noise_model=noise_model)
+            self.assertAlmostEqual(
+                estimate['results'][0]['error_free_probability'],
+                0.9 if enable else 0)
+        result = self.SIMULATOR.run(
+            qobj, backend_options=backend_options,
+            noise_model=noise_model).result()
+        self.is_completed(result)
+        self.compare_counts(result, [circuit], [targets], delta=0.05 * shots)
+
+    def test_multi_qubit_measure_readout_error(self):
+        """Test single qubit readout errors on a multi-qubit measure."""
+        qr = QuantumRegister(2, 'qr')
+        cr = ClassicalRegister(2, 'cr')
+        circuit = QuantumCircuit(qr, cr)
+        circuit.measure(qr, cr)
+        noise_model = NoiseModel()
+        noise_model.add_readout_error(ReadoutError([[0, 1], [1, 0]]), [0])
+        shots = 100
+        qobj = compile(circuit, self.SIMULATOR, shots=shots, seed=1)
+        # Replace the measures of each qubit with a single measure
+        instructions = qobj.experiments[0].instructions
+        measure = instructions[-2]
+        measure.qubits = [0, 1]
+        measure.memory = [0, 1]
+        qobj.experiments[0].instructions = instructions[:-1]
+        result = self.SIMULATOR.run(
+            qobj, backend_options=self.BACKEND_OPTS,
+            noise_model=noise_model).result()
+        self.is_completed(result)
+        self.compare_counts(result, [circuit], [{'0x1': shots}], delta=0)
+
+    def test_readout_error_measure_sampling(self):
+        """Test measure sampling with a readout error noise model."""
+        qr = QuantumRegister(2, 'qr')
+        cr = ClassicalRegister(2, 'cr')
+        circuit = QuantumCircuit(qr, cr)
+        circuit.x(qr[0])
+        circuit.measure(qr, cr)
+        noise_model = NoiseModel()
+        noise_model.add_all_qubit_readout_error(
+            ReadoutError([[0.9, 0.1], [0.2, 0.8]]))
+        shots = 2000
+        qobj = compile(circuit, self.SIMULATOR, shots=shots, seed=1)
+        targets = {'0x1': 0.72 * shots, '0x0': 0.18 * shots,
+                   '0x3': 0.08 * shots, '0x2': 0.02 * shots}
+        for enable in [True, False]:
+            backend_options = self.BACKEND_OPTS.copy()
+            backend_options['method'] = 'statevector'
+            backend_options['error_free_sampling_enable'] = enable
+            result = self.SIMULATOR.run(
+                qobj, backend_options=backend_options,
+                noise_model=noise_model).result()
+            self.is_completed(result)
+            self.assertTrue(result.results[0].metadata['measure_sampling'])
+            self.compare_counts(result, [circuit], [targets],
+                                delta=0.05 * shots)
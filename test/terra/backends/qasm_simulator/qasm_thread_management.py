@@ -109,6 +109,8 @@ class QasmThreadManagementTests:
         backend_opts = self.BACKEND_OPTS.copy()
         backend_opts['max_parallel_experiments'] = experiments
         backend_opts['max_memory_mb'] = 1024
+        # Identical experiments are otherwise executed once
+        backend_opts['deduplication_enable'] = False
 
         result = self.SIMULATOR.run(
             qobj, backend_options=backend_opts).result()
@@ -310,3 +312,120 @@ class QasmThreadManagementTests:
                 multiprocessing.cpu_count(),
                 msg="parallel_state_update should be " + str(
                     multiprocessing.cpu_count()))
+
+    def test_qasm_concurrent_jobs(self):
+        """test jobs running concurrently in different threads"""
+        # Test circuit
+        shots = 100
+        circuit = quantum_volume_circuit(4, 1, measure=True, seed=0)
+        qobj = compile(circuit, self.SIMULATOR, shots=shots, seed=12345)
+
+        backend_opts = self.BACKEND_OPTS.copy()
+        backend_opts['max_parallel_threads'] = 1
+
+        target = self.SIMULATOR.run(
+            qobj, backend_options=backend_opts).result().get_counts(0)
+        jobs = [self.SIMULATOR.run(qobj, backend_options=backend_opts)
+                for _ in range(4)]
+        for job in jobs:
+            result = job.result()
+            self.assertTrue(getattr(result, 'success', False))
+            self.assertEqual(result.get_counts(0), target)
+
+    def test_qasm_shot_batches(self):
+        """test parallel shots are executed in batches"""
+        # Test circuit
+        shots = 4 * multiprocessing.cpu_count()
+        circuit = quantum_volume_circuit(4, 1, measure=True, seed=0)
+        qobj = compile(circuit, self.SIMULATOR, shots=shots)
+
+        backend_opts = self.BACKEND_OPTS.copy()
+        backend_opts['max_parallel_shots'] = multiprocessing.cpu_count()
+        backend_opts['noise_model'] = self.dummy_noise_model()
+        backend_opts['shot_batch_size'] = 1
+
+        result = self.SIMULATOR.run(
+            qobj, backend_options=backend_opts).result()
+        self.assertEqual(sum(result.get_counts(0).values()), shots)
+        metadata = result.to_dict()['results'][0]['metadata']
+        if result.metadata['omp_enabled'] and metadata['parallel_shots'] > 1:
+            self.assertEqual(
+                metadata['shot_batches'],
+                shots,
+                msg="shot_batches should be " + str(shots))
+
+    def test_qasm_parallel_shots_reproducible(self):
+        """test seeded results do not depend on parallel shot execution"""
+        # Test circuit
+        shots = 200
+        circuit = quantum_volume_circuit(4, 1, measure=True, seed=0)
+        qobj = compile(circuit, self.SIMULATOR, shots=shots, seed=1)
+
+        backend_opts = self.BACKEND_OPTS.copy()
+        backend_opts['noise_model'] = self.dummy_noise_model()
+        backend_opts['max_parallel_shots'] = 1
+        target = self.SIMULATOR.run(
+            qobj, backend_options=backend_opts).result().get_counts(0)
+
+        backend_opts['max_parallel_shots'] = multiprocessing.cpu_count()
+        for batch_size in [1, 7, 0]:
+            backend_opts['shot_batch_size'] = batch_size
+            result = self.SIMULATOR.run(
+                qobj, backend_options=backend_opts).result()
+            self.is_completed(result)
+            self.assertEqual(result.get_counts(0), target)
+
+    def test_qasm_statevector_numa_policy(self):
+        """test NUMA memory policies give the same seeded results"""
+        # Test circuit
+        shots = 100
+        circuit = quantum_volume_circuit(4, 1, measure=True, seed=0)
+        qobj = compile(circuit, self.SIMULATOR, shots=shots, seed=1)
+
+        backend_opts = self.BACKEND_OPTS.copy()
+        backend_opts['max_parallel_threads'] = multiprocessing.cpu_count()
+        backend_opts['statevector_parallel_threshold'] = 1
+        target = self.SIMULATOR.run(
+            qobj, backend_options=backend_opts).result().get_counts(0)
+        for policy in ['local', 'interleave', 'partition']:
+            backend_opts['statevector_numa_policy'] = policy
+            result = self.SIMULATOR.run(
+                qobj, backend_options=backend_opts).result()
+            self.is_completed(result)
+            self.assertEqual(result.get_counts(0), target)
+
+        backend_opts['statevector_numa_policy'] = 'invalid'
+        result = self.SIMULATOR.run(
+            qobj, backend_options=backend_opts).result()
+        self.assertFalse(result.results[0].success)
+
+    def test_qasm_parallel_experiments_thread_budget(self):
+        """test threads are divided between experiments by their cost"""
+        # Test circuits
+        shots = 100
+        circuits = [quantum_volume_circuit(12, 2, measure=True, seed=0)]
+        for seed in range(multiprocessing.cpu_count()):
+            circuits.append(
+                quantum_volume_circuit(2, 1, measure=True, seed=seed))
+        qobj = compile(circuits, self.SIMULATOR, shots=shots)
+
+        backend_opts = self.BACKEND_OPTS.copy()
+        backend_opts['max_parallel_experiments'] = 0
+        backend_opts['max_memory_mb'] = 1024
+
+        result = self.SIMULATOR.run(
+            qobj, backend_options=backend_opts).result()
+        self.is_completed(result)
+        if result.metadata['omp_enabled']:
+            max_threads = result.metadata['max_parallel_threads']
+            metadata = [res['metadata']
+                        for res in result.to_dict()['results']]
+            for meta in metadata:
+                self.assertLessEqual(meta['parallel_threads'], max_threads)
+                self.assertLessEqual(
+                    meta['parallel_shots'] * meta['parallel_state_update'],
+                    meta['parallel_threads'])
+            self.assertEqual(
+                metadata[0]['parallel_threads'],
+                max(meta['parallel_threads'] for meta in metadata),
+                msg="the largest experiment should have the most threads")
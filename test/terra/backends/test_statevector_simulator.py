@@ -10,6 +10,7 @@ StatevectorSimulator Integration Tests
 """
 
 import unittest
+import numpy as np
 from test.terra import common
 from test.terra.reference import ref_measure
 from test.terra.reference import ref_reset
@@ -724,6 +725,23 @@ class TestStatevectorSimulator(common.QiskitAerTestCase):
         self.is_completed(result)
         self.compare_statevector(result, circuits, targets)
 
+    # ---------------------------------------------------------------------
+    # Test NumPy array output
+    # ---------------------------------------------------------------------
+    def test_return_numpy(self):
+        """Test StatevectorSimulator return_numpy backend option"""
+        circuits = ref_1q_clifford.h_gate_circuits_deterministic(final_measure=False)
+        targets = ref_1q_clifford.h_gate_statevector_deterministic()
+        job = execute(circuits, StatevectorSimulator(), shots=1,
+                      backend_options={"return_numpy": True})
+        result = job.result()
+        self.is_completed(result)
+        for pos, target in enumerate(targets):
+            output = result.results[pos].data.statevector
+            self.assertIsInstance(output, np.ndarray)
+            self.assertEqual(output.dtype, np.complex128)
+            self.assertAlmostEqual(np.linalg.norm(output - target), 0)
+
     # ---------------------------------------------------------------------
     # Test unitary gate qobj instruction
     # ---------------------------------------------------------------------
@@ -588,5 +588,28 @@ class TestNoise(common.QiskitAerTestCase):
         self.is_completed(result)
         self.compare_counts(result, [circuit], [target], delta=0.05 * shots)
 
+    def test_session_noise_model(self):
+        """Test session noise model is used for each qobj run on the session"""
+        qr = QuantumRegister(2, 'qr')
+        cr = ClassicalRegister(2, 'cr')
+        circuit = QuantumCircuit(qr, cr)
+        circuit.iden(qr)
+        circuit.barrier(qr)
+        circuit.measure(qr, cr)
+        backend = QasmSimulator()
+        # test noise model
+        error = pauli_error([('X', 1)])
+        noise_model = NoiseModel()
+        noise_model.add_all_qubit_quantum_error(error, 'id')
+        session = backend.session(noise_model=noise_model)
+        # Execute
+        for shots in [10, 100]:
+            target = {'0x3': shots}
+            qobj = compile([circuit], backend, shots=shots,
+                           basis_gates=noise_model.basis_gates)
+            result = session.run(qobj).result()
+            self.is_completed(result)
+            self.compare_counts(result, [circuit], [target], delta=0)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2019, IBM.
+#
+# This source code is licensed under the Apache License, Version 2.0 found in
+# the LICENSE.txt file in the root directory of this source tree.
+"""
+Autotune profile tests
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from test.terra import common
+from qiskit import QuantumRegister, ClassicalRegister, QuantumCircuit
+from qiskit import compile
+from qiskit.providers.aer import QasmSimulator
+from qiskit.providers.aer.utils import autotune
+
+
+class TestAutotune(common.QiskitAerTestCase):
+    """Testing autotune profiles"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'profile', 'aer.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_autotune(self):
+        """Test autotune returns options for each tuned threshold."""
+        options = autotune.autotune(min_qubits=2, max_qubits=4, repeats=1)
+        targets = ['statevector_sample_measure_opt', 'fusion_threshold',
+                   'fusion_cost_factor', 'estimate_seconds_per_cost']
+        if os.cpu_count() > 1:
+            targets += ['statevector_parallel_threshold',
+                        'extended_stabilizer_parallel_threshold']
+        self.assertEqual(sorted(options), sorted(targets))
+        self.assertEqual(sorted(options['estimate_seconds_per_cost']),
+                         ['extended_stabilizer', 'stabilizer', 'statevector'])
+
+    def test_profile(self):
+        """Test saving and loading a profile."""
+        options = {'fusion_threshold': 12, 'fusion_cost_factor': 2.0}
+        self.assertEqual(autotune.save_profile(options, self.path), self.path)
+        self.assertEqual(autotune.load_profile(self.path), options)
+        with mock.patch.dict(os.environ, {autotune.PROFILE_ENV: self.path}):
+            self.assertEqual(autotune.load_profile(), options)
+
+    def test_profile_other_machine(self):
+        """Test profiles of other machines are ignored."""
+        autotune.save_profile({'fusion_threshold': 12}, self.path)
+        with open(self.path, 'r') as file:
+            profile = json.load(file)
+        profile['machine']['processor'] = 'other'
+        with open(self.path, 'w') as file:
+            json.dump(profile, file)
+        self.assertEqual(autotune.load_profile(self.path), {})
+        self.assertEqual(autotune.load_profile(self.path + '.missing'), {})
+
+    def test_qasm_simulator_profile(self):
+        """Test the QasmSimulator uses the profile as default options."""
+        qr = QuantumRegister(1, 'qr')
+        cr = ClassicalRegister(1, 'cr')
+        circuit = QuantumCircuit(qr, cr)
+        circuit.x(qr)
+        circuit.measure(qr, cr)
+        autotune.save_profile({'method': 'statevector'}, self.path)
+        with mock.patch.dict(os.environ, {autotune.PROFILE_ENV: self.path}):
+            simulator = QasmSimulator()
+        qobj = compile(circuit, simulator, shots=10)
+        result = simulator.run(qobj).result()
+        self.assertEqual(result.results[0].metadata['method'], 'statevector')
+        result = simulator.run(
+            qobj, backend_options={'method': 'stabilizer'}).result()
+        self.assertEqual(result.results[0].metadata['method'], 'stabilizer')
+
+
+if __name__ == '__main__':
+    unittest.main()